@@ -0,0 +1,64 @@
+"""
+Startup benchmark: how long importing the three API implementations takes
+
+Every run is a fresh interpreter, so nothing is cached in sys.modules, and
+times a plain import of the three modules - including the standard library
+modules they pull in and locating the base classes, i.e. what a program
+importing the APIs actually pays. Modules only needed by some calls (search,
+exports, the other storage engines) are imported on first use and not
+counted.
+
+    python benchmark_startup.py [--runs 20] [--max-ms 50]
+
+With --max-ms it exits with status 1 when the median import time is above
+the limit, so it can guard startup time in CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PLANNER_MODULES = ['implementations.user_impl', 'implementations.team_impl',
+                   'implementations.project_board_impl']
+
+CHILD = """
+import time
+start = time.perf_counter()
+for name in {planner!r}:
+    __import__(name)
+print((time.perf_counter() - start) * 1000)
+""".format(planner=PLANNER_MODULES)
+
+
+def measure(runs: int):
+    root = os.path.dirname(os.path.abspath(__file__))
+    times_ms = []
+    for _ in range(runs):
+        child = subprocess.run([sys.executable, '-c', CHILD], cwd=root, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, universal_newlines=True)
+        if child.returncode != 0:
+            sys.stderr.write(child.stderr)
+            sys.exit("importing the implementations failed - are the base classes findable? "
+                     "(see PLANNER_BASE_DIR in utils/base_classes.py)")
+        times_ms.append(float(child.stdout))
+    return times_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20, help="fresh interpreters to time (default 20)")
+    parser.add_argument('--max-ms', type=float, help="fail if the median import takes longer")
+    args = parser.parse_args()
+
+    times = measure(args.runs)
+    print(f"import the APIs  median {statistics.median(times):7.2f} ms   "
+          f"min {min(times):7.2f} ms   max {max(times):7.2f} ms")
+
+    if args.max_ms is not None and statistics.median(times) > args.max_ms:
+        print(f"import median is above {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import json
+import pytest
+from implementations.user_impl import UserImpl
+from implementations.team_impl import TeamImpl
+from implementations.project_board_impl import ProjectBoardImpl
+
+
+@pytest.fixture
+def board_setup():
+    """
+    Factory for the usual starting point: a user, a team they admin and an
+    open board in the given storage - returns ((users, teams, boards), ids)
+    with ids {"user", "team", "board"}
+    """
+    def make(storage):
+        users, teams, boards = UserImpl(storage), TeamImpl(storage), ProjectBoardImpl(storage)
+        user_id = json.loads(users.create_user(json.dumps({"name": "alice", "display_name": "Alice"})))['id']
+        team_id = json.loads(teams.create_team(json.dumps(
+            {"name": "core", "description": "", "admin": user_id})))['id']
+        board_id = json.loads(boards.create_board(json.dumps(
+            {"name": "sprint", "description": "", "team_id": team_id})))['id']
+        return (users, teams, boards), {"user": user_id, "team": team_id, "board": board_id}
+    return make
@@ -0,0 +1,204 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Iterator, List
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from implementations.user_impl import UserImpl
+from implementations.team_impl import TeamImpl
+from implementations.project_board_impl import ProjectBoardImpl
+
+STREAM_CHUNKS = 256  # chunks pulled per executor hop when streaming
+
+
+def _take(iterator: Iterator[str], count: int) -> List[str]:
+    chunks = []
+    for chunk in iterator:
+        chunks.append(chunk)
+        if len(chunks) == count:
+            break
+    return chunks
+
+
+class AsyncDispatcher:
+    """
+    Runs the blocking API calls on a thread pool for asyncio callers
+
+    - at most `max_pending` calls are submitted at once; further callers wait
+      for a slot instead of piling work up in the executor queue
+    - identical reads (same method, same request) that are in flight at the
+      same time share one call. A read only joins one that started after the
+      last write went through this dispatcher, so nobody gets a result older
+      than their own preceding write
+
+    Meant to be used from one event loop. Share one dispatcher between the
+    Async*Api objects so they share the pool and see each other's writes.
+    """
+
+    def __init__(self, max_workers: int = 8, max_pending: Optional[int] = None,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self._owns_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="planner-api")
+        self.max_pending = max_pending if max_pending is not None else max_workers * 2
+        self._slots = None  # created on first use so it binds to the running loop
+        self._inflight: Dict[Any, asyncio.Future] = {}
+        self._generation = 0  # bumped by every write
+        self.coalesced = 0  # reads answered by someone else's call
+
+    async def run(self, fn: Callable, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def read(self, fn: Callable, *args):
+        key = (self._generation, fn, args)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = self._inflight[key] = asyncio.ensure_future(self.run(fn, *args))
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller being cancelled must not cancel the shared call
+        return await asyncio.shield(future)
+
+    async def write(self, fn: Callable, *args):
+        self._generation += 1
+        return await self.run(fn, *args)
+
+    async def stream(self, fn: Callable, *args) -> AsyncIterator[str]:
+        """Async version of the stream_* generators, fetched in batches of chunks"""
+        iterator = await self.run(fn, *args)
+        while True:
+            chunks = await self.run(_take, iterator, STREAM_CHUNKS)
+            if not chunks:
+                return
+            for chunk in chunks:
+                yield chunk
+
+    def close(self):
+        """Shut down the pool (only if we created it)"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+
+
+class AsyncUserApi:
+    """async versions of the UserImpl methods"""
+
+    def __init__(self, impl: Optional[UserImpl] = None, dispatcher: Optional[AsyncDispatcher] = None):
+        self.impl = impl if impl is not None else UserImpl()
+        self.dispatcher = dispatcher if dispatcher is not None else AsyncDispatcher()
+
+    async def create_user(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.create_user, request)
+
+    async def create_users(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.create_users, request)
+
+    async def list_users(self, request: Optional[str] = None) -> str:
+        return await self.dispatcher.read(self.impl.list_users, request)
+
+    async def list_users_created_since(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.list_users_created_since, request)
+
+    def stream_users(self) -> AsyncIterator[str]:
+        return self.dispatcher.stream(self.impl.stream_users)
+
+    async def describe_user(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.describe_user, request)
+
+    async def update_user(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.update_user, request)
+
+    async def get_user_teams(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.get_user_teams, request)
+
+
+class AsyncTeamApi:
+    """async versions of the TeamImpl methods"""
+
+    def __init__(self, impl: Optional[TeamImpl] = None, dispatcher: Optional[AsyncDispatcher] = None):
+        self.impl = impl if impl is not None else TeamImpl()
+        self.dispatcher = dispatcher if dispatcher is not None else AsyncDispatcher()
+
+    async def create_team(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.create_team, request)
+
+    async def create_teams(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.create_teams, request)
+
+    async def list_teams(self, request: Optional[str] = None) -> str:
+        return await self.dispatcher.read(self.impl.list_teams, request)
+
+    def stream_teams(self) -> AsyncIterator[str]:
+        return self.dispatcher.stream(self.impl.stream_teams)
+
+    async def describe_team(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.describe_team, request)
+
+    async def update_team(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.update_team, request)
+
+    async def add_users_to_team(self, request: str):
+        return await self.dispatcher.write(self.impl.add_users_to_team, request)
+
+    async def remove_users_from_team(self, request: str):
+        return await self.dispatcher.write(self.impl.remove_users_from_team, request)
+
+    async def list_team_users(self, request: str):
+        return await self.dispatcher.read(self.impl.list_team_users, request)
+
+
+class AsyncBoardApi:
+    """async versions of the ProjectBoardImpl methods"""
+
+    def __init__(self, impl: Optional[ProjectBoardImpl] = None, dispatcher: Optional[AsyncDispatcher] = None):
+        self.impl = impl if impl is not None else ProjectBoardImpl()
+        self.dispatcher = dispatcher if dispatcher is not None else AsyncDispatcher()
+
+    async def create_board(self, request: str):
+        return await self.dispatcher.write(self.impl.create_board, request)
+
+    async def close_board(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.close_board, request)
+
+    async def add_task(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.add_task, request)
+
+    async def add_tasks(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.add_tasks, request)
+
+    async def update_task_status(self, request: str):
+        return await self.dispatcher.write(self.impl.update_task_status, request)
+
+    async def update_task_statuses(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.update_task_statuses, request)
+
+    async def search_tasks(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.search_tasks, request)
+
+    async def list_tasks_created_between(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.list_tasks_created_between, request)
+
+    async def list_boards_closed_between(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.list_boards_closed_between, request)
+
+    async def get_board_summary(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.get_board_summary, request)
+
+    async def list_boards(self, request: str) -> str:
+        return await self.dispatcher.read(self.impl.list_boards, request)
+
+    def stream_boards(self, request: str) -> AsyncIterator[str]:
+        return self.dispatcher.stream(self.impl.stream_boards, request)
+
+    async def export_board(self, request: str) -> str:
+        # writes a file, so it is not shared between callers
+        return await self.dispatcher.write(self.impl.export_board, request)
+
+    async def export_team_boards(self, request: str) -> str:
+        return await self.dispatcher.write(self.impl.export_team_boards, request)
+
+    async def export_all_boards(self, request: Optional[str] = None) -> str:
+        return await self.dispatcher.write(self.impl.export_all_boards, request)
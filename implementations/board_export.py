@@ -0,0 +1,155 @@
+"""
+Board export rendering, kept free of storage access so that it can run in
+worker processes: everything a board needs is passed in.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Any, Optional
+from pathlib import Path
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from implementations.board_renderers import RENDERERS
+
+EXECUTORS = ('process', 'thread')
+MANIFEST_FILE = '.export_manifest.json'  # "<board id>/<format>" -> {"out_file", "fingerprint"}
+RENDER_VERSION = 1  # bump when the output layout changes so old files get re-rendered
+
+
+def board_filename(board: Dict[str, Any], fmt: str = 'text') -> str:
+    return f"board_{board['id'][:8]}_{board['name'].replace(' ', '_')}.{RENDERERS[fmt].extension}"
+
+
+def write_board(out_dir: str, board: Dict[str, Any], team_name: str, tasks: List[Dict[str, Any]],
+                user_names: Dict[str, str], fmt: str = 'text') -> str:
+    """Render a board into out_dir (streamed into a temp file, then renamed), returns the file name"""
+    filename = board_filename(board, fmt)
+    renderer = RENDERERS[fmt]
+    with tempfile.NamedTemporaryFile(mode='w', dir=out_dir, delete=False, suffix='.tmp',
+                                     encoding='utf-8', newline=renderer.newline) as tmp_file:
+        tmp_path = tmp_file.name
+        try:
+            renderer.render(tmp_file, board, team_name, tasks, user_names)
+        except BaseException:
+            tmp_file.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, Path(out_dir) / filename)
+    return filename
+
+
+_CANONICAL = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
+
+
+def fingerprint(board: Dict[str, Any], team_name: str, tasks: List[Dict[str, Any]],
+                user_names: Dict[str, str], fmt: str = 'text') -> str:
+    """
+    Hash of everything that shows up in a board's export
+    The hash is fed one task at a time instead of from one big string, but
+    the bytes are those of the canonical (sorted keys, compact) JSON of
+    [RENDER_VERSION, fmt, board, team_name, tasks, user_names]
+    """
+    digest = hashlib.sha1()
+    update = digest.update
+    update(f"[{RENDER_VERSION},{_CANONICAL.encode(fmt)},{_CANONICAL.encode(board)},"
+           f"{_CANONICAL.encode(team_name)},[".encode('utf-8'))
+    separator = b''
+    for task in tasks:
+        update(separator)
+        update(_CANONICAL.encode(task).encode('utf-8'))
+        separator = b','
+    update(f"],{_CANONICAL.encode(user_names)}]".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_manifest(out_dir: str) -> Dict[str, Dict[str, str]]:
+    try:
+        with open(Path(out_dir) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}  # it's only a cache, start over
+
+
+def save_manifest(out_dir: str, manifest: Dict[str, Dict[str, str]]):
+    try:
+        with tempfile.NamedTemporaryFile(mode='w', dir=out_dir, delete=False,
+                                         suffix='.tmp', encoding='utf-8') as tmp_file:
+            json.dump(manifest, tmp_file)
+            tmp_path = tmp_file.name
+        os.replace(tmp_path, Path(out_dir) / MANIFEST_FILE)
+    except OSError:
+        if 'tmp_path' in locals() and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        # losing the cache only costs a re-render next time
+
+
+def _manifest_key(job: Dict[str, Any]) -> str:
+    return f"{job['board']['id']}/{job.get('format', 'text')}"
+
+
+# {"out_dir", "board", "team_name", "tasks", "user_names" (assignees only),
+#  "format" (a RENDERERS key, default text), "previous" (manifest entry from the last export, if any)}
+ExportJob = Dict[str, Any]
+
+
+def export_job(job: ExportJob) -> Dict[str, Any]:
+    """
+    Worker entry point - module level so process pools can pickle it
+    Skips rendering when the inputs hash to what produced the existing file
+    """
+    start = time.perf_counter()
+    board = job['board']
+    fmt = job.get('format', 'text')
+    digest = fingerprint(board, job['team_name'], job['tasks'], job['user_names'], fmt)
+    previous = job.get('previous') or {}
+    cached = (previous.get('fingerprint') == digest and
+              os.path.exists(Path(job['out_dir']) / previous['out_file']))
+    if cached:
+        filename = previous['out_file']
+    else:
+        filename = write_board(job['out_dir'], board, job['team_name'], job['tasks'], job['user_names'], fmt)
+    return {"board_id": board['id'], "format": fmt, "out_file": filename, "fingerprint": digest, "cached": cached,
+            "seconds": round(time.perf_counter() - start, 6)}
+
+
+def run_export_jobs(jobs: List[ExportJob], executor: str = 'process',
+                    workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Render the jobs in parallel, results come back in job order
+    The jobs' "previous" entries are filled from the out dir's manifest, which
+    is updated once at the end
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    manifests = {}
+    for job in jobs:
+        if job['out_dir'] not in manifests:
+            manifests[job['out_dir']] = load_manifest(job['out_dir'])
+        job['previous'] = manifests[job['out_dir']].get(_manifest_key(job))
+
+    if len(jobs) <= 1 or workers == 1:
+        results = [export_job(job) for job in jobs]  # not worth starting a pool
+    elif executor == 'process':
+        # imported here: it pulls in multiprocessing, which would otherwise be
+        # most of the API modules' import time
+        from concurrent.futures import ProcessPoolExecutor
+        # hand each worker several boards per round trip to keep pickling overhead down
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(export_job, jobs, chunksize=chunksize))
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(export_job, jobs))
+
+    changed = set()
+    for job, result in zip(jobs, results):
+        if not result['cached']:
+            manifests[job['out_dir']][_manifest_key(job)] = {
+                "out_file": result['out_file'], "fingerprint": result['fingerprint']}
+            changed.add(job['out_dir'])
+    for out_dir in changed:
+        save_manifest(out_dir, manifests[out_dir])
+    return results
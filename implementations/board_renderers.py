@@ -0,0 +1,179 @@
+"""
+Board export formats. A renderer writes a board to an open text file as it
+walks the tasks, so nothing proportional to the board size is built up in
+memory. Tasks are passed as a sequence because the grouped layouts (text,
+markdown) go over it once per status.
+"""
+import csv
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Sequence, TextIO
+
+STATUS_SECTIONS = [
+    # (status, heading, bullet used by the text layout)
+    ('OPEN', 'OPEN', '•'),
+    ('IN_PROGRESS', 'IN PROGRESS', '◐'),
+    ('COMPLETE', 'COMPLETE', '✓'),
+]
+
+
+class BoardRenderer(ABC):
+    """One export format"""
+
+    extension = ''
+    newline = None  # passed to open(); the csv module wants ''
+
+    @abstractmethod
+    def render(self, out: TextIO, board: Dict[str, Any], team_name: str,
+               tasks: Sequence[Dict[str, Any]], user_names: Dict[str, str]):
+        """Write the board to `out`"""
+
+
+def _assignee(task: Dict[str, Any], user_names: Dict[str, str]) -> str:
+    return user_names.get(task['user_id'], 'Unassigned')  # handle missing users
+
+
+def _status_counts(tasks: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    counts = {status: 0 for status, _, _ in STATUS_SECTIONS}
+    for task in tasks:
+        status = task['status'] if task['status'] in counts else 'COMPLETE'
+        counts[status] += 1
+    return counts
+
+
+def _in_section(task: Dict[str, Any], status: str) -> bool:
+    # anything unexpected is listed with the complete ones, like the original export did
+    if status == 'COMPLETE':
+        return task['status'] not in ('OPEN', 'IN_PROGRESS')
+    return task['status'] == status
+
+
+class _LineWriter:
+    """Writes lines separated (not terminated) by newlines, like '\\n'.join would"""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.first = True
+
+    def line(self, text: str):
+        if not self.first:
+            self.out.write('\n')
+        self.first = False
+        self.out.write(text)
+
+
+class TextRenderer(BoardRenderer):
+    """The original box-drawn export"""
+
+    extension = 'txt'
+
+    def render(self, out, board, team_name, tasks, user_names):
+        lines = _LineWriter(out)
+        lines.line("╔" + "═" * 60 + "╗")
+        lines.line(f"║{' BOARD: ' + board['name']:^60}║")
+        lines.line(f"║{' Team: ' + team_name:^60}║")
+        lines.line(f"║{' Status: ' + board['status']:^60}║")
+        lines.line("╠" + "═" * 60 + "╣")
+        lines.line(f"║{' Description:':60}║")
+
+        # Wrap description
+        desc_words = board['description'].split()
+        desc_line = ""
+        for word in desc_words:
+            if len(desc_line) + len(word) + 1 <= 58:
+                desc_line += word + " "
+            else:
+                lines.line(f"║ {desc_line:<58} ║")
+                desc_line = word + " "
+        if desc_line:
+            lines.line(f"║ {desc_line:<58} ║")
+
+        lines.line("╠" + "═" * 60 + "╣")
+
+        # Add tasks by status, one pass over the tasks per section
+        counts = _status_counts(tasks)
+        for status, heading, bullet in STATUS_SECTIONS:
+            if not counts[status]:
+                continue
+            lines.line(f"║ {heading + ' (' + str(counts[status]) + ')':58} ║")
+            for task in tasks:
+                if _in_section(task, status):
+                    user = _assignee(task, user_names)
+                    lines.line(f"║  {bullet} {task['title'][:40]:<40} ({user[:14]:<14}) ║")
+            if status != 'COMPLETE':
+                lines.line("║" + " " * 60 + "║")
+
+        lines.line("╠" + "═" * 60 + "╣")
+        lines.line(f"║ Created: {board['creation_time'][:19]:58} ║")
+        if board.get('end_time'):
+            lines.line(f"║ Closed: {board['end_time'][:19]:58} ║")
+        lines.line("╚" + "═" * 60 + "╝")
+
+
+class JsonRenderer(BoardRenderer):
+    """{"board": {...}, "team": <name>, "tasks": [...]} with the tasks written one at a time"""
+
+    extension = 'json'
+
+    def render(self, out, board, team_name, tasks, user_names):
+        out.write('{"board": ' + json.dumps(board) + ', "team": ' + json.dumps(team_name) + ', "tasks": [')
+        for index, task in enumerate(tasks):
+            if index:
+                out.write(', ')
+            out.write(json.dumps({**task, "user": _assignee(task, user_names)}))
+        out.write(']}\n')
+
+
+class CsvRenderer(BoardRenderer):
+    """One row per task, with the board and team repeated so rows stand on their own"""
+
+    extension = 'csv'
+    newline = ''
+    COLUMNS = ['board_id', 'board_name', 'team', 'task_id', 'title', 'description',
+               'status', 'user_id', 'user', 'creation_time']
+
+    def render(self, out, board, team_name, tasks, user_names):
+        writer = csv.writer(out)
+        writer.writerow(self.COLUMNS)
+        for task in tasks:
+            writer.writerow([board['id'], board['name'], team_name, task['id'], task['title'],
+                             task['description'], task['status'], task['user_id'],
+                             _assignee(task, user_names), task['creation_time']])
+
+
+class MarkdownRenderer(BoardRenderer):
+    """Board header plus a bullet list per status"""
+
+    extension = 'md'
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        return text.replace('\\', '\\\\').replace('*', '\\*').replace('_', '\\_')
+
+    def render(self, out, board, team_name, tasks, user_names):
+        out.write(f"# {self._escape(board['name'])}\n\n")
+        out.write(f"- **Team:** {self._escape(team_name)}\n")
+        out.write(f"- **Status:** {board['status']}\n")
+        out.write(f"- **Created:** {board['creation_time'][:19]}\n")
+        if board.get('end_time'):
+            out.write(f"- **Closed:** {board['end_time'][:19]}\n")
+        out.write(f"\n{self._escape(board['description'])}\n")
+
+        counts = _status_counts(tasks)
+        for status, heading, _ in STATUS_SECTIONS:
+            out.write(f"\n## {heading.title()} ({counts[status]})\n\n")
+            for task in tasks:
+                if _in_section(task, status):
+                    checkbox = 'x' if status == 'COMPLETE' else ' '
+                    out.write(f"- [{checkbox}] {self._escape(task['title'])} "
+                              f"({self._escape(_assignee(task, user_names))})\n")
+
+
+RENDERERS: Dict[str, BoardRenderer] = {
+    'text': TextRenderer(),
+    'json': JsonRenderer(),
+    'csv': CsvRenderer(),
+    'markdown': MarkdownRenderer(),
+}
+
+FORMATS: List[str] = list(RENDERERS)
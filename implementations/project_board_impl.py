@@ -1,28 +1,31 @@
 import json
 import sys
 import os
+import time
+from typing import Optional, Iterator, Dict, Any, List, Tuple, TYPE_CHECKING
 from datetime import datetime
 from pathlib import Path
 
-# Dynamically find the base classes directory
-def find_base_classes_dir():
-    current_dir = Path(__file__).parent.parent
-    for _ in range(3):  # search up to 3 levels up
-        for path in current_dir.rglob("project_board_base.py"):
-            return str(path.parent)
-        current_dir = current_dir.parent
-    return None
-
-base_dir = find_base_classes_dir()
-if base_dir:
-    sys.path.append(base_dir)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.base_classes import ensure_base_classes
+ensure_base_classes('project_board_base')
 
 from project_board_base import ProjectBoardBase
-from storage.json_storage import JsonStorage
+from storage.base import StorageBackend, skip_past
+from storage.registry import get_storage
 from models.board import Board
 from models.task import Task
-from utils.validators import validate_json_string, validate_string_length, validate_required_fields
+from models.task_table import TaskTable
+from utils.validators import (validate_json_string, validate_json_array, validate_string_length,
+                              validate_required_fields, validate_string_fields, validate_timestamp)
 from utils.exceptions import ValidationError, UniqueConstraintError, NotFoundError, ConstraintError
+from utils.pagination import page_params, paginate, stream_json_array
+
+# Search and export are imported on first use: together with re, csv, hashlib
+# and tempfile they were most of this module's import time
+if TYPE_CHECKING:
+    from storage.text_index import TaskSearchIndex
+    from implementations.board_export import ExportJob
 
 class ProjectBoardImpl(ProjectBoardBase):
     """
@@ -30,8 +33,10 @@ class ProjectBoardImpl(ProjectBoardBase):
     The export_board method took me forever to get right with the ASCII art
     """
     
-    def __init__(self):
-        self.storage = JsonStorage()
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        # any StorageBackend can be injected (e.g. SqliteStorage); by default all
+        # the implementations share the process-wide engine for db/
+        self.storage = storage if storage is not None else get_storage()
         # Make sure we have a place to put exported files
         self.out_dir = Path("out")
         self.out_dir.mkdir(exist_ok=True)
@@ -68,7 +73,10 @@ class ProjectBoardImpl(ProjectBoardBase):
         if 'creation_time' in data:
             board.creation_time = data['creation_time']
         
-        self.storage.create('boards', board.to_dict())
+        with self.storage.transaction():
+            self.storage.hold('board_stats', shard=board.id)  # same lock order as close_board
+            self.storage.create('boards', board.to_dict())
+            self.storage.create('board_stats', self._empty_stats(board.id))
         
         return json.dumps({"id": board.id})
     
@@ -77,28 +85,30 @@ class ProjectBoardImpl(ProjectBoardBase):
         data = validate_json_string(request)
         validate_required_fields(data, ['id'])
         
-        # Check if board exists
-        board_data = self.storage.find_by_id('boards', data['id'])
-        if not board_data:
-            raise NotFoundError(f"Board with id '{data['id']}' not found")
-        
-        # Check if already closed
-        if board_data['status'] == 'CLOSED':
-            raise ConstraintError("Board is already closed")
-        
-        # Check if all tasks are complete
-        tasks = self.storage.find_by_field('tasks', 'board_id', data['id'])
-        incomplete_tasks = [t for t in tasks if t['status'] != 'COMPLETE']
-        
-        if incomplete_tasks:
-            raise ConstraintError("Cannot close board with incomplete tasks")
-        
-        # Close the board
-        updates = {
-            'status': 'CLOSED',
-            'end_time': datetime.utcnow().isoformat()
-        }
-        self.storage.update('boards', data['id'], updates)
+        with self.storage.transaction():
+            # nobody can add or move tasks while we check and close
+            self._hold_counters(data['id'])
+            
+            # Check if board exists
+            board_data = self.storage.find_by_id('boards', data['id'])
+            if not board_data:
+                raise NotFoundError(f"Board with id '{data['id']}' not found")
+            
+            # Check if already closed
+            if board_data['status'] == 'CLOSED':
+                raise ConstraintError("Board is already closed")
+            
+            # Check if all tasks are complete - one counter lookup instead of loading the tasks
+            stats = self._board_stats(data['id'])
+            if stats['complete'] != stats['total']:
+                raise ConstraintError("Cannot close board with incomplete tasks")
+            
+            # Close the board
+            updates = {
+                'status': 'CLOSED',
+                'end_time': datetime.utcnow().isoformat()
+            }
+            self.storage.update('boards', data['id'], updates)
         
         return json.dumps({"status": "success"})
     
@@ -118,26 +128,13 @@ class ProjectBoardImpl(ProjectBoardBase):
         board_id = data.get('board_id')
         if not board_id:
             raise ValidationError("board_id is required")
-        
-        # Check if board exists and is open
-        board = self.storage.find_by_id('boards', board_id)
-        if not board:
-            raise NotFoundError(f"Board with id '{board_id}' not found")
-        
-        if board['status'] != 'OPEN':
-            raise ConstraintError("Can only add tasks to OPEN boards")
+        validate_string_fields(data, ['board_id'])
         
         # Check if user exists
         user = self.storage.find_by_id('users', data['user_id'])
         if not user:
             raise NotFoundError(f"User with id '{data['user_id']}' not found")
         
-        # Check unique constraint (task title must be unique within board)
-        board_tasks = self.storage.find_by_field('tasks', 'board_id', board_id)
-        for task in board_tasks:
-            if task['title'] == data['title']:
-                raise UniqueConstraintError(f"Task with title '{data['title']}' already exists in this board")
-        
         # Create task
         task = Task(
             title=data['title'],
@@ -150,10 +147,99 @@ class ProjectBoardImpl(ProjectBoardBase):
         if 'creation_time' in data:
             task.creation_time = data['creation_time']
         
-        self.storage.create('tasks', task.to_dict())
+        with self.storage.transaction():
+            self._hold_counters(board_id)
+            
+            # Check if board exists and is open
+            board = self.storage.find_by_id('boards', board_id)
+            if not board:
+                raise NotFoundError(f"Board with id '{board_id}' not found")
+            
+            if board['status'] != 'OPEN':
+                raise ConstraintError("Can only add tasks to OPEN boards")
+            
+            # Check unique constraint (task title must be unique within board)
+            board_tasks = self.storage.find_by_field('tasks', 'board_id', board_id)
+            for existing in board_tasks:
+                if existing['title'] == data['title']:
+                    raise UniqueConstraintError(f"Task with title '{data['title']}' already exists in this board")
+            
+            stats = self._board_stats(board_id)  # before the insert, a backfill would count it
+            self.storage.create('tasks', task.to_dict())
+            self._save_stats(stats, {'OPEN': 1}, added=1)
+        self._search_index().add_tasks([task.to_dict()])
         
         return json.dumps({"id": task.id})
     
+    def add_tasks(self, request: str) -> str:
+        """
+        Batch version of add_task for sprint imports
+        :param request: A json string with {"board_id": <board_id>, "tasks": [{"title", "description", "user_id"}, ...]}
+        :return: A json array with {"id": <task_id>} or {"error": <message>} per task, in order
+
+        The board, the assignees and the existing titles are looked up once
+        for the whole batch, and every valid task is written in one transaction.
+        A missing or closed board fails the whole request.
+        """
+        data = validate_json_string(request)
+        validate_required_fields(data, ['board_id', 'tasks'])
+        validate_string_fields(data, ['board_id'])
+        if not isinstance(data['tasks'], list):
+            raise ValidationError("tasks must be a list")
+        
+        with self.storage.transaction():
+            self._hold_counters(data['board_id'])
+            
+            board = self.storage.find_by_id('boards', data['board_id'])
+            if not board:
+                raise NotFoundError(f"Board with id '{data['board_id']}' not found")
+            if board['status'] != 'OPEN':
+                raise ConstraintError("Can only add tasks to OPEN boards")
+            
+            titles = {task['title'] for task in self.storage.find_by_field('tasks', 'board_id', board['id'])}
+            users = {}  # user id -> exists
+            results = []
+            new_tasks = []
+            for item in data['tasks']:
+                try:
+                    if not isinstance(item, dict):
+                        raise ValidationError("Each task must be a JSON object")
+                    validate_required_fields(item, ['title', 'description', 'user_id'])
+                    validate_string_fields(item, ['title', 'description', 'user_id'])
+                    if 'creation_time' in item:
+                        validate_string_fields(item, ['creation_time'])
+                    validate_string_length(item['title'], 'title', 64)
+                    validate_string_length(item['description'], 'description', 128)
+                    if item['user_id'] not in users:
+                        users[item['user_id']] = self.storage.find_by_id('users', item['user_id']) is not None
+                    if not users[item['user_id']]:
+                        raise NotFoundError(f"User with id '{item['user_id']}' not found")
+                    if item['title'] in titles:
+                        raise UniqueConstraintError(f"Task with title '{item['title']}' already exists in this board")
+                except (ValidationError, NotFoundError) as e:
+                    results.append({"error": str(e)})
+                    continue
+                titles.add(item['title'])
+                task = Task(
+                    title=item['title'],
+                    description=item['description'],
+                    user_id=item['user_id'],
+                    board_id=board['id']
+                )
+                if 'creation_time' in item:
+                    task.creation_time = item['creation_time']
+                new_tasks.append(task)
+                results.append({"id": task.id})
+            
+            stats = self._board_stats(board['id'])
+            for task in new_tasks:
+                self.storage.create('tasks', task.to_dict())
+            self._save_stats(stats, {'OPEN': len(new_tasks)}, added=len(new_tasks))
+        if new_tasks:
+            self._search_index().add_tasks(task.to_dict() for task in new_tasks)
+        
+        return json.dumps(results)
+    
     def update_task_status(self, request: str):
         """Update task status"""
         data = validate_json_string(request)
@@ -164,43 +250,317 @@ class ProjectBoardImpl(ProjectBoardBase):
         if data['status'] not in valid_statuses:
             raise ValidationError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
         
-        # Check if task exists
-        task = self.storage.find_by_id('tasks', data['id'])
-        if not task:
-            raise NotFoundError(f"Task with id '{data['id']}' not found")
-        
-        # Update task status
-        self.storage.update('tasks', data['id'], {'status': data['status']})
+        with self.storage.transaction():
+            # Check if task exists
+            task = self._held_task(data['id'])  # its board locked before reading the old status
+            if not task:
+                raise NotFoundError(f"Task with id '{data['id']}' not found")
+            
+            # Update task status and move it between the board's counters
+            stats = self._board_stats(task['board_id'])
+            self.storage.update('tasks', data['id'], {'status': data['status']})
+            if task['status'] != data['status']:
+                self._save_stats(stats, {task['status']: -1, data['status']: 1})
+        if task['status'] != data['status']:
+            self._search_index().set_statuses([(data['id'], data['status'])])
         
         return json.dumps({"status": "success"})
     
-    def list_boards(self, request: str) -> str:
-        """List all open boards for a team"""
+    def update_task_statuses(self, request: str) -> str:
+        """
+        Batch version of update_task_status
+        :param request: A json array of {"id": <task_id>, "status": <status>} objects
+        :return: A json array with {"status": "success"} or {"error": <message>} per item, in order
+
+        All the updates are applied in one transaction (one write per touched collection).
+        """
+        items = validate_json_array(request)
+        valid_statuses = ['OPEN', 'IN_PROGRESS', 'COMPLETE']
+        results = []
+        
+        with self.storage.transaction():
+            # lock every board involved up front and in one order, so two batches can't deadlock
+            ids = [item['id'] for item in items if isinstance(item, dict) and isinstance(item.get('id'), str)]
+            for board_id in sorted({task['board_id'] for task in self.storage.find_by_ids('tasks', ids)}):
+                self._hold_counters(board_id)
+            stats = {}  # board id -> counters, loaded before any of that board's tasks change
+            deltas = {}  # board id -> {status: change}
+            changed = []  # (task id, new status) for the search index
+            for item in items:
+                try:
+                    if not isinstance(item, dict):
+                        raise ValidationError("Each update must be a JSON object")
+                    validate_required_fields(item, ['id', 'status'])
+                    validate_string_fields(item, ['id', 'status'])
+                    if item['status'] not in valid_statuses:
+                        raise ValidationError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+                    task = self._held_task(item['id'])
+                    if not task:
+                        raise NotFoundError(f"Task with id '{item['id']}' not found")
+                except (ValidationError, NotFoundError) as e:
+                    results.append({"error": str(e)})
+                    continue
+                board_id = task['board_id']
+                if board_id not in stats:
+                    stats[board_id] = self._board_stats(board_id)
+                    deltas[board_id] = {}
+                self.storage.update('tasks', item['id'], {'status': item['status']})
+                changed.append((item['id'], item['status']))
+                delta = deltas[board_id]
+                delta[task['status']] = delta.get(task['status'], 0) - 1
+                delta[item['status']] = delta.get(item['status'], 0) + 1
+                results.append({"status": "success"})
+            for board_id, board_stats in stats.items():
+                self._save_stats(board_stats, deltas[board_id])
+        if changed:
+            self._search_index().set_statuses(changed)
+        
+        return json.dumps(results)
+    
+    # Per-board task counters, kept in the 'board_stats' collection (keyed by board id,
+    # one shard per board where the engine shards) and updated in the same transaction
+    # as the task writes
+    STAT_FIELDS = {'OPEN': 'open', 'IN_PROGRESS': 'in_progress', 'COMPLETE': 'complete'}
+    
+    @classmethod
+    def _empty_stats(cls, board_id: str) -> Dict[str, Any]:
+        stats = {"id": board_id, "total": 0}
+        for counter in cls.STAT_FIELDS.values():
+            stats[counter] = 0
+        return stats
+    
+    def _hold_counters(self, board_id: str):
+        """
+        Lock a board's counters and tasks before reading either. _save_stats
+        writes values computed from what was read, so without the lock two
+        processes could both start from the same counts and one update would
+        be lost. Only that board's shards are locked where the engine shards,
+        so writes to different boards don't wait for each other. Every
+        transaction takes it first, so the lock order is the same everywhere
+        (board_stats, tasks, then boards; several boards in id order).
+        """
+        self.storage.hold('board_stats', 'tasks', shard=board_id)
+    
+    def _held_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """A task read again once its board is locked (None if it doesn't exist)"""
+        task = self.storage.find_by_id('tasks', task_id)
+        if task is None:
+            return None
+        self._hold_counters(task['board_id'])  # a no-op when it's held already
+        return self.storage.find_by_id('tasks', task_id)
+    
+    def _board_stats(self, board_id: str) -> Dict[str, Any]:
+        """
+        Counters for a board, built from its tasks the first time for boards
+        that predate the counters. Call inside a transaction after
+        _hold_counters(board_id), before changing any of the board's tasks.
+        """
+        stats = self.storage.find_by_id('board_stats', board_id)
+        if stats is not None:
+            return stats
+        # counted over TaskTable's columns rather than task by task
+        table = TaskTable.from_records(self.storage.find_by_field('tasks', 'board_id', board_id))
+        counts = table.status_counts_by_board().get(board_id, {})
+        stats = self._empty_stats(board_id)
+        for status, counter in self.STAT_FIELDS.items():
+            stats[counter] = counts.get(status, 0)
+        stats['total'] = len(table)
+        self.storage.create('board_stats', stats)
+        return stats
+    
+    def _save_stats(self, stats: Dict[str, Any], delta: Dict[str, int], added: int = 0):
+        """Apply {status: change} (plus `added` new tasks) to a board's counters"""
+        updates = {}
+        for status, change in delta.items():
+            counter = self.STAT_FIELDS[status]
+            updates[counter] = updates.get(counter, stats[counter]) + change
+        if added:
+            updates['total'] = stats['total'] + added
+        if updates:
+            self.storage.update('board_stats', stats['id'], updates)
+    
+    def get_board_summary(self, request: str) -> str:
+        """
+        Task counts of a board
+        :param request: A json string with {"id": <board_id>}
+        :return: A json string with {"id", "name", "status", "open", "in_progress", "complete", "total"}
+        """
         data = validate_json_string(request)
-        validate_required_fields(data, ['id'])  # team_id
+        validate_required_fields(data, ['id'])
         
-        # Check if team exists
-        team = self.storage.find_by_id('teams', data['id'])
-        if not team:
-            raise NotFoundError(f"Team with id '{data['id']}' not found")
+        board = self.storage.find_by_id('boards', data['id'])
+        if not board:
+            raise NotFoundError(f"Board with id '{data['id']}' not found")
         
-        # Get open boards for the team
-        all_boards = self.storage.find_by_field('boards', 'team_id', data['id'])
-        open_boards = [b for b in all_boards if b['status'] == 'OPEN']
+        stats = self.storage.find_by_id('board_stats', board['id'])
+        if stats is None:
+            with self.storage.transaction():  # the counters need a backfill
+                self._hold_counters(board['id'])
+                stats = self._board_stats(board['id'])
         
+        result = {"id": board['id'], "name": board['name'], "status": board['status']}
+        for counter in ('open', 'in_progress', 'complete', 'total'):
+            result[counter] = stats[counter]
+        return json.dumps(result)
+    
+    def _search_index(self) -> 'TaskSearchIndex':
+        """The task search index for our db folder, built from the tasks on first use"""
+        from storage.text_index import get_task_index
+        index = get_task_index(getattr(self.storage, 'db_path', 'db'))
+        if not index.exists:
+            index.rebuild(self.storage.scan('tasks'))
+        return index
+    
+    def search_tasks(self, request: str) -> str:
+        """
+        Full-text search over task titles and descriptions
+        :param request: A json string with {"query": <words>} and optional filters "team_id", "board_id",
+                        "status", "user_id", plus "limit" (default 20, max 100)
+        :return: A json array of {"id", "title", "description", "board_id", "user_id", "status", "score"},
+                 best match first. Each word matches whole words or word prefixes ("deplo" finds "deploy")
+        """
+        data = validate_json_string(request)
+        validate_required_fields(data, ['query'])
+        if not isinstance(data['query'], str):
+            raise ValidationError("query must be a string")
+        validate_string_length(data['query'], 'query', 256)
+        
+        limit = data.get('limit', 20)
+        if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= 100:
+            raise ValidationError("limit must be an integer between 1 and 100")
+        status = data.get('status')
+        if status is not None and status not in self.STAT_FIELDS:
+            raise ValidationError(f"Invalid status. Must be one of: {', '.join(self.STAT_FIELDS)}")
+        
+        board_ids = None
+        if 'team_id' in data:
+            if not self.storage.find_by_id('teams', data['team_id']):
+                raise NotFoundError(f"Team with id '{data['team_id']}' not found")
+            board_ids = {b['id'] for b in self.storage.find_by_field('boards', 'team_id', data['team_id'])}
+        if 'board_id' in data:
+            board_ids = {data['board_id']} if board_ids is None else board_ids & {data['board_id']}
+        
+        hits = self._search_index().search(data['query'], board_ids=board_ids, status=status,
+                                           user_id=data.get('user_id'), limit=limit)
+        
+        # the task records come from storage; ids the index still has but storage doesn't are dropped
+        tasks = {t['id']: t for t in self.storage.find_by_ids('tasks', [task_id for task_id, _ in hits])}
         result = []
-        for board in open_boards:
+        for task_id, score in hits:
+            task = tasks.get(task_id)
+            if task is None:
+                continue
             result.append({
-                "id": board['id'],
-                "name": board['name']
+                "id": task['id'],
+                "title": task['title'],
+                "description": task['description'],
+                "board_id": task['board_id'],
+                "user_id": task['user_id'],
+                "status": task['status'],
+                "score": score
             })
         
         return json.dumps(result)
     
+    @staticmethod
+    def _time_window(data: Dict[str, Any]) -> Tuple[str, str]:
+        validate_required_fields(data, ['start', 'end'])
+        return validate_timestamp(data['start'], 'start'), validate_timestamp(data['end'], 'end')
+    
+    def list_tasks_created_between(self, request: str) -> str:
+        """
+        Tasks created in a time window, read off the sorted creation_time index
+        :param request: A json string with {"start": <time>, "end": <time>} (UTC, start inclusive,
+                        end exclusive), e.g. {"start": "2024-01-01", "end": "2024-01-08"}
+        :return: A json array of {"id", "title", "description", "board_id", "user_id", "status",
+                 "creation_time"}, oldest first
+        """
+        data = validate_json_string(request)
+        start, end = self._time_window(data)
+        return json.dumps([{
+            "id": task['id'],
+            "title": task['title'],
+            "description": task['description'],
+            "board_id": task['board_id'],
+            "user_id": task['user_id'],
+            "status": task['status'],
+            "creation_time": task['creation_time']
+        } for task in self.storage.find_range('tasks', 'creation_time', start, end)])
+    
+    def list_boards_closed_between(self, request: str) -> str:
+        """
+        Boards closed in a time window, read off the sorted end_time index
+        :param request: A json string with {"start": <time>, "end": <time>} (UTC, start inclusive,
+                        end exclusive)
+        :return: A json array of {"id", "name", "team_id", "end_time"}, earliest closed first
+        """
+        data = validate_json_string(request)
+        start, end = self._time_window(data)
+        return json.dumps([{
+            "id": board['id'],
+            "name": board['name'],
+            "team_id": board['team_id'],
+            "end_time": board['end_time']
+        } for board in self.storage.find_range('boards', 'end_time', start, end)])
+    
+    def _open_boards(self, team_id: str, after_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Open boards of a team (checks the team exists), optionally those after
+        the board `after_id`. The cursor is looked up among all of the team's
+        boards, so a page still resumes when its last board was closed meanwhile;
+        that relies on find_by_field returning them in insertion order, which
+        updates don't change (closing a board used to move it to the end)
+        """
+        team = self.storage.find_by_id('teams', team_id)
+        if not team:
+            raise NotFoundError(f"Team with id '{team_id}' not found")
+        
+        all_boards = iter(self.storage.find_by_field('boards', 'team_id', team_id))
+        return (b for b in skip_past(all_boards, after_id) if b['status'] == 'OPEN')
+    
+    @staticmethod
+    def _board_summary(board: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": board['id'],
+            "name": board['name']
+        }
+    
+    def list_boards(self, request: str) -> str:
+        """
+        List all open boards for a team
+        With "limit" and/or "cursor" in the request it returns one page as
+        {"items": [...], "next_cursor": <cursor or null>}
+        """
+        data = validate_json_string(request)
+        validate_required_fields(data, ['id'])  # team_id
+        
+        if 'limit' in data or 'cursor' in data:
+            limit, after_id = page_params(data)
+            return json.dumps(paginate(self._open_boards(data['id'], after_id), limit, self._board_summary))
+        
+        return json.dumps([self._board_summary(board) for board in self._open_boards(data['id'])])
+    
+    def stream_boards(self, request: str) -> Iterator[str]:
+        """list_boards() output as a stream of JSON chunks"""
+        data = validate_json_string(request)
+        validate_required_fields(data, ['id'])
+        return stream_json_array(self._board_summary(board) for board in self._open_boards(data['id']))
+    
+    def _export_format(self, data: Dict[str, Any]) -> str:
+        from implementations.board_renderers import FORMATS
+        fmt = data.get('format', 'text')
+        if fmt not in FORMATS:
+            raise ValidationError(f"Invalid format. Must be one of: {', '.join(FORMATS)}")
+        return fmt
+    
     def export_board(self, request: str) -> str:
-        """Export board to a text file with creative formatting - this was the fun part!"""
+        """
+        Export board to a text file with creative formatting - this was the fun part!
+        An optional "format" in the request picks another renderer: json, csv or markdown
+        """
         data = validate_json_string(request)
         validate_required_fields(data, ['id'])
+        fmt = self._export_format(data)
         
         # Get the board first
         board = self.storage.find_by_id('boards', data['id'])
@@ -214,82 +574,98 @@ class ProjectBoardImpl(ProjectBoardBase):
         # Get all tasks for this board
         tasks = self.storage.find_by_field('tasks', 'board_id', data['id'])
         
-        # Sort tasks by status - makes the output look nicer
-        open_tasks = []
-        in_progress_tasks = []
-        complete_tasks = []
-        
-        # Build user lookup map for performance
-        users = self.storage.read('users')
+        # Display names of just the assignees
+        users = self.storage.find_by_ids('users', {task['user_id'] for task in tasks})
         user_map = {u['id']: u['display_name'] for u in users}
         
-        # Group tasks by their status
-        for task in tasks:
-            task_info = {
-                'title': task['title'],
-                'user': user_map.get(task['user_id'], 'Unassigned')  # handle missing users
-            }
-            
-            # Could probably use a dictionary here but this is clearer
-            if task['status'] == 'OPEN':
-                open_tasks.append(task_info)
-            elif task['status'] == 'IN_PROGRESS':
-                in_progress_tasks.append(task_info)
-            else:  # COMPLETE
-                complete_tasks.append(task_info)
-        
-        # Create formatted output
-        output = []
-        output.append("╔" + "═" * 60 + "╗")
-        output.append(f"║{' BOARD: ' + board['name']:^60}║")
-        output.append(f"║{' Team: ' + team_name:^60}║")
-        output.append(f"║{' Status: ' + board['status']:^60}║")
-        output.append("╠" + "═" * 60 + "╣")
-        output.append(f"║{' Description:':60}║")
-        
-        # Wrap description
-        desc_words = board['description'].split()
-        desc_line = ""
-        for word in desc_words:
-            if len(desc_line) + len(word) + 1 <= 58:
-                desc_line += word + " "
-            else:
-                output.append(f"║ {desc_line:<58} ║")
-                desc_line = word + " "
-        if desc_line:
-            output.append(f"║ {desc_line:<58} ║")
-        
-        output.append("╠" + "═" * 60 + "╣")
-        
-        # Add tasks by status
-        if open_tasks:
-            output.append(f"║ {'OPEN (' + str(len(open_tasks)) + ')':58} ║")
-            for task in open_tasks:
-                output.append(f"║  • {task['title'][:40]:<40} ({task['user'][:14]:<14}) ║")
-            output.append("║" + " " * 60 + "║")
-        
-        if in_progress_tasks:
-            output.append(f"║ {'IN PROGRESS (' + str(len(in_progress_tasks)) + ')':58} ║")
-            for task in in_progress_tasks:
-                output.append(f"║  ◐ {task['title'][:40]:<40} ({task['user'][:14]:<14}) ║")
-            output.append("║" + " " * 60 + "║")
-        
-        if complete_tasks:
-            output.append(f"║ {'COMPLETE (' + str(len(complete_tasks)) + ')':58} ║")
-            for task in complete_tasks:
-                output.append(f"║  ✓ {task['title'][:40]:<40} ({task['user'][:14]:<14}) ║")
-        
-        output.append("╠" + "═" * 60 + "╣")
-        output.append(f"║ Created: {board['creation_time'][:19]:58} ║")
-        if board.get('end_time'):
-            output.append(f"║ Closed: {board['end_time'][:19]:58} ║")
-        output.append("╚" + "═" * 60 + "╝")
-        
-        # Write to file
-        filename = f"board_{board['id'][:8]}_{board['name'].replace(' ', '_')}.txt"
-        file_path = self.out_dir / filename
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(output))
-        
-        return json.dumps({"out_file": filename})
\ No newline at end of file
+        # Rendering lives in board_export so the bulk exports can run it in worker processes;
+        # an unchanged board just gets its existing file back
+        job = {"out_dir": str(self.out_dir), "board": board, "team_name": team_name,
+               "tasks": tasks, "user_names": user_map, "format": fmt}
+        from implementations.board_export import run_export_jobs
+        result = run_export_jobs([job])[0]
+        
+        return json.dumps({"out_file": result['out_file']})
+    
+    def _export_jobs(self, boards: List[Dict[str, Any]], scan_tasks: bool, fmt: str) -> List['ExportJob']:
+        """
+        Everything the export workers need, loaded once for all the boards
+        scan_tasks: one pass over all tasks instead of a lookup per board (for exporting everything)
+        """
+        team_names = {team['id']: team['name']
+                      for team in self.storage.find_by_ids('teams', {b['team_id'] for b in boards})}
+        if scan_tasks:
+            tasks_by_board = {board['id']: [] for board in boards}
+            for task in self.storage.scan('tasks'):
+                if task['board_id'] in tasks_by_board:
+                    tasks_by_board[task['board_id']].append(task)
+        else:
+            tasks_by_board = {board['id']: self.storage.find_by_field('tasks', 'board_id', board['id'])
+                              for board in boards}
+        user_ids = {task['user_id'] for tasks in tasks_by_board.values() for task in tasks}
+        user_names = {u['id']: u['display_name'] for u in self.storage.find_by_ids('users', user_ids)}
+        
+        jobs = []
+        for board in boards:
+            tasks = tasks_by_board[board['id']]
+            # each worker only gets the names it needs, keeps pickling small
+            names = {task['user_id']: user_names[task['user_id']]
+                     for task in tasks if task['user_id'] in user_names}
+            jobs.append({"out_dir": str(self.out_dir), "board": board,
+                         "team_name": team_names.get(board['team_id'], "Unknown Team"),
+                         "tasks": tasks, "user_names": names, "format": fmt})
+        return jobs
+    
+    def _export_many(self, boards: List[Dict[str, Any]], data: Dict[str, Any], scan_tasks: bool) -> str:
+        from implementations.board_export import EXECUTORS, run_export_jobs
+        fmt = self._export_format(data)
+        executor = data.get('executor', 'process')
+        if executor not in EXECUTORS:
+            raise ValidationError(f"Invalid executor. Must be one of: {', '.join(EXECUTORS)}")
+        if 'workers' in data:
+            workers = data['workers']
+            if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+                raise ValidationError("workers must be a positive integer")
+        else:
+            workers = os.cpu_count() or 1
+        
+        start = time.perf_counter()
+        jobs = self._export_jobs(boards, scan_tasks, fmt)
+        loaded = time.perf_counter()
+        files = run_export_jobs(jobs, executor, workers)
+        
+        return json.dumps({
+            "files": files,
+            "format": fmt,
+            "executor": executor,
+            "cached": sum(1 for f in files if f['cached']),
+            "workers": workers,
+            "load_seconds": round(loaded - start, 6),
+            "total_seconds": round(time.perf_counter() - start, 6)
+        })
+    
+    def export_team_boards(self, request: str) -> str:
+        """
+        Export every board of a team in parallel
+        :param request: A json string with {"id": <team_id>} and optionally "format" (as in export_board),
+                        "executor": "process" (default) or "thread", "workers": <n> (default: cpu count)
+        :return: A json manifest {"files": [{"board_id", "format", "out_file", "fingerprint", "cached", "seconds"}],
+                 "format", "executor", "workers", "cached", "load_seconds", "total_seconds"}
+        Boards whose inputs are unchanged since their last export keep their file ("cached": true)
+        """
+        data = validate_json_string(request)
+        validate_required_fields(data, ['id'])
+        
+        team = self.storage.find_by_id('teams', data['id'])
+        if not team:
+            raise NotFoundError(f"Team with id '{data['id']}' not found")
+        
+        boards = self.storage.find_by_field('boards', 'team_id', data['id'])
+        return self._export_many(boards, data, scan_tasks=False)
+    
+    def export_all_boards(self, request: Optional[str] = None) -> str:
+        """
+        Export every board (the nightly export), same options and manifest as export_team_boards
+        """
+        data = validate_json_string(request) if request is not None else {}
+        return self._export_many(self.storage.read('boards'), data, scan_tasks=True)
\ No newline at end of file
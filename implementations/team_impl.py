@@ -1,32 +1,27 @@
 import json
 import sys
 import os
-from pathlib import Path
+from typing import Optional, Iterator, Dict, Any
 
-# Dynamically find the base classes directory
-def find_base_classes_dir():
-    current_dir = Path(__file__).parent.parent
-    for _ in range(3):  # search up to 3 levels up
-        for path in current_dir.rglob("team_base.py"):
-            return str(path.parent)
-        current_dir = current_dir.parent
-    return None
-
-base_dir = find_base_classes_dir()
-if base_dir:
-    sys.path.append(base_dir)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.base_classes import ensure_base_classes
+ensure_base_classes('team_base')
 
 from team_base import TeamBase
-from storage.json_storage import JsonStorage
+from storage.base import StorageBackend
+from storage.registry import get_storage
 from models.team import Team, TeamMember
-from utils.validators import validate_json_string, validate_string_length, validate_required_fields, validate_id_format
+from utils.validators import validate_json_string, validate_json_array, validate_string_length, validate_required_fields, validate_string_fields, validate_id_format
 from utils.exceptions import ValidationError, UniqueConstraintError, NotFoundError, ConstraintError
+from utils.pagination import page_params, paginate, stream_json_array
 
 class TeamImpl(TeamBase):
     """Concrete implementation of TeamBase"""
     
-    def __init__(self):
-        self.storage = JsonStorage()
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        # any StorageBackend can be injected (e.g. SqliteStorage); by default all
+        # the implementations share the process-wide engine for db/
+        self.storage = storage if storage is not None else get_storage()
         
     def create_team(self, request: str) -> str:
         """Create a new team"""
@@ -48,34 +43,85 @@ class TeamImpl(TeamBase):
         if existing_teams:
             raise UniqueConstraintError(f"Team with name '{data['name']}' already exists")
         
-        # Create team
+        # Create team and add admin as team member - both land or neither does
         team = Team(
             name=data['name'],
             description=data['description'],
             admin=data['admin']
         )
-        self.storage.create('teams', team.to_dict())
-        
-        # Add admin as team member
         member = TeamMember(team_id=team.id, user_id=data['admin'])
-        self.storage.create('team_members', member.to_dict())
+        with self.storage.transaction():
+            self.storage.create('teams', team.to_dict())
+            self.storage.create('team_members', member.to_dict())
         
         return json.dumps({"id": team.id})
     
-    def list_teams(self) -> str:
-        """List all teams"""
-        teams = self.storage.read('teams')
-        result = []
-        
-        for team_data in teams:
-            result.append({
-                "name": team_data['name'],
-                "description": team_data['description'],
-                "creation_time": team_data['creation_time'],
-                "admin": team_data['admin']
-            })
+    def create_teams(self, request: str) -> str:
+        """
+        Batch version of create_team
+        :param request: A json array of {"name", "description", "admin"} objects
+        :return: A json array with {"id": <team_id>} or {"error": <message>} per item, in order
+
+        Same checks as create_team, done in one pass over the batch, and every
+        valid team (plus its admin membership) is written in one transaction.
+        Names are read with teams already locked, and a clash the storage
+        still reports fails only its item.
+        """
+        items = validate_json_array(request)
+        admins = {}  # admin id -> exists, so repeated admins are only looked up once
+        results = []
+        with self.storage.transaction():
+            self.storage.hold('teams', 'team_members')  # create_team's order
+            taken = {team['name'] for team in self.storage.scan('teams')}
+            for item in items:
+                try:
+                    if not isinstance(item, dict):
+                        raise ValidationError("Each team must be a JSON object")
+                    validate_required_fields(item, ['name', 'description', 'admin'])
+                    validate_string_fields(item, ['name', 'description', 'admin'])
+                    validate_string_length(item['name'], 'name', 64)
+                    validate_string_length(item['description'], 'description', 128)
+                    if item['admin'] not in admins:
+                        admins[item['admin']] = self.storage.find_by_id('users', item['admin']) is not None
+                    if not admins[item['admin']]:
+                        raise NotFoundError(f"Admin user with id '{item['admin']}' not found")
+                    if item['name'] in taken:
+                        raise UniqueConstraintError(f"Team with name '{item['name']}' already exists")
+                    team = Team(name=item['name'], description=item['description'], admin=item['admin'])
+                    self.storage.create('teams', team.to_dict())
+                except (ValidationError, NotFoundError) as e:  # UniqueConstraintError included
+                    results.append({"error": str(e)})
+                    continue
+                self.storage.create('team_members', TeamMember(team_id=team.id, user_id=item['admin']).to_dict())
+                taken.add(item['name'])
+                results.append({"id": team.id})
+
+        return json.dumps(results)
+    
+    @staticmethod
+    def _team_summary(team_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": team_data['name'],
+            "description": team_data['description'],
+            "creation_time": team_data['creation_time'],
+            "admin": team_data['admin']
+        }
+    
+    def list_teams(self, request: Optional[str] = None) -> str:
+        """
+        List all teams
+        Pass {"limit": n, "cursor": <next_cursor>} to page through them (same shape as list_users)
+        """
+        if request is None:
+            return json.dumps([self._team_summary(team) for team in self.storage.read('teams')])
         
-        return json.dumps(result)
+        data = validate_json_string(request)
+        limit, after_id = page_params(data)
+        return json.dumps(paginate(self.storage.scan('teams', after_id), limit, self._team_summary))
+    
+    def stream_teams(self) -> Iterator[str]:
+        """list_teams() output as a stream of JSON chunks"""
+        return stream_json_array(self._team_summary(team) for team in self.storage.scan('teams'))
     
     def describe_team(self, request: str) -> str:
         """Get team details by ID"""
@@ -150,23 +196,27 @@ class TeamImpl(TeamBase):
         if len(data['users']) > 50:
             raise ConstraintError("Cannot add more than 50 users at once")
         
-        # Get current team members
-        current_members = self.storage.find_by_field('team_members', 'team_id', data['id'])
-        current_member_ids = {m['user_id'] for m in current_members}
-        
-        # Add new members
+        # One transaction: users/team_members are loaded once and written once,
+        # instead of a full read-modify-write of team_members per added user
         added = 0
-        for user_id in data['users']:
-            # Check if user exists
-            user = self.storage.find_by_id('users', user_id)
-            if not user:
-                continue  # Skip non-existent users
+        with self.storage.transaction():
+            # Get current team members
+            current_members = self.storage.find_by_field('team_members', 'team_id', data['id'])
+            current_member_ids = {m['user_id'] for m in current_members}
             
-            # Check if already a member
-            if user_id not in current_member_ids:
-                member = TeamMember(team_id=data['id'], user_id=user_id)
-                self.storage.create('team_members', member.to_dict())
-                added += 1
+            # Add new members
+            for user_id in data['users']:
+                # Check if user exists
+                user = self.storage.find_by_id('users', user_id)
+                if not user:
+                    continue  # Skip non-existent users
+                
+                # Check if already a member
+                if user_id not in current_member_ids:
+                    member = TeamMember(team_id=data['id'], user_id=user_id)
+                    self.storage.create('team_members', member.to_dict())
+                    current_member_ids.add(user_id)  # same id twice in one request
+                    added += 1
         
         return json.dumps({"added": added})
     
@@ -184,20 +234,24 @@ class TeamImpl(TeamBase):
         if len(data['users']) > 50:
             raise ConstraintError("Cannot remove more than 50 users at once")
         
-        # Get all team members
-        all_members = self.storage.read('team_members')
+        # Memberships have no id, so filter the whole collection - locked before
+        # it is read, or a concurrent add_users_to_team could be written over
         removed = 0
-        
-        # Filter out users to be removed
-        updated_members = []
-        for member in all_members:
-            if member['team_id'] == data['id'] and member['user_id'] in data['users']:
-                removed += 1
-            else:
-                updated_members.append(member)
-        
-        # Write back updated members
-        self.storage.write('team_members', updated_members)
+        with self.storage.transaction():
+            self.storage.hold('team_members')
+            all_members = self.storage.read('team_members')
+            
+            # Filter out users to be removed
+            updated_members = []
+            for member in all_members:
+                if member['team_id'] == data['id'] and member['user_id'] in data['users']:
+                    removed += 1
+                else:
+                    updated_members.append(member)
+            
+            # Write back updated members
+            if removed:
+                self.storage.write('team_members', updated_members)
         
         return json.dumps({"removed": removed})
     
@@ -211,21 +265,16 @@ class TeamImpl(TeamBase):
         if not team_data:
             raise NotFoundError(f"Team with id '{data['id']}' not found")
         
-        # Get team members
+        # Get team members (indexed on team_id) and resolve just those users by id
         members = self.storage.find_by_field('team_members', 'team_id', data['id'])
+        users = self.storage.find_by_ids('users', [m['user_id'] for m in members])
         
-        # Get user details
         result = []
-        users = self.storage.read('users')
-        
-        for member in members:
-            for user in users:
-                if user['id'] == member['user_id']:
-                    result.append({
-                        "id": user['id'],
-                        "name": user['name'],
-                        "display_name": user['display_name']
-                    })
-                    break
+        for user in users:
+            result.append({
+                "id": user['id'],
+                "name": user['name'],
+                "display_name": user['display_name']
+            })
         
         return json.dumps(result)
\ No newline at end of file
@@ -1,28 +1,21 @@
 import json
 import sys
 import os
-from pathlib import Path
+from typing import Optional, Iterator, Dict, Any
 
-# Dynamically find the base classes - much better than hardcoding!
-def find_base_classes_dir():
-    current_dir = Path(__file__).parent.parent
-    # Look for user_base.py in parent directories and sibling directories
-    for _ in range(3):  # search up to 3 levels up
-        for path in current_dir.rglob("user_base.py"):
-            return str(path.parent)
-        current_dir = current_dir.parent
-    return None
-
-base_dir = find_base_classes_dir()
-if base_dir:
-    sys.path.append(base_dir)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.base_classes import ensure_base_classes
+ensure_base_classes('user_base')
 
 from user_base import UserBase
-from storage.json_storage import JsonStorage
+from storage.base import StorageBackend
+from storage.registry import get_storage
 from models.user import User
 from models.team import TeamMember
-from utils.validators import validate_json_string, validate_string_length, validate_required_fields
+from utils.validators import (validate_json_string, validate_json_array, validate_string_length,
+                              validate_required_fields, validate_string_fields, validate_timestamp)
 from utils.exceptions import ValidationError, UniqueConstraintError, NotFoundError
+from utils.pagination import page_params, paginate, stream_json_array
 
 class UserImpl(UserBase):
     """
@@ -30,8 +23,10 @@ class UserImpl(UserBase):
     Had to figure out a lot of edge cases while writing this!
     """
     
-    def __init__(self):
-        self.storage = JsonStorage()
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        # any StorageBackend can be injected (e.g. SqliteStorage); by default all
+        # the implementations share the process-wide engine for db/
+        self.storage = storage if storage is not None else get_storage()
         # might add caching later if performance becomes an issue
         
     def create_user(self, request: str) -> str:
@@ -60,19 +55,78 @@ class UserImpl(UserBase):
         
         return json.dumps({"id": user.id})
     
-    def list_users(self) -> str:
-        """List all users"""
-        users = self.storage.read('users')
-        result = []
-        
-        for user_data in users:
-            result.append({
-                "name": user_data['name'],
-                "display_name": user_data['display_name'],
-                "creation_time": user_data['creation_time']
-            })
+    def create_users(self, request: str) -> str:
+        """
+        Batch version of create_user for bulk imports (e.g. the HR sync)
+        :param request: A json array of {"name", "display_name"} objects
+        :return: A json array with {"id": <user_id>} or {"error": <message>} per item, in order
+
+        Names are checked against each other and against the existing users
+        in one pass, and all the valid users are written in one transaction.
+        users is locked before the names are read, so nobody can take one in
+        between; a clash the storage still reports fails only its item.
+        """
+        items = validate_json_array(request)
+        results = []
+        with self.storage.transaction():
+            self.storage.hold('users')
+            taken = {user['name'] for user in self.storage.scan('users')}
+            for item in items:
+                try:
+                    if not isinstance(item, dict):
+                        raise ValidationError("Each user must be a JSON object")
+                    validate_required_fields(item, ['name', 'display_name'])
+                    validate_string_fields(item, ['name', 'display_name'])
+                    validate_string_length(item['name'], 'name', 64)
+                    validate_string_length(item['display_name'], 'display_name', 64)
+                    if item['name'] in taken:
+                        raise UniqueConstraintError(f"User with name '{item['name']}' already exists")
+                    user = User(name=item['name'], display_name=item['display_name'])
+                    self.storage.create('users', user.to_dict())
+                except ValidationError as e:  # UniqueConstraintError included
+                    results.append({"error": str(e)})
+                    continue
+                taken.add(item['name'])
+                results.append({"id": user.id})
+
+        return json.dumps(results)
+    
+    @staticmethod
+    def _user_summary(user_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": user_data['name'],
+            "display_name": user_data['display_name'],
+            "creation_time": user_data['creation_time']
+        }
+    
+    def list_users(self, request: Optional[str] = None) -> str:
+        """
+        List all users
+        Pass {"limit": n, "cursor": <next_cursor>} to get one page at a time instead,
+        returned as {"items": [...], "next_cursor": <cursor or null>}
+        """
+        if request is None:
+            return json.dumps([self._user_summary(user) for user in self.storage.read('users')])
         
-        return json.dumps(result)
+        data = validate_json_string(request)
+        limit, after_id = page_params(data)
+        return json.dumps(paginate(self.storage.scan('users', after_id), limit, self._user_summary))
+    
+    def list_users_created_since(self, request: str) -> str:
+        """
+        Users created at or after a time, read off the sorted creation_time index
+        :param request: A json string with {"since": <time>} (UTC), e.g. {"since": "2024-01-01T00:00:00"}
+        :return: A json array of {"id", "name", "display_name", "creation_time"}, oldest first
+        """
+        data = validate_json_string(request)
+        validate_required_fields(data, ['since'])
+        since = validate_timestamp(data['since'], 'since')
+        return json.dumps([{"id": user['id'], **self._user_summary(user)}
+                           for user in self.storage.find_range('users', 'creation_time', since)])
+    
+    def stream_users(self) -> Iterator[str]:
+        """list_users() output as a stream of JSON chunks - records are read as they're written out"""
+        return stream_json_array(self._user_summary(user) for user in self.storage.scan('users'))
     
     def describe_user(self, request: str) -> str:
         """Get user details by ID"""
@@ -126,21 +180,17 @@ class UserImpl(UserBase):
         if not user_data:
             raise NotFoundError(f"User with id '{data['id']}' not found")
         
-        # Get team memberships
+        # Get team memberships (team_members.user_id is indexed) and then
+        # only the teams we need, by id - no full scan of teams
         memberships = self.storage.find_by_field('team_members', 'user_id', data['id'])
+        teams = self.storage.find_by_ids('teams', [m['team_id'] for m in memberships])
         
-        # Get team details
         result = []
-        teams = self.storage.read('teams')
-        
-        for membership in memberships:
-            for team in teams:
-                if team['id'] == membership['team_id']:
-                    result.append({
-                        "name": team['name'],
-                        "description": team['description'],
-                        "creation_time": team['creation_time']
-                    })
-                    break
+        for team in teams:
+            result.append({
+                "name": team['name'],
+                "description": team['description'],
+                "creation_time": team['creation_time']
+            })
         
         return json.dumps(result)
\ No newline at end of file
@@ -1,13 +1,13 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Literal
-import uuid
+from utils.ids import new_id
 
 
 @dataclass
 class Board:
     """Board model with validation"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=new_id)
     name: str = ""
     description: str = ""
     team_id: str = ""
@@ -1,12 +1,12 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal
-import uuid
+from utils.ids import new_id
 
 @dataclass
 class Task:
     """Task model with validation"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=new_id)
     title: str = ""
     description: str = ""
     user_id: str = ""  # Assigned user
@@ -0,0 +1,197 @@
+"""
+Column-oriented task store for counting and filtering lots of tasks
+
+One array per field instead of one dict per task: status is a byte, board
+and assignee are small integer codes into a shared list of ids, creation
+time is an int64 of microseconds since the epoch. Counts and filters go over
+the columns with map/zip/compress/Counter, which loop in C, so nothing
+builds a dict per task on the way.
+
+Only the fields used for analytics are kept - titles and descriptions stay
+in storage.
+"""
+import calendar
+import operator
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from typing import Dict, List, Any, Iterable, Optional
+from utils.validators import validate_timestamp
+
+STATUSES = ('OPEN', 'IN_PROGRESS', 'COMPLETE')
+
+
+def epoch_micros(timestamp: Optional[str], field_name: str = 'creation_time') -> int:
+    """
+    A UTC time the APIs accept ('2024-01-31', '2024-01-31T12:00:00.123456', ...)
+    -> microseconds since 1970. Raises ValidationError on anything else
+    """
+    if not timestamp:
+        return 0
+    timestamp = validate_timestamp(timestamp, field_name)  # same parsing as the APIs, in isoformat
+    seconds = calendar.timegm((int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+                               int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19])))
+    fraction = timestamp[20:26] if len(timestamp) > 19 and timestamp[19] == '.' else ''
+    return seconds * 1000000 + (int(fraction.ljust(6, '0')) if fraction else 0)
+
+
+class _Codes:
+    """Assigns each distinct string a small int, in order of first appearance"""
+
+    def __init__(self, initial: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in initial:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+class TaskTable:
+    """
+    Tasks as parallel columns, row i of every column is the same task
+
+    Typical use:
+        table = TaskTable.load(storage)
+        table.status_counts_by_board()
+        table.filter(board_id=..., status='OPEN', created_from='2024-01-01T00:00:00')
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}  # task id -> row
+        self._statuses = _Codes(STATUSES)
+        self._boards = _Codes()
+        self._users = _Codes()
+        self.status = array('B')  # uint8 code into STATUSES (+ anything unexpected after them)
+        self.board = array('I')
+        self.user = array('I')
+        self.created = array('q')  # int64 epoch microseconds
+
+    @classmethod
+    def from_records(cls, tasks: Iterable[Dict[str, Any]]) -> 'TaskTable':
+        table = cls()
+        table.extend(tasks)
+        return table
+
+    @classmethod
+    def load(cls, storage) -> 'TaskTable':
+        """Build the table from a storage backend, streaming the tasks collection"""
+        return cls.from_records(storage.scan('tasks'))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._rows
+
+    # ---- updates ----
+
+    def append(self, task: Dict[str, Any]):
+        """Add a task (a task already in the table is updated in place)"""
+        row = self._rows.get(task['id'])
+        if row is not None:
+            self.status[row] = self._statuses.code(task['status'])
+            self.board[row] = self._boards.code(task['board_id'])
+            self.user[row] = self._users.code(task['user_id'])
+            self.created[row] = epoch_micros(task.get('creation_time'))
+            return
+        self._rows[task['id']] = len(self.ids)
+        self.ids.append(task['id'])
+        self.status.append(self._statuses.code(task['status']))
+        self.board.append(self._boards.code(task['board_id']))
+        self.user.append(self._users.code(task['user_id']))
+        self.created.append(epoch_micros(task.get('creation_time')))
+
+    def extend(self, tasks: Iterable[Dict[str, Any]]):
+        for task in tasks:
+            self.append(task)
+
+    def set_status(self, task_id: str, status: str):
+        self.status[self._rows[task_id]] = self._statuses.code(status)
+
+    def row(self, task_id: str) -> Dict[str, Any]:
+        """The stored fields of one task, decoded"""
+        row = self._rows[task_id]
+        return {"id": task_id, "board_id": self._boards.values[self.board[row]],
+                "user_id": self._users.values[self.user[row]],
+                "status": self._statuses.values[self.status[row]], "created_us": self.created[row]}
+
+    # ---- queries ----
+
+    def _mask(self, board_id: Optional[str] = None, status: Optional[str] = None,
+              user_id: Optional[str] = None, created_from: Optional[str] = None,
+              created_to: Optional[str] = None) -> Optional[Iterable[bool]]:
+        """
+        Lazy row mask for the given conditions (None = no conditions), or
+        False when a value isn't in the table at all so nothing can match
+        """
+        mask = None
+
+        def both(condition):
+            return condition if mask is None else map(operator.and_, mask, condition)
+
+        for column, codes, value in ((self.board, self._boards, board_id),
+                                     (self.status, self._statuses, status),
+                                     (self.user, self._users, user_id)):
+            if value is None:
+                continue
+            code = codes.lookup(value)
+            if code is None:
+                return False
+            mask = both(map(operator.eq, column, repeat(code)))
+        if created_from is not None:
+            mask = both(map(operator.ge, self.created, repeat(epoch_micros(created_from, 'created_from'))))
+        if created_to is not None:
+            mask = both(map(operator.lt, self.created, repeat(epoch_micros(created_to, 'created_to'))))
+        return mask
+
+    def filter(self, board_id: Optional[str] = None, status: Optional[str] = None,
+               user_id: Optional[str] = None, created_from: Optional[str] = None,
+               created_to: Optional[str] = None) -> List[str]:
+        """
+        Ids of the tasks matching all given conditions, in table order
+        created_from is inclusive, created_to exclusive (ISO strings)
+        """
+        mask = self._mask(board_id, status, user_id, created_from, created_to)
+        if mask is False:
+            return []
+        if mask is None:
+            return list(self.ids)
+        return list(compress(self.ids, mask))
+
+    def count(self, **conditions) -> int:
+        """Number of tasks matching the same conditions as filter()"""
+        mask = self._mask(**conditions)
+        if mask is False:
+            return 0
+        if mask is None:
+            return len(self.ids)
+        return sum(mask)
+
+    def status_counts_by_board(self) -> Dict[str, Dict[str, int]]:
+        """{board_id: {status: count}}, every known status listed for every board"""
+        boards = self._boards.values
+        statuses = self._statuses.values
+        result = {board_id: dict.fromkeys(statuses, 0) for board_id in boards}
+        for (board_code, status_code), count in Counter(zip(self.board, self.status)).items():
+            result[boards[board_code]][statuses[status_code]] = count
+        return result
+
+    def counts_by_assignee(self, status: Optional[str] = None,
+                           board_id: Optional[str] = None) -> Dict[str, int]:
+        """{user_id: number of tasks}, optionally only tasks with a status / on a board"""
+        mask = self._mask(board_id=board_id, status=status)
+        if mask is False:
+            return {}
+        codes = self.user if mask is None else compress(self.user, mask)
+        users = self._users.values
+        return {users[code]: count for code, count in Counter(codes).items()}
@@ -1,12 +1,12 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List
-import uuid
+from utils.ids import new_id
 
 @dataclass
 class Team:
     """Team model with validation"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=new_id)
     name: str = ""
     description: str = ""
     admin: str = ""  # User ID
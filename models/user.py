@@ -1,12 +1,12 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
-import uuid
+from utils.ids import new_id
 
 @dataclass
 class User:
     """User model with validation"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=new_id)
     name: str = ""
     display_name: str = ""
     creation_time: str = field(default_factory=lambda: datetime.utcnow().isoformat())
@@ -0,0 +1,104 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Iterator, Iterable
+
+
+class StorageBackend(ABC):
+    """
+    Interface shared by all storage engines
+    The API implementations only talk to this, so any engine can be injected
+    Collections are named by string ('users', 'teams', 'team_members', 'boards', 'tasks')
+    and records are plain dicts
+    Engines can be used as context managers, which close them on exit
+    """
+
+    closed = False
+
+    def close(self):
+        """Release caches, connections and threads held by the engine"""
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @abstractmethod
+    def read(self, filename: str) -> List[Dict[str, Any]]:
+        """Return every record of a collection"""
+
+    def scan(self, filename: str, after_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a collection in its stable order, optionally resuming after
+        the record with id `after_id` - engines that can stream/seek override this
+        """
+        return skip_past(iter(self.read(filename)), after_id)
+
+    @abstractmethod
+    def write(self, filename: str, data: List[Dict[str, Any]]):
+        """Replace a whole collection"""
+
+    @abstractmethod
+    def find_by_id(self, filename: str, id_value: str) -> Optional[Dict[str, Any]]:
+        """Find a record by ID"""
+
+    def find_by_ids(self, filename: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Look up several records by ID - found ones in the order asked, missing ones skipped"""
+        records = (self.find_by_id(filename, id_value) for id_value in ids)
+        return [record for record in records if record is not None]
+
+    @abstractmethod
+    def find_by_field(self, filename: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Find records by field value"""
+
+    def find_range(self, filename: str, field: str, low: Any = None,
+                   high: Any = None) -> List[Dict[str, Any]]:
+        """
+        Records with low <= field < high (either bound optional), ordered by
+        the field; records without the field are left out. This default scans
+        the collection - engines with sorted indexes override it
+        """
+        records = [record for record in self.scan(filename)
+                   if record.get(field) is not None and (low is None or record[field] >= low)
+                   and (high is None or record[field] < high)]
+        records.sort(key=lambda record: record[field])
+        return records
+
+    @abstractmethod
+    def create(self, filename: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new record"""
+
+    @abstractmethod
+    def update(self, filename: str, id_value: str, updates: Dict[str, Any]) -> bool:
+        """Update a record by ID, returns False when it does not exist"""
+
+    @abstractmethod
+    def delete(self, filename: str, id_value: str) -> bool:
+        """Delete a record by ID, returns False when it does not exist"""
+
+    @abstractmethod
+    def transaction(self):
+        """
+        Context manager grouping several mutations into one atomic commit
+        Nothing is written if the block raises; nested blocks join the outer one
+        """
+
+    def hold(self, *filenames: str, shard: Any = None):
+        """
+        Inside a transaction: lock these collections for writing right away,
+        so what the block reads from them next is current and stays current
+        until the commit (read-modify-write of counters, for instance).
+        With `shard`, engines that partition a collection lock only the part
+        holding that shard value, e.g. one board's tasks; the others lock the
+        whole collection. Engines whose transactions already exclude other
+        writers don't need to do anything, which is this default
+        """
+
+
+def skip_past(records: Iterator[Dict[str, Any]], after_id: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """Advance `records` past the one with id `after_id` (nothing is left if it's missing)"""
+    if after_id is not None:
+        for record in records:
+            if record.get('id') == after_id:
+                break
+    return records
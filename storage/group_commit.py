@@ -0,0 +1,92 @@
+import os
+import threading
+from typing import Dict, Any, Callable, List, Optional
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.exceptions import StorageError
+
+
+class CommitTicket:
+    """Handed back to a committer; wait() returns once its changes are durable"""
+
+    def __init__(self, items: Dict[str, Any], on_done: Optional[Callable[[], None]] = None):
+        self.items = items
+        self.on_done = on_done
+        self.error: Optional[Exception] = None
+        self._event = threading.Event()
+
+    def _finish(self, error: Optional[Exception]):
+        self.error = error
+        try:
+            if self.on_done is not None:
+                self.on_done()
+        finally:
+            self._event.set()
+
+    def wait(self):
+        self._event.wait()
+        if self.error is not None:
+            raise StorageError(f"Group commit failed: {str(self.error)}")
+
+
+class GroupCommitWriter:
+    """
+    Background writer that coalesces commits arriving within `window` seconds
+
+    Each submit() carries {collection name: full collection state}. When the
+    writer wakes up it keeps only the newest state per collection, hands that
+    batch to `flush` once (one write + fsync per collection however many
+    commits touched it) and then acknowledges every ticket in the batch.
+    """
+
+    def __init__(self, flush: Callable[[Dict[str, Any]], None], window: float = 0.005):
+        self.flush = flush
+        self.window = window
+        self._queue: List[CommitTicket] = []
+        self._cond = threading.Condition()
+        self._stopping = False
+        self.batches = 0  # how many flushes we did, handy for checking coalescing
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: Dict[str, Any], on_done: Optional[Callable[[], None]] = None) -> CommitTicket:
+        ticket = CommitTicket(items, on_done)
+        with self._cond:
+            if self._stopping:
+                raise StorageError("Storage is closed")
+            self._queue.append(ticket)
+            self._cond.notify()
+        return ticket
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return  # stopping and drained
+                stopping = self._stopping
+            if not stopping:
+                # let more commits pile up behind the first one
+                threading.Event().wait(self.window)
+            with self._cond:
+                tickets, self._queue = self._queue, []
+
+            batch: Dict[str, Any] = {}
+            for ticket in tickets:
+                batch.update(ticket.items)  # later commits carry newer state
+            error = None
+            try:
+                self.flush(batch)
+            except Exception as e:
+                error = e
+            self.batches += 1
+            for ticket in tickets:
+                ticket._finish(error)
+
+    def close(self):
+        """Flush whatever is queued and stop the thread"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join()
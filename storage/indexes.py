@@ -0,0 +1,344 @@
+import bisect
+from itertools import islice
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Union
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.exceptions import UniqueConstraintError
+
+
+class IndexSpec:
+    """
+    Declares a secondary index on one field of a collection - a hash index,
+    or with sorted=True an ordered one for range queries
+    """
+
+    def __init__(self, field: str, unique: bool = False, sorted: bool = False):
+        self.field = field
+        self.unique = unique
+        self.sorted = sorted
+
+    def __repr__(self):
+        return f"IndexSpec({self.field!r}, unique={self.unique}, sorted={self.sorted})"
+
+
+# The fields the implementations filter on. Name uniqueness for users and teams
+# is enforced by the index itself, board and task names are only unique per
+# parent so they stay plain lookups.
+DEFAULT_INDEXES: Dict[str, List[IndexSpec]] = {
+    'users': [IndexSpec('name', unique=True), IndexSpec('creation_time', sorted=True)],
+    'teams': [IndexSpec('name', unique=True), IndexSpec('creation_time', sorted=True)],
+    'team_members': [IndexSpec('team_id'), IndexSpec('user_id')],
+    'boards': [IndexSpec('team_id'), IndexSpec('creation_time', sorted=True),
+               IndexSpec('end_time', sorted=True)],
+    'tasks': [IndexSpec('board_id'), IndexSpec('creation_time', sorted=True)],
+}
+
+
+def sorted_fields(filename: str) -> List[str]:
+    """Fields of a collection with a sorted index by default (shards count as their parent)"""
+    return [spec.field for spec in DEFAULT_INDEXES.get(filename.split('/', 1)[0], ()) if spec.sorted]
+
+
+def in_range(value: Any, low: Any = None, high: Any = None) -> bool:
+    """low <= value < high, either bound optional; missing values are never in range"""
+    return value is not None and (low is None or value >= low) and (high is None or value < high)
+
+
+def ranked_position(items: List[Any], target: int, rank, lo: int = 0, hi: Optional[int] = None) -> int:
+    """Where an item of rank `target` goes in items[lo:hi], which is in `rank(item)` order"""
+    hi = len(items) if hi is None else hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if rank(items[mid]) < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class SortedIndex:
+    """
+    Values kept sorted next to the items (records or ids) they belong to, so a
+    range is two bisects plus a slice: O(log n + k). Inserts use bisect too;
+    for creation times they land at the end, which is the cheap case.
+    None values are not indexed.
+    """
+
+    def __init__(self, pairs: Iterable = ()):
+        pairs = sorted((pair for pair in pairs if pair[0] is not None), key=lambda pair: pair[0])
+        self.keys: List[Any] = [value for value, _ in pairs]
+        self.items: List[Any] = [item for _, item in pairs]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def copy(self) -> 'SortedIndex':
+        clone = SortedIndex()
+        clone.keys, clone.items = list(self.keys), list(self.items)
+        return clone
+
+    def add(self, value: Any, item: Any):
+        if value is None:
+            return
+        position = bisect.bisect_right(self.keys, value)
+        self.keys.insert(position, value)
+        self.items.insert(position, item)
+
+    def add_ranked(self, value: Any, item: Any, rank):
+        """Add among equal values in `rank(item)` order rather than after them all"""
+        if value is None:
+            return
+        lo = bisect.bisect_left(self.keys, value)
+        hi = bisect.bisect_right(self.keys, value, lo)
+        position = ranked_position(self.items, rank(item), rank, lo, hi)
+        self.keys.insert(position, value)
+        self.items.insert(position, item)
+
+    def replace(self, value: Any, old: Any, new: Any):
+        """Put `new` where `old` sits (same value, so the order holds)"""
+        if value is None:
+            return
+        start = bisect.bisect_left(self.keys, value)
+        end = bisect.bisect_right(self.keys, value, start)
+        for position in range(start, end):
+            if self.items[position] is old:
+                self.items[position] = new
+                return
+
+    def remove(self, value: Any, item: Any):
+        if value is None:
+            return
+        start = bisect.bisect_left(self.keys, value)
+        end = bisect.bisect_right(self.keys, value, start)
+        for position in range(start, end):
+            candidate = self.items[position]
+            if candidate is item or candidate == item:
+                del self.keys[position]
+                del self.items[position]
+                return
+
+    def range(self, low: Any = None, high: Any = None) -> List[Any]:
+        """Items with low <= value < high (either bound optional), in value order"""
+        start = 0 if low is None else bisect.bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect.bisect_left(self.keys, high, start)
+        return self.items[start:end]
+
+
+class IndexedCollection:
+    """
+    In-memory records of one collection with a primary id -> record map and
+    dict-of-lists secondary indexes (field value -> records), plus SortedIndex
+    ones for the sorted specs
+
+    Indexes are built the first time they are used and then maintained
+    incrementally by add/update/remove, so a collection that is only ever read
+    in full never pays for them. Records are never mutated in place - update
+    swaps in a new dict - so callers may hold on to the ones they get back.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = (), specs: Iterable[IndexSpec] = ()):
+        # insertion ordered; keyed by id, or by a counter for id-less rows (team_members)
+        self._records: Dict[Union[str, int], Dict[str, Any]] = {}
+        self._next_key = 0
+        # key -> insertion rank, so an updated record goes back to its place in the index buckets
+        self._ranks: Dict[Union[str, int], int] = {}
+        self._next_rank = 0
+        self.specs = {spec.field: spec for spec in specs}
+        self._indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        self._sorted: Dict[str, SortedIndex] = {}
+        # key order and key -> position, built on the first iter_after() so cursors seek in O(1)
+        self._order: Optional[List[Union[str, int]]] = None
+        self._positions: Dict[Union[str, int], int] = {}
+        for record in records:
+            self._insert(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._records.values())
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self._records.values())
+
+    def copy(self) -> 'IndexedCollection':
+        """Independent copy (records themselves are shared, they are never mutated)"""
+        clone = IndexedCollection(specs=self.specs.values())
+        clone._records = dict(self._records)
+        clone._next_key = self._next_key
+        clone._ranks, clone._next_rank = dict(self._ranks), self._next_rank
+        clone._indexes = {field: {value: list(bucket) for value, bucket in index.items()}
+                          for field, index in self._indexes.items()}
+        clone._sorted = {field: index.copy() for field, index in self._sorted.items()}
+        return clone
+
+    # ---- internals ----
+
+    def _insert(self, record: Dict[str, Any]):
+        key = record.get('id')
+        if key is None:
+            key = self._next_key
+            self._next_key += 1
+        if self._order is not None and key not in self._records:
+            self._positions[key] = len(self._order)
+            self._order.append(key)
+        if key not in self._ranks:
+            self._ranks[key] = self._next_rank
+            self._next_rank += 1
+        self._records[key] = record
+
+    def _index(self, field: str) -> Dict[Any, List[Dict[str, Any]]]:
+        """Get (building it on first use) the index for a field"""
+        index = self._indexes.get(field)
+        if index is None:
+            index = {}
+            for record in self._records.values():
+                index.setdefault(record.get(field), []).append(record)
+            self._indexes[field] = index
+        return index
+
+    def _sorted_index(self, field: str) -> SortedIndex:
+        index = self._sorted.get(field)
+        if index is None:
+            index = self._sorted[field] = SortedIndex(
+                (record.get(field), record) for record in self._records.values())
+        return index
+
+    def _index_add(self, record: Dict[str, Any]):
+        for field, index in self._indexes.items():
+            index.setdefault(record.get(field), []).append(record)
+        for field, index in self._sorted.items():
+            index.add(record.get(field), record)
+
+    def _rank(self, record: Dict[str, Any]) -> int:
+        return self._ranks[record.get('id')]
+
+    def _index_replace(self, old: Dict[str, Any], new: Dict[str, Any]):
+        """
+        Swap an updated record into the indexes keeping insertion order in
+        every bucket - in place where the value is unchanged, otherwise at its
+        rank - so the order doesn't depend on whether the collection was
+        loaded fresh or updated in memory
+        """
+        for field, index in self._indexes.items():
+            value, new_value = old.get(field), new.get(field)
+            bucket = index.get(value, [])
+            position = next((i for i, candidate in enumerate(bucket) if candidate is old), None)
+            if value == new_value and position is not None:
+                bucket[position] = new
+                continue
+            if position is not None:
+                del bucket[position]
+            if not bucket:
+                index.pop(value, None)
+            bucket = index.setdefault(new_value, [])
+            bucket.insert(ranked_position(bucket, self._rank(new), self._rank), new)
+        for field, index in self._sorted.items():
+            value, new_value = old.get(field), new.get(field)
+            if value == new_value:
+                index.replace(value, old, new)
+            else:
+                index.remove(value, old)
+                index.add_ranked(new_value, new, self._rank)
+
+    def _index_remove(self, record: Dict[str, Any]):
+        for field, index in self._indexes.items():
+            value = record.get(field)
+            bucket = index.get(value, [])
+            # identity, not equality - two rows can hold the same values
+            for i, candidate in enumerate(bucket):
+                if candidate is record:
+                    del bucket[i]
+                    break
+            if not bucket:
+                index.pop(value, None)
+        for field, index in self._sorted.items():
+            index.remove(record.get(field), record)
+
+    # ---- lookups ----
+
+    def get(self, id_value: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Primary key lookup"""
+        if id_value is None:
+            return None
+        return self._records.get(id_value)
+
+    def iter_after(self, id_value: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Records in insertion order, starting right after the one with id
+        `id_value` (nothing if it's missing). The start is found by a dict
+        lookup and nothing is copied; records added meanwhile are picked up,
+        removed ones skipped
+        """
+        if self._order is None:
+            self._order = list(self._records)
+            self._positions = {key: position for position, key in enumerate(self._order)}
+        start = 0
+        if id_value is not None:
+            position = self._positions.get(id_value)
+            if position is None:
+                return
+            start = position + 1
+        for key in islice(self._order, start, None):
+            record = self._records.get(key)
+            if record is not None:
+                yield record
+
+    def find(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Records whose field equals value - O(1) for indexed fields"""
+        if field == 'id':
+            record = self.get(value)
+            return [record] if record is not None else []
+        if field in self.specs:
+            return list(self._index(field).get(value, []))
+        return [record for record in self._records.values() if record.get(field) == value]
+
+    def find_range(self, field: str, low: Any = None, high: Any = None) -> List[Dict[str, Any]]:
+        """Records with low <= field < high, ordered by the field - O(log n + k) for sorted fields"""
+        spec = self.specs.get(field)
+        if spec is not None and spec.sorted:
+            return self._sorted_index(field).range(low, high)
+        return sorted((record for record in self._records.values() if in_range(record.get(field), low, high)),
+                      key=lambda record: record[field])
+
+    def check_unique(self, record: Dict[str, Any], current: Optional[Dict[str, Any]] = None):
+        """Raise UniqueConstraintError if record clashes on a unique index"""
+        for field, spec in self.specs.items():
+            if not spec.unique or field not in record:
+                continue
+            clashes = [r for r in self._index(field).get(record[field], []) if r is not current]
+            if clashes:
+                raise UniqueConstraintError(f"Record with {field} '{record[field]}' already exists")
+
+    # ---- mutations ----
+
+    def add(self, record: Dict[str, Any], check: bool = True) -> Dict[str, Any]:
+        """Add a record (check=False skips unique checks, e.g. when replaying a log)"""
+        if check:
+            self.check_unique(record)
+        self._insert(record)
+        self._index_add(record)
+        return record
+
+    def update(self, id_value: str, changes: Dict[str, Any], check: bool = True) -> Optional[Dict[str, Any]]:
+        """Swap in an updated copy of a record, returns it (None if missing)"""
+        old = self.get(id_value)
+        if old is None:
+            return None
+        if check:
+            self.check_unique(changes, current=old)
+        new = {**old, **changes}
+        self._records[id_value] = new
+        self._index_replace(old, new)
+        return new
+
+    def remove(self, id_value: str) -> bool:
+        old = self.get(id_value)
+        if old is None:
+            return False
+        del self._records[id_value]
+        del self._ranks[id_value]
+        self._order = None  # positions shift, rebuilt on the next iter_after()
+        self._index_remove(old)
+        return True
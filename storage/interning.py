@@ -0,0 +1,52 @@
+"""
+Interning of the id fields records point at each other with
+
+A freshly decoded tasks collection holds its own copy of every board and user
+id string - the same few thousand 36 character ids repeated for every task and
+membership. The engines run the records they load through intern_records, so
+each distinct id is one shared str object (sys.intern), whichever collection
+or engine it came from. Callers still just see strings.
+
+A nice side effect: two interned strings are the same object, so the
+comparisons and dict lookups joins do on them stop at the identity check.
+"""
+import sys
+from typing import Dict, List, Any, Iterable, Tuple
+
+# collection -> fields holding ids of other records (plus the collections' own
+# ids where other records refer to them)
+REFERENCE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'users': ('id',),
+    'teams': ('id', 'admin'),
+    'team_members': ('team_id', 'user_id'),
+    'boards': ('id', 'team_id'),
+    'tasks': ('user_id', 'board_id'),
+    'board_stats': ('id',),
+}
+
+_intern = sys.intern
+
+
+def reference_fields(filename: str) -> Tuple[str, ...]:
+    """Fields to intern for a collection (shards like 'tasks/<board_id>' count as their parent)"""
+    return REFERENCE_FIELDS.get(filename.split('/', 1)[0], ())
+
+
+def intern_record(record: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Intern the given fields of one record in place"""
+    for field in fields:
+        value = record.get(field)
+        if type(value) is str:
+            record[field] = _intern(value)
+    return record
+
+
+def intern_records(filename: str, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Intern the reference fields of freshly loaded records in place, returns them as a list"""
+    records = records if isinstance(records, list) else list(records)
+    fields = reference_fields(filename)
+    if fields:
+        for record in records:
+            if type(record) is dict:
+                intern_record(record, fields)
+    return records
@@ -0,0 +1,313 @@
+import json
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterable
+from pathlib import Path
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.base import StorageBackend
+from storage.indexes import IndexedCollection, IndexSpec, DEFAULT_INDEXES
+from storage.interning import intern_records
+from utils.exceptions import StorageError
+
+
+class _JournalState:
+    """In-memory image of one collection plus where we are in its files"""
+
+    def __init__(self, specs: Iterable[IndexSpec] = ()):
+        # keyed by record id with secondary indexes, so update/delete/lookups are O(1)
+        self.records = IndexedCollection(specs=specs)
+        self.seq = 0  # highest journal sequence number seen
+        self.snapshot_seq = 0  # entries up to here are already in the snapshot
+        self.snapshot_stamp = None
+        self.journal_offset = 0
+        self.pending = 0  # journal entries since the last snapshot
+
+
+class JournalStorage(StorageBackend):
+    """
+    Append-only storage engine with the same interface as JsonStorage
+
+    Every mutation is appended as one JSON line to <name>.journal.jsonl instead of
+    rewriting the whole collection, so writes cost O(record). The full state is
+    rebuilt on open from <name>.snapshot.json plus the journal, and the journal is
+    folded back into a fresh snapshot every `compact_every` entries.
+
+    Other processes' appends are picked up by tailing the journal from the last
+    offset we read. Compaction assumes a single writing process per db folder.
+    Mutations are applied in memory first and their journal lines buffered until
+    the (possibly implicit) transaction commits, then written with one append.
+    """
+
+    def __init__(self, db_path: str = "db", compact_every: int = 1000,
+                 indexes: Optional[Dict[str, List[IndexSpec]]] = None):
+        self.db_path = Path(db_path)
+        self.db_path.mkdir(exist_ok=True)
+        self.compact_every = compact_every
+        self.indexes = DEFAULT_INDEXES if indexes is None else indexes
+        self._states: Dict[str, _JournalState] = {}
+        # tags our own journal lines so tailing doesn't apply them a second time
+        self._writer_id = uuid.uuid4().hex
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def _snapshot_path(self, filename: str) -> Path:
+        return self.db_path / f"{filename}.snapshot.json"
+
+    def _journal_path(self, filename: str) -> Path:
+        return self.db_path / f"{filename}.journal.jsonl"
+
+    def _legacy_path(self, filename: str) -> Path:
+        """Plain JsonStorage file, used to seed a collection the first time"""
+        return self.db_path / f"{filename}.json"
+
+    @staticmethod
+    def _file_stamp(path: Path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def close(self):
+        """Drop the in-memory state (everything is already on disk)"""
+        with self._lock:
+            self._states.clear()
+        super().close()
+
+    # ---- loading / replay ----
+
+    def _apply(self, state: _JournalState, entry: Dict[str, Any]):
+        """Apply a single journal entry to the in-memory state"""
+        op = entry['op']
+        # no unique checks here - the writer already made them before appending
+        if op == 'insert':
+            state.records.add(entry['record'], check=False)
+        elif op == 'update':
+            state.records.update(entry['id'], entry['changes'], check=False)
+        elif op == 'delete':
+            state.records.remove(entry['id'])
+        elif op == 'replace':
+            state.records = IndexedCollection(entry['records'], state.records.specs.values())
+        else:
+            raise StorageError(f"Unknown journal operation: {op}")
+
+    def _load(self, filename: str) -> _JournalState:
+        """Rebuild a collection from its snapshot and journal"""
+        state = _JournalState(self.indexes.get(filename, ()))
+        snapshot_path = self._snapshot_path(filename)
+        try:
+            if snapshot_path.exists():
+                state.snapshot_stamp = self._file_stamp(snapshot_path)
+                with open(snapshot_path, 'r') as f:
+                    snapshot = json.load(f)
+                state.seq = state.snapshot_seq = snapshot.get('seq', 0)
+                records = snapshot.get('records', [])
+            elif self._legacy_path(filename).exists():
+                # first open of a db written by JsonStorage
+                with open(self._legacy_path(filename), 'r') as f:
+                    records = json.load(f)
+            else:
+                records = []
+        except Exception as e:
+            raise StorageError(f"Failed to read {filename}: {str(e)}")
+
+        for record in intern_records(filename, records):
+            state.records.add(record, check=False)
+        self._tail(filename, state)
+        return state
+
+    def _tail(self, filename: str, state: _JournalState, skip_own: bool = False):
+        """
+        Replay journal entries appended since we last looked
+        skip_own leaves out lines this engine wrote, they are already in memory
+        """
+        journal_path = self._journal_path(filename)
+        if not journal_path.exists():
+            return
+        try:
+            with open(journal_path, 'rb') as f:
+                f.seek(state.journal_offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # half-written entry from a crashed or in-flight writer
+                    state.journal_offset += len(line)
+                    entry = json.loads(line)
+                    if entry['seq'] <= state.snapshot_seq:
+                        continue  # already folded into the snapshot
+                    if skip_own and entry.get('w') == self._writer_id:
+                        continue
+                    if entry['op'] == 'insert':
+                        intern_records(filename, [entry['record']])
+                    elif entry['op'] == 'update':
+                        intern_records(filename, [entry['changes']])
+                    elif entry['op'] == 'replace':
+                        intern_records(filename, entry['records'])
+                    self._apply(state, entry)
+                    state.seq = max(state.seq, entry['seq'])
+                    state.pending += 1
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"Failed to replay journal for {filename}: {str(e)}")
+
+    def _state(self, filename: str) -> _JournalState:
+        """Get an up to date state for a collection (two stats when nothing changed)"""
+        state = self._states.get(filename)
+        if state is not None:
+            snapshot_changed = self._file_stamp(self._snapshot_path(filename)) != state.snapshot_stamp
+            journal_stamp = self._file_stamp(self._journal_path(filename))
+            journal_size = journal_stamp[1] if journal_stamp else 0
+            if snapshot_changed or journal_size < state.journal_offset:
+                state = None  # someone compacted underneath us - start over
+            elif journal_size > state.journal_offset:
+                self._tail(filename, state, skip_own=True)
+        if state is None:
+            state = self._load(filename)
+            self._states[filename] = state
+        return state
+
+    # ---- writing ----
+
+    def _pending(self) -> Optional[Dict[str, List[bytes]]]:
+        """Journal lines buffered by the current thread's transaction"""
+        return getattr(self._local, 'pending', None)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group mutations into one commit - every touched journal gets a single append
+        On error the touched collections are rebuilt from disk, dropping the changes
+        """
+        with self._lock:
+            if self._pending() is not None:
+                yield
+                return
+            self._local.pending = {}
+            try:
+                yield
+            except BaseException:
+                for filename in self._local.pending:
+                    self._states.pop(filename, None)
+                raise
+            finally:
+                pending, self._local.pending = self._local.pending, None
+            for filename, lines in pending.items():
+                self._flush(filename, lines)
+
+    def _stage(self, filename: str, state: _JournalState, entry: Dict[str, Any]):
+        """Apply an entry in memory and buffer its journal line"""
+        self._apply(state, entry)
+        state.seq += 1
+        entry['seq'] = state.seq
+        entry['w'] = self._writer_id
+        line = (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+        self._pending().setdefault(filename, []).append(line)
+
+    def _flush(self, filename: str, lines: List[bytes]):
+        """Append buffered lines with a single write"""
+        try:
+            # O_APPEND keeps the single write() atomic w.r.t. other appenders
+            fd = os.open(self._journal_path(filename), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b''.join(lines))
+            finally:
+                os.close(fd)
+        except Exception as e:
+            self._states.pop(filename, None)
+            raise StorageError(f"Failed to write {filename}: {str(e)}")
+        state = self._state(filename)  # tails past our own lines
+        state.pending += len(lines)
+        if state.pending >= self.compact_every:
+            self.compact(filename)
+
+    def compact(self, filename: str):
+        """Fold the journal into a new snapshot and start an empty journal"""
+        with self._lock:
+            state = self._state(filename)
+            snapshot = {"seq": state.seq, "records": state.records.to_list()}
+            snapshot_path = self._snapshot_path(filename)
+            try:
+                with tempfile.NamedTemporaryFile(mode='w', dir=self.db_path,
+                                                 delete=False, suffix='.tmp') as tmp_file:
+                    json.dump(snapshot, tmp_file, separators=(',', ':'))
+                    tmp_path = tmp_file.name
+                if os.name == 'nt' and snapshot_path.exists():
+                    os.remove(snapshot_path)
+                os.rename(tmp_path, snapshot_path)
+                # A crash before this truncate is harmless - replay skips seq <= snapshot seq
+                open(self._journal_path(filename), 'w').close()
+            except Exception as e:
+                if 'tmp_path' in locals() and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise StorageError(f"Failed to compact {filename}: {str(e)}")
+            state.snapshot_stamp = self._file_stamp(snapshot_path)
+            state.snapshot_seq = state.seq
+            state.journal_offset = 0
+            state.pending = 0
+
+    # ---- JsonStorage compatible interface ----
+
+    def read(self, filename: str) -> List[Dict[str, Any]]:
+        """Read all records (records are shared, treat them as read-only)"""
+        with self._lock:
+            return self._state(filename).records.to_list()
+
+    def write(self, filename: str, data: List[Dict[str, Any]]):
+        """Replace a whole collection (one 'replace' entry, folded in at the next compaction)"""
+        with self.transaction():
+            self._stage(filename, self._state(filename), {"op": "replace", "records": list(data)})
+
+    def find_by_id(self, filename: str, id_value: str) -> Optional[Dict[str, Any]]:
+        """Find a record by ID"""
+        with self._lock:
+            return self._state(filename).records.get(id_value)
+
+    def find_by_ids(self, filename: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Look up several records by ID"""
+        with self._lock:
+            records = self._state(filename).records
+            found = (records.get(id_value) for id_value in ids)
+            return [record for record in found if record is not None]
+
+    def find_by_field(self, filename: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Find records by field value"""
+        with self._lock:
+            return self._state(filename).records.find(field, value)
+
+    def find_range(self, filename: str, field: str, low: Any = None,
+                   high: Any = None) -> List[Dict[str, Any]]:
+        """Records with low <= field < high in field order (sorted index slice)"""
+        with self._lock:
+            return self._state(filename).records.find_range(field, low, high)
+
+    def create(self, filename: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new record (raises UniqueConstraintError on a unique index clash)"""
+        with self.transaction():
+            state = self._state(filename)
+            state.records.check_unique(record)
+            self._stage(filename, state, {"op": "insert", "record": record})
+        return record
+
+    def update(self, filename: str, id_value: str, updates: Dict[str, Any]) -> bool:
+        """Update a record by ID"""
+        with self.transaction():
+            state = self._state(filename)
+            current = state.records.get(id_value)
+            if current is None:
+                return False
+            state.records.check_unique(updates, current=current)
+            self._stage(filename, state, {"op": "update", "id": id_value, "changes": updates})
+        return True
+
+    def delete(self, filename: str, id_value: str) -> bool:
+        """Delete a record by ID"""
+        with self.transaction():
+            state = self._state(filename)
+            if state.records.get(id_value) is None:
+                return False
+            self._stage(filename, state, {"op": "delete", "id": id_value})
+        return True
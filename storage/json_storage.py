@@ -1,126 +1,547 @@
+import heapq
 import json
 import os
 import tempfile
-from typing import Dict, List, Any, Optional
+import threading
+from contextlib import contextmanager
+from itertools import chain
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from pathlib import Path
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.base import StorageBackend
+from storage.indexes import IndexedCollection, IndexSpec, DEFAULT_INDEXES
+from storage.interning import intern_records
+from storage.locking import FileLockManager
+from storage.shard_locator import ShardLocator
+from storage.group_commit import GroupCommitWriter
 from utils.exceptions import StorageError
 
-# Platform-specific imports
-if os.name != 'nt':  # Unix/Linux
-    import fcntl
+DURABILITY_MODES = ('none', 'fsync-per-commit', 'group-commit')
 
-class JsonStorage:
+# Collections sharded whatever the caller asks for: one file of counters per
+# board, so updating a board's counters doesn't lock or rewrite everyone's
+DEFAULT_SHARDS = {'board_stats': 'id'}
+
+
+class JsonStorage(StorageBackend):
     """
     Handle JSON file storage operations with atomic writes and file locking
     This was honestly the hardest part - making sure data doesn't get corrupted
     """
     
-    def __init__(self, db_path: str = "db"):
+    def __init__(self, db_path: str = "db", cache: bool = False,
+                 indexes: Optional[Dict[str, List[IndexSpec]]] = None,
+                 shards: Optional[Dict[str, str]] = None, lock_timeout: float = 10.0,
+                 durability: str = 'none', group_commit_window: float = 0.005):
         self.db_path = Path(db_path)
         self.db_path.mkdir(exist_ok=True)  # create db folder if it doesn't exist
+        # Optional write-through cache of decoded collections, keyed by filename.
+        # Each entry remembers the (mtime_ns, size, inode) of the file it came from
+        # so writes from other processes are picked up on the next read.
+        self.cache_enabled = cache
+        self._cache: Dict[str, Tuple[Tuple[int, int, int], IndexedCollection]] = {}
+        # Secondary indexes per collection, see storage/indexes.py
+        self.indexes = DEFAULT_INDEXES if indexes is None else indexes
+        # Sharded collections: name -> field to partition on, e.g. {'tasks': 'board_id'}
+        # stores every board's tasks in db/tasks/<board_id>.json (see _shard_name)
+        self.shards = {**DEFAULT_SHARDS, **(shards or {})}
+        self._migrated = set()
+        self._locators: Dict[str, ShardLocator] = {}
+        # Transactions: one writer at a time per process, staged state is per thread
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        # Shared locks for reads, exclusive ones held across a whole read-modify-write
+        self._locks = FileLockManager(self.db_path, timeout=lock_timeout)
+        # Durability: 'none' (rename only), 'fsync-per-commit' (fsync file + folder on
+        # every commit) or 'group-commit' (a background writer fsyncs commits that
+        # arrive within group_commit_window seconds of each other together)
+        if durability not in DURABILITY_MODES:
+            raise StorageError(f"Invalid durability mode. Must be one of: {', '.join(DURABILITY_MODES)}")
+        self.durability = durability
+        self._unflushed: Dict[str, IndexedCollection] = {}  # committed, waiting for group commit
+        self._unflushed_lock = threading.Lock()
+        self._group_writer = None
+        if durability == 'group-commit':
+            self._group_writer = GroupCommitWriter(self._flush_group, window=group_commit_window)
         
     def _get_file_path(self, filename: str) -> Path:
         """Get full path for a database file"""
         return self.db_path / f"{filename}.json"
     
-    def _acquire_lock(self, file_handle):
-        """Acquire exclusive lock on file (Windows/Unix compatible)"""
-        if os.name == 'nt':  # Windows
-            import msvcrt
-            msvcrt.locking(file_handle.fileno(), msvcrt.LK_NBLCK, 1)
-        else:  # Unix/Linux
-            fcntl.flock(file_handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-    
-    def _release_lock(self, file_handle):
-        """Release file lock"""
-        if os.name == 'nt':  # Windows
-            import msvcrt
-            msvcrt.locking(file_handle.fileno(), msvcrt.LK_UNLCK, 1)
-        else:  # Unix/Linux
-            fcntl.flock(file_handle.fileno(), fcntl.LOCK_UN)
+    def _specs(self, filename: str) -> List[IndexSpec]:
+        """Index specs for a collection - shards use their parent's ('tasks/<id>' -> 'tasks')"""
+        return self.indexes.get(filename.split('/')[0], [])
     
-    def read(self, filename: str) -> List[Dict[str, Any]]:
-        """Read data from JSON file"""
+    @staticmethod
+    def _stamp(st: os.stat_result) -> Tuple[int, int, int]:
+        """Cheap file version used to validate cache entries"""
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def invalidate(self, filename: Optional[str] = None):
+        """Drop cached data for one collection (or all of them)"""
+        if filename is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(filename, None)
+    
+    def close(self):
+        """Flush pending group commits, then drop the in-memory cache"""
+        if self._group_writer is not None:
+            self._group_writer.close()
+        self.invalidate()
+        super().close()
+    
+    def lock_stats(self) -> Dict[str, Any]:
+        """How often and how long we waited for file locks"""
+        return self._locks.stats()
+    
+    def _txn(self) -> Optional[Dict[str, Any]]:
+        """State of the current thread's transaction, None outside one"""
+        return getattr(self._local, 'txn', None)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group mutations across collections into one commit
+        
+            with storage.transaction():
+                storage.create('teams', team)
+                storage.create('team_members', member)
+        
+        Changes are staged on private copies of the touched collections and each
+        of them is written once when the block exits. If the block raises, the
+        staged copies are thrown away and nothing is written. Collections read
+        inside the block are loaded once and reused. Nested blocks join the
+        outermost one.
+        
+        Every collection the block changes is exclusively locked from the moment
+        it is first touched until it has been written, so concurrent processes
+        can't lose each other's updates. Locks are taken in the order the block
+        touches collections; a cross-process deadlock ends in a lock timeout.
+        
+        In group-commit mode the block returns once a background flush has made
+        the changes durable. The next transaction in this process may already
+        build on them while we wait; the file locks stay held until the flush,
+        so other processes never see or overwrite the older file.
+        """
+        if self._txn() is not None:
+            yield
+            return
+        ticket = None
+        with self._write_lock:
+            txn = self._local.txn = {'loaded': {}, 'staged': {}, 'locks': [], 'locators': {}}
+            try:
+                try:
+                    yield
+                finally:
+                    self._local.txn = None
+                ticket = self._commit(txn)
+            finally:
+                if ticket is None:
+                    self._release_locks(txn['locks'])
+        if ticket is not None:
+            ticket.wait()
+    
+    def _release_locks(self, names: List[str]):
+        for filename in reversed(names):
+            self._locks.release(filename)
+    
+    def _commit(self, txn: Dict[str, Any]):
+        """Write the staged collections, or queue them for the group writer"""
+        if not txn['staged']:
+            return None
+        if self._group_writer is None:
+            # Each file is replaced atomically; a crash between two files can
+            # still leave the earlier ones committed
+            for filename, collection in txn['staged'].items():
+                self._persist(filename, collection, sync=self.durability == 'fsync-per-commit')
+            self._commit_locators(txn)
+            return None
+        with self._unflushed_lock:
+            self._unflushed.update(txn['staged'])
+        # the writer thread releases our file locks once the data is on disk
+        ticket = self._group_writer.submit(dict(txn['staged']),
+                                           on_done=lambda: self._release_locks(txn['locks']))
+        self._commit_locators(txn)
+        return ticket
+    
+    def _commit_locators(self, txn: Dict[str, Any]):
+        """Record where the transaction's new and moved records live (the shards are still locked)"""
+        for filename, pending in txn['locators'].items():
+            if pending['replace']:
+                self._locator(filename).rewrite(pending['changes'])
+            else:
+                self._locator(filename).append(pending['changes'])
+    
+    def _flush_group(self, batch: Dict[str, IndexedCollection]):
+        """Group writer callback: one write + fsync per collection in the batch"""
+        try:
+            for filename, collection in batch.items():
+                self._persist(filename, collection, sync=True, sync_dir=False)
+            for folder in {self._get_file_path(filename).parent for filename in batch}:
+                self._fsync_dir(folder)
+        except Exception:
+            with self._unflushed_lock:
+                for filename in batch:
+                    self._unflushed.pop(filename, None)
+            raise
+        with self._unflushed_lock:
+            for filename, collection in batch.items():
+                if self._unflushed.get(filename) is collection:
+                    del self._unflushed[filename]
+    
+    def _hold(self, filename: str):
+        """Take the exclusive lock on a collection for the rest of the transaction"""
+        txn = self._txn()
+        if filename not in txn['locks']:
+            self._locks.acquire(filename, 'exclusive')
+            txn['locks'].append(filename)
+            # anything read before we held the lock may already be stale
+            txn['loaded'].pop(filename, None)
+    
+    def hold(self, *filenames: str, shard: Any = None):
+        """Lock collections for the rest of the transaction (see StorageBackend.hold)"""
+        if self._txn() is None:
+            return
+        for filename in filenames:
+            if filename not in self.shards:
+                self._hold(filename)
+            elif shard is not None:
+                self._migrate_flat(filename)
+                self._hold(self._shard_name(filename, shard))
+            # otherwise a sharded collection is locked shard by shard as they get touched
+    
+    def _working(self, filename: str) -> IndexedCollection:
+        """Private copy of a collection that the current transaction may change"""
+        txn = self._txn()
+        staged = txn['staged'].get(filename)
+        if staged is None:
+            self._hold(filename)
+            staged = self._load_committed(filename).copy()
+            txn['staged'][filename] = staged
+        return staged
+    
+    def _load(self, filename: str) -> IndexedCollection:
+        """
+        Load a collection (from the cache when it is still valid)
+        The returned object may be shared with the cache or a transaction, so
+        never mutate it - changes go through _working()
+        """
+        txn = self._txn()
+        if txn is not None:
+            collection = txn['staged'].get(filename)
+            if collection is None:
+                collection = txn['loaded'].get(filename)
+            if collection is None:
+                collection = txn['loaded'][filename] = self._load_committed(filename)
+            return collection
+        return self._load_committed(filename)
+    
+    def _load_committed(self, filename: str) -> IndexedCollection:
+        """Load the committed state of a collection, from the cache if still valid"""
+        unflushed = self._unflushed.get(filename)
+        if unflushed is not None:
+            return unflushed
         file_path = self._get_file_path(filename)
         
+        if self.cache_enabled:
+            entry = self._cache.get(filename)
+            if entry is not None:
+                try:
+                    if self._stamp(os.stat(file_path)) == entry[0]:
+                        return entry[1]
+                except FileNotFoundError:
+                    pass
+        
         if not file_path.exists():
-            return []
+            self._cache.pop(filename, None)
+            return IndexedCollection(specs=self._specs(filename))
         
         try:
-            with open(file_path, 'r') as f:
-                if os.name != 'nt':  # Skip locking on Windows for reads
-                    self._acquire_lock(f)
-                try:
-                    data = json.load(f)
-                    return data if isinstance(data, list) else []
-                finally:
-                    if os.name != 'nt':
-                        self._release_lock(f)
+            # blocks (with backoff) while another process holds the write lock
+            with self._locks.shared(filename), open(file_path, 'r') as f:
+                # fstat the handle we actually read so the stamp matches the data
+                stamp = self._stamp(os.fstat(f.fileno()))
+                data = json.load(f)
+                data = data if isinstance(data, list) else []
+        except StorageError:
+            raise
         except Exception as e:
             raise StorageError(f"Failed to read {filename}: {str(e)}")
+        
+        collection = IndexedCollection(intern_records(filename, data), self._specs(filename))
+        if self.cache_enabled:
+            self._cache[filename] = (stamp, collection)
+        return collection
+    
+    def read(self, filename: str) -> List[Dict[str, Any]]:
+        """
+        Read data from JSON file
+        With the cache enabled the returned records are shared with the cache,
+        so callers must treat them as read-only (the list itself is a copy)
+        """
+        if filename in self.shards:
+            return [record for shard in self._shard_names(filename)
+                    for record in self._load(shard)]
+        return self._load(filename).to_list()
+    
+    def scan(self, filename: str, after_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a collection without copying it - resuming after `after_id`
+        is a dict lookup rather than a walk over everything before it
+        """
+        if filename not in self.shards:
+            return self._load(filename).iter_after(after_id)
+        names = self._shard_names(filename)  # read() order: shard by shard
+        first = iter(())
+        if after_id is not None:
+            shard = self._shard_of(filename, after_id)
+            if shard is None:
+                return iter(())
+            first = self._load(shard).iter_after(after_id)
+            names = names[names.index(shard) + 1:]
+        return chain(first, (record for name in names for record in self._load(name).iter_after()))
     
     def write(self, filename: str, data: List[Dict[str, Any]]):
         """Write data to JSON file atomically - learned this pattern from stackoverflow"""
+        with self.transaction():
+            if filename in self.shards:
+                self._write_sharded(filename, data)
+            else:
+                self._hold(filename)
+                self._txn()['staged'][filename] = IndexedCollection(data, self._specs(filename))
+    
+    @staticmethod
+    def _fsync_dir(folder: Path):
+        """Make a rename durable (not possible/needed on Windows)"""
+        if os.name == 'nt':
+            return
+        fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _persist(self, filename: str, collection: IndexedCollection,
+                 sync: bool = False, sync_dir: bool = True):
+        """
+        Write a collection to disk and make it the cached copy
+        sync=True fsyncs the data before the rename (and the folder after it),
+        otherwise a crash can still lose a write the rename already exposed
+        """
         file_path = self._get_file_path(filename)
         
         try:
             # Write to temporary file first to avoid corruption
+            file_path.parent.mkdir(exist_ok=True)  # shard folders are created lazily
             with tempfile.NamedTemporaryFile(mode='w', dir=self.db_path, 
                                            delete=False, suffix='.tmp') as tmp_file:
-                json.dump(data, tmp_file, indent=2)  # pretty print for debugging
+                json.dump(collection.to_list(), tmp_file, indent=2)  # pretty print for debugging
                 tmp_path = tmp_file.name
+                if sync:
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
             
             # Atomic rename - this ensures we never have half-written files
             if os.name == 'nt':  # Windows needs special handling
                 if file_path.exists():
                     os.remove(file_path)  # Windows can't rename over existing files
             os.rename(tmp_path, file_path)
+            if sync and sync_dir:
+                self._fsync_dir(file_path.parent)
             
         except Exception as e:
             # Clean up temp file if something went wrong
+            self._cache.pop(filename, None)
             if 'tmp_path' in locals() and os.path.exists(tmp_path):
                 os.remove(tmp_path)
             raise StorageError(f"Failed to write {filename}: {str(e)}")
+        
+        # Write-through: keep our own copy warm instead of re-parsing it next time
+        if self.cache_enabled:
+            try:
+                self._cache[filename] = (self._stamp(os.stat(file_path)), collection)
+            except OSError:
+                self._cache.pop(filename, None)
+    
+    # ---- sharded collections ----
+    
+    def _shard_name(self, filename: str, value: Any) -> str:
+        return f"{filename}/{value}"
+    
+    def _locator_name(self, filename: str) -> str:
+        """Lock name of the collection's id -> shard map (storage/shard_locator.py)"""
+        return f"{filename}/_locator"
+    
+    def _locator(self, filename: str) -> ShardLocator:
+        locator = self._locators.get(filename)
+        if locator is None:
+            locator = self._locators[filename] = ShardLocator(
+                self.db_path / filename, self._locks, self._locator_name(filename))
+        return locator
+    
+    def _locate(self, filename: str, id_value: str, shard_value: Any):
+        """Note a record's new shard (or ShardLocator.DELETED) for the locator, written on commit"""
+        pending = self._txn()['locators'].setdefault(filename, {'replace': False, 'changes': {}})
+        if pending['replace'] and shard_value is ShardLocator.DELETED:
+            pending['changes'].pop(id_value, None)
+        else:
+            pending['changes'][id_value] = shard_value
+    
+    def _shard_names(self, filename: str, migrate: bool = True) -> List[str]:
+        """All shards of a collection, including ones only staged so far"""
+        if migrate:
+            self._migrate_flat(filename)
+        names = {f"{filename}/{path.stem}" for path in (self.db_path / filename).glob('*.json')}
+        txn = self._txn()
+        if txn is not None:
+            names.update(name for name in txn['staged'] if name.startswith(filename + '/'))
+        return sorted(names)
+    
+    def _shard_of(self, filename: str, id_value: str) -> Optional[str]:
+        """Which shard holds a record, via the locator (scanning shards as a fallback)"""
+        self._migrate_flat(filename)
+        if self.shards[filename] == 'id':  # sharded on its own id, nothing to look up
+            name = self._shard_name(filename, id_value)
+            return name if self._load(name).get(id_value) is not None else None
+        txn = self._txn()
+        pending = txn['locators'].get(filename) if txn is not None else None
+        if pending is not None and id_value in pending['changes']:
+            shard_value = pending['changes'][id_value]
+        else:
+            shard_value = self._locator(filename).get(id_value, ShardLocator.DELETED)
+        if shard_value is not ShardLocator.DELETED:
+            name = self._shard_name(filename, shard_value)
+            if self._load(name).get(id_value) is not None:
+                return name
+        for shard in self._shard_names(filename):
+            if self._load(shard).get(id_value) is not None:
+                return shard
+        return None
+    
+    def _split(self, filename: str,
+               data: List[Dict[str, Any]]) -> Tuple[Dict[str, IndexedCollection], Dict[str, Any]]:
+        """Partition a full sharded collection into its shards, plus the id -> shard map"""
+        field = self.shards[filename]
+        # existing shards start out empty; no migration here, _migrate_flat is a caller
+        groups: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self._shard_names(filename, migrate=False)}
+        locator = {}
+        for record in data:
+            groups.setdefault(self._shard_name(filename, record.get(field)), []).append(record)
+            if record.get('id') is not None:
+                locator[record['id']] = record.get(field)
+        collections = {name: IndexedCollection(records, self._specs(name))
+                       for name, records in groups.items()}
+        return collections, locator
+    
+    def _write_sharded(self, filename: str, data: List[Dict[str, Any]]):
+        """Stage a full replacement of a sharded collection"""
+        self._migrate_flat(filename)  # or the old flat file would be split over it later
+        collections, locator = self._split(filename, data)
+        txn = self._txn()
+        for name, collection in collections.items():
+            self._hold(name)
+            txn['staged'][name] = collection
+        txn['locators'][filename] = {'replace': True, 'changes': locator}
+    
+    def _migrate_flat(self, filename: str):
+        """
+        One-off split of an existing flat <name>.json into shards
+        The flat file is only renamed away once every shard is on disk, so an
+        interrupted migration simply runs again
+        """
+        if filename in self._migrated:
+            return
+        flat_path = self._get_file_path(filename)
+        if flat_path.exists():
+            with self._write_lock, self._locks.exclusive(filename):
+                if flat_path.exists():  # another process may have migrated it meanwhile
+                    collections, locator = self._split(filename, self._load_committed(filename).to_list())
+                    for name, collection in collections.items():
+                        self._persist(name, collection, sync=self.durability != 'none')
+                    self._locator(filename).rewrite(locator)
+                    os.replace(flat_path, flat_path.with_suffix('.json.migrated'))
+        self._migrated.add(filename)  # only once it worked, a failed split runs again next time
     
     def find_by_id(self, filename: str, id_value: str) -> Optional[Dict[str, Any]]:
         """Find a record by ID"""
-        data = self.read(filename)
-        for record in data:
-            if record.get('id') == id_value:
-                return record
-        return None
+        if filename in self.shards:
+            shard = self._shard_of(filename, id_value)
+            return self._load(shard).get(id_value) if shard else None
+        return self._load(filename).get(id_value)
+    
+    def find_by_ids(self, filename: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Look up several records by ID with one load of the collection"""
+        if filename in self.shards:
+            return super().find_by_ids(filename, ids)
+        collection = self._load(filename)
+        records = (collection.get(id_value) for id_value in ids)
+        return [record for record in records if record is not None]
     
     def find_by_field(self, filename: str, field: str, value: Any) -> List[Dict[str, Any]]:
-        """Find records by field value"""
-        data = self.read(filename)
-        return [record for record in data if record.get(field) == value]
+        """Find records by field value - a hash lookup for indexed fields"""
+        if filename in self.shards:
+            if field == self.shards[filename]:
+                # the whole point of sharding: only this shard's file is touched
+                self._migrate_flat(filename)
+                return self._load(self._shard_name(filename, value)).to_list()
+            return [record for shard in self._shard_names(filename)
+                    for record in self._load(shard).find(field, value)]
+        return self._load(filename).find(field, value)
+    
+    def find_range(self, filename: str, field: str, low: Any = None,
+                   high: Any = None) -> List[Dict[str, Any]]:
+        """Records with low <= field < high in field order - a sorted index slice per file"""
+        if filename in self.shards:
+            ranges = [self._load(shard).find_range(field, low, high) for shard in self._shard_names(filename)]
+            return list(heapq.merge(*ranges, key=lambda record: record[field]))
+        return self._load(filename).find_range(field, low, high)
     
     def create(self, filename: str, record: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new record"""
-        data = self.read(filename)
-        data.append(record)
-        self.write(filename, data)
+        """Create a new record (raises UniqueConstraintError on a unique index clash)"""
+        with self.transaction():
+            if filename in self.shards:
+                self._migrate_flat(filename)
+                shard_value = record.get(self.shards[filename])
+                self._working(self._shard_name(filename, shard_value)).add(record)
+                if record.get('id') is not None:
+                    self._locate(filename, record['id'], shard_value)
+            else:
+                self._working(filename).add(record)
         return record
     
     def update(self, filename: str, id_value: str, updates: Dict[str, Any]) -> bool:
         """Update a record by ID"""
-        data = self.read(filename)
-        for i, record in enumerate(data):
-            if record.get('id') == id_value:
-                data[i].update(updates)
-                self.write(filename, data)
-                return True
-        return False
+        with self.transaction():
+            name = self._shard_of(filename, id_value) if filename in self.shards else filename
+            if name is None:
+                return False
+            # lock first, what was read before the lock may be gone by now (a miss stages nothing)
+            self._hold(name)
+            current = self._load(name).get(id_value)
+            if current is None:
+                return False
+            field = self.shards.get(filename)
+            if field and field in updates and updates[field] != current.get(field):
+                # record moves to another shard
+                self._working(name).remove(id_value)
+                self._working(self._shard_name(filename, updates[field])).add({**current, **updates})
+                self._locate(filename, id_value, updates[field])
+            else:
+                self._working(name).update(id_value, updates)
+        return True
     
     def delete(self, filename: str, id_value: str) -> bool:
         """Delete a record by ID"""
-        data = self.read(filename)
-        original_length = len(data)
-        data = [record for record in data if record.get('id') != id_value]
-        
-        if len(data) < original_length:
-            self.write(filename, data)
-            return True
-        return False
\ No newline at end of file
+        with self.transaction():
+            name = self._shard_of(filename, id_value) if filename in self.shards else filename
+            if name is None:
+                return False
+            self._hold(name)  # checked under the lock, like update()
+            if self._load(name).get(id_value) is None:
+                return False
+            self._working(name).remove(id_value)
+            if filename in self.shards:
+                self._locate(filename, id_value, ShardLocator.DELETED)
+        return True
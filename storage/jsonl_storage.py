@@ -0,0 +1,480 @@
+import json
+import mmap
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Tuple
+from pathlib import Path
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.base import StorageBackend, skip_past
+from storage.locking import FileLockManager
+from storage.indexes import SortedIndex, sorted_fields
+from storage.interning import intern_record, reference_fields
+from utils.exceptions import StorageError
+
+TOMBSTONE = '_deleted'  # {"_deleted": "<id>"} marks a deleted record
+SIDECAR_FORMAT = 2  # offsets carry the first-line offset since format 2
+
+
+class _LinesState:
+    """Offset index and mapping for one <name>.jsonl file"""
+
+    def __init__(self):
+        # id -> (byte offset, length) of the newest version, plus the offset of the
+        # record's first line, which fixes its place in scan order
+        self.offsets: Dict[str, Tuple[int, int, int]] = {}
+        self.size = 0  # bytes of the file covered by `offsets`
+        self.ino = None
+        self.dead = 0  # bytes taken by superseded versions and tombstones
+        self.unsaved = 0  # appends since the sidecar was last written
+        self.mm = None
+        self.mm_size = 0
+        self.scans = 0  # scan() generators reading `offsets` and `mm` right now
+        # field -> (value -> id sorted index, id -> value), built on the first range query
+        self.ranges: Dict[str, Tuple[SortedIndex, Dict[str, Any]]] = {}
+
+    def close_map(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+            self.mm_size = 0
+
+    def release_map(self):
+        """Stop using the mapping - a scan still reading it keeps it open until it is done"""
+        if self.scans:
+            self.mm = None
+            self.mm_size = 0
+        else:
+            self.close_map()
+
+
+class _Staged:
+    """Uncommitted changes of one collection inside a transaction"""
+
+    def __init__(self):
+        self.replaced: Optional[List[Dict[str, Any]]] = None  # set by write()
+        self.changes: Dict[str, Optional[Dict[str, Any]]] = {}  # id -> new version, None = deleted
+        self.anon: List[Dict[str, Any]] = []  # new records without an id
+
+
+class JsonLinesStorage(StorageBackend):
+    """
+    JSON Lines storage engine with a byte-offset index and mmap reads
+
+    Each collection is <name>.jsonl with one compact record per line, plus a
+    <name>.idx.json sidecar mapping id -> (offset, length). find_by_id decodes
+    exactly one line out of a read-only mmap, and scan() streams the live
+    records without building the whole list. Writes are appends: an update
+    appends the new version, a delete appends a tombstone, and the file is
+    rewritten without the dead lines once they outweigh the live ones.
+
+    The sidecar covers a prefix of the file; anything appended after it (by
+    us before the next sidecar save, or by another process) is indexed by
+    scanning just that tail. Records without an id (team_members) can only be
+    replaced as a whole through write(). Scans go in creation order: a record
+    is read (in its newest version) when the scan passes its first line, so
+    updates don't move it and paging cursors stay put.
+
+    A scan sees the file as it was when the scan started: writes made while
+    it is suspended map the file afresh and copy the offset index instead of
+    changing the ones it is reading.
+    """
+
+    def __init__(self, db_path: str = "db", index_save_every: int = 100,
+                 lock_timeout: float = 10.0):
+        self.db_path = Path(db_path)
+        self.db_path.mkdir(exist_ok=True)
+        self.index_save_every = index_save_every
+        self._states: Dict[str, _LinesState] = {}
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._locks = FileLockManager(self.db_path, timeout=lock_timeout)
+
+    def _data_path(self, filename: str) -> Path:
+        return self.db_path / f"{filename}.jsonl"
+
+    def _index_path(self, filename: str) -> Path:
+        return self.db_path / f"{filename}.idx.json"
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+    # ---- offset index ----
+
+    def _index_lines(self, state: _LinesState, view, start: int, end: int):
+        """Add the lines in view[start:end] to the offset index"""
+        pos = start
+        while pos < end:
+            newline = view.find(b'\n', pos, end)
+            if newline == -1:
+                break  # half-written line, pick it up next time
+            length = newline + 1 - pos
+            record = json.loads(view[pos:newline])
+            if TOMBSTONE in record:
+                old = state.offsets.pop(record[TOMBSTONE], None)
+                state.dead += length + (old[1] if old else 0)
+                self._range_update(state, record[TOMBSTONE], None)
+            elif record.get('id') is not None:
+                old = state.offsets.get(record['id'])
+                if old is not None:
+                    state.dead += old[1]
+                state.offsets[record['id']] = (pos, length, old[2] if old is not None else pos)
+                self._range_update(state, record['id'], record)
+            pos = newline + 1
+        state.size = pos
+
+    @staticmethod
+    def _range_update(state: _LinesState, id_value: str, record: Optional[Dict[str, Any]]):
+        """Move a record's entries in the built sorted indexes (record None = deleted)"""
+        for field, (index, values) in state.ranges.items():
+            index.remove(values.pop(id_value, None), id_value)
+            value = record.get(field) if record is not None else None
+            if value is not None:
+                values[id_value] = value
+                index.add(value, id_value)
+
+    def _load_sidecar(self, filename: str, state: _LinesState):
+        try:
+            with open(self._index_path(filename), 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get('ino') != state.ino or saved.get('format') != SIDECAR_FORMAT:
+            return  # belongs to a file that has since been rewritten, or to an older version
+        state.offsets = {key: tuple(value) for key, value in saved['offsets'].items()}
+        state.size = saved['size']
+        state.dead = saved.get('dead', 0)
+
+    def _save_sidecar(self, filename: str, state: _LinesState):
+        payload = {"format": SIDECAR_FORMAT, "ino": state.ino, "size": state.size, "dead": state.dead,
+                   "offsets": state.offsets}
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', dir=self.db_path,
+                                             delete=False, suffix='.tmp') as tmp_file:
+                json.dump(payload, tmp_file, separators=(',', ':'))
+                tmp_path = tmp_file.name
+            os.replace(tmp_path, self._index_path(filename))
+        except Exception as e:
+            if 'tmp_path' in locals() and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise StorageError(f"Failed to write index for {filename}: {str(e)}")
+        state.unsaved = 0
+
+    def _view(self, filename: str, state: _LinesState):
+        """Read-only mmap covering at least the indexed part of the file"""
+        if state.size == 0:
+            return b''
+        if state.mm is None or state.mm_size < state.size:
+            state.close_map()
+            with open(self._data_path(filename), 'rb') as f:
+                state.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            state.mm_size = len(state.mm)
+        return state.mm
+
+    def _state(self, filename: str) -> _LinesState:
+        """Offset index brought up to date with the file (one stat if nothing changed)"""
+        state = self._states.get(filename)
+        try:
+            st = os.stat(self._data_path(filename))
+        except FileNotFoundError:
+            st = None
+        if st is None:
+            if state is not None:
+                state.release_map()
+            state = self._states[filename] = _LinesState()
+            return state
+        if state is None or state.ino != st.st_ino or st.st_size < state.size:
+            if state is not None:
+                state.release_map()
+            state = _LinesState()
+            state.ino = st.st_ino
+            self._load_sidecar(filename, state)
+            self._states[filename] = state
+        if st.st_size > state.size:
+            try:
+                state.release_map()  # the mapping is sized to the old length
+                if state.scans:
+                    # running scans keep reading the index as of their start
+                    state.offsets = dict(state.offsets)
+                with open(self._data_path(filename), 'rb') as f:
+                    state.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                state.mm_size = len(state.mm)
+                self._index_lines(state, state.mm, state.size, state.mm_size)
+            except Exception as e:
+                raise StorageError(f"Failed to index {filename}: {str(e)}")
+        return state
+
+    # ---- committed data ----
+
+    def _get_committed(self, filename: str, id_value: str) -> Optional[Dict[str, Any]]:
+        state = self._state(filename)
+        location = state.offsets.get(id_value)
+        if location is None:
+            return None
+        offset, length = location[0], location[1]
+        return intern_record(json.loads(self._view(filename, state)[offset:offset + length]),
+                             reference_fields(filename))
+
+    def _scan_committed(self, filename: str, after_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        state = self._state(filename)
+        view = self._view(filename, state)
+        offsets, end, pos = state.offsets, state.size, 0
+        fields = reference_fields(filename)
+        if after_id is not None:
+            if after_id not in offsets:
+                return
+            first = offsets[after_id][2]
+            pos = view.find(b'\n', first, end) + 1  # resume right after its first line
+        # writes while we are suspended swap in a new mapping and index (see _state)
+        state.scans += 1
+        try:
+            while pos < end:
+                newline = view.find(b'\n', pos, end)
+                if newline == -1:
+                    break
+                record = json.loads(view[pos:newline])
+                if TOMBSTONE not in record:
+                    record_id = record.get('id')
+                    if record_id is None:
+                        yield intern_record(record, fields)
+                    else:
+                        # a record is yielded at its first line, in its newest version
+                        location = offsets.get(record_id)
+                        if location is not None and location[2] == pos:
+                            if location[0] != pos:
+                                record = json.loads(view[location[0]:location[0] + location[1] - 1])
+                            yield intern_record(record, fields)
+                pos = newline + 1
+        finally:
+            state.scans -= 1
+
+    # ---- transactions ----
+
+    def _txn(self) -> Optional[Dict[str, Any]]:
+        return getattr(self._local, 'txn', None)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Stage changes in memory and append them with one write per collection
+        Touched collections stay exclusively locked until the commit is done
+        """
+        if self._txn() is not None:
+            yield
+            return
+        with self._lock:
+            txn = self._local.txn = {'staged': {}, 'locks': []}
+            try:
+                try:
+                    yield
+                finally:
+                    self._local.txn = None
+                for filename, staged in txn['staged'].items():
+                    self._commit(filename, staged)
+            finally:
+                for filename in reversed(txn['locks']):
+                    self._locks.release(filename)
+
+    def hold(self, *filenames: str, shard: Any = None):
+        """Lock collections for the rest of the transaction (see StorageBackend.hold)"""
+        if self._txn() is None:
+            return
+        for filename in filenames:
+            self._staged(filename)
+
+    def _staged(self, filename: str) -> _Staged:
+        txn = self._txn()
+        staged = txn['staged'].get(filename)
+        if staged is None:
+            self._locks.acquire(filename, 'exclusive')
+            txn['locks'].append(filename)
+            staged = txn['staged'][filename] = _Staged()
+        return staged
+
+    def _commit(self, filename: str, staged: _Staged):
+        if staged.replaced is not None:
+            self._rewrite(filename, staged.replaced)
+            return
+        lines = []
+        for record_id, record in staged.changes.items():
+            lines.append(self._encode({TOMBSTONE: record_id} if record is None else record))
+        lines.extend(self._encode(record) for record in staged.anon)
+        if not lines:
+            return
+        try:
+            fd = os.open(self._data_path(filename), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b''.join(lines))
+            finally:
+                os.close(fd)
+        except Exception as e:
+            raise StorageError(f"Failed to write {filename}: {str(e)}")
+        state = self._state(filename)  # indexes the lines we just appended
+        state.unsaved += len(lines)
+        live = state.size - state.dead
+        if state.dead > live and state.size > 64 * 1024:
+            self._rewrite(filename, list(self._scan_committed(filename)))
+        elif state.unsaved >= self.index_save_every:
+            self._save_sidecar(filename, state)
+
+    def _rewrite(self, filename: str, records: List[Dict[str, Any]]):
+        """Replace the file with exactly `records` (compaction / write())"""
+        data_path = self._data_path(filename)
+        try:
+            with tempfile.NamedTemporaryFile(mode='wb', dir=self.db_path,
+                                             delete=False, suffix='.tmp') as tmp_file:
+                for record in records:
+                    tmp_file.write(self._encode(record))
+                tmp_path = tmp_file.name
+            os.replace(tmp_path, data_path)
+        except Exception as e:
+            if 'tmp_path' in locals() and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise StorageError(f"Failed to write {filename}: {str(e)}")
+        self._save_sidecar(filename, self._state(filename))
+
+    # ---- StorageBackend interface ----
+
+    def scan(self, filename: str, after_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream live records without materialising the collection"""
+        txn = self._txn()
+        staged = txn['staged'].get(filename) if txn else None
+        if staged is None:
+            yield from self._scan_committed(filename, after_id)
+            return
+        if after_id is not None:
+            yield from skip_past(self._scan_staged(filename, staged), after_id)
+            return
+        yield from self._scan_staged(filename, staged)
+
+    def _scan_staged(self, filename: str, staged: _Staged) -> Iterator[Dict[str, Any]]:
+        """Committed records overlaid with this transaction's changes"""
+        if staged.replaced is not None:
+            yield from list(staged.replaced)
+            return
+        offsets = self._state(filename).offsets
+        added = [record for record_id, record in staged.changes.items()
+                 if record is not None and record_id not in offsets]
+        for record in self._scan_committed(filename):
+            record_id = record.get('id')
+            if record_id not in staged.changes:
+                yield record
+            elif staged.changes[record_id] is not None:
+                yield staged.changes[record_id]  # changed records keep their place
+        yield from added
+        yield from list(staged.anon)
+
+    def read(self, filename: str) -> List[Dict[str, Any]]:
+        """Read all records"""
+        with self._lock:
+            return list(self.scan(filename))
+
+    def write(self, filename: str, data: List[Dict[str, Any]]):
+        """Replace a whole collection"""
+        with self.transaction():
+            staged = self._staged(filename)
+            staged.replaced = list(data)
+            staged.changes, staged.anon = {}, []
+
+    def find_by_id(self, filename: str, id_value: str) -> Optional[Dict[str, Any]]:
+        """Find a record by ID - decodes a single line"""
+        with self._lock:
+            txn = self._txn()
+            staged = txn['staged'].get(filename) if txn else None
+            if staged is not None:
+                if staged.replaced is not None:
+                    return next((r for r in staged.replaced if r.get('id') == id_value), None)
+                if id_value in staged.changes:
+                    return staged.changes[id_value]
+            return self._get_committed(filename, id_value)
+
+    def find_by_ids(self, filename: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Look up several records by ID against one refresh of the offset index"""
+        with self._lock:
+            if self._txn() is not None:
+                return super().find_by_ids(filename, ids)
+            state = self._state(filename)
+            view = self._view(filename, state)
+            fields = reference_fields(filename)
+            records = []
+            for id_value in ids:
+                location = state.offsets.get(id_value)
+                if location is not None:
+                    records.append(intern_record(json.loads(view[location[0]:location[0] + location[1]]), fields))
+            return records
+
+    def find_range(self, filename: str, field: str, low: Any = None,
+                   high: Any = None) -> List[Dict[str, Any]]:
+        """
+        Records with low <= field < high in field order. The time fields get a
+        sorted id index on first use (one scan), which later appends keep up to date
+        """
+        with self._lock:
+            if self._txn() is not None or field not in sorted_fields(filename):
+                return super().find_range(filename, field, low, high)
+            state = self._state(filename)
+            if field not in state.ranges:
+                values = {record['id']: record[field] for record in self._scan_committed(filename)
+                          if record.get('id') is not None and record.get(field) is not None}
+                state.ranges[field] = (SortedIndex((value, id_value) for id_value, value in values.items()),
+                                       values)
+            ids = state.ranges[field][0].range(low, high)
+            return self.find_by_ids(filename, ids)
+
+    def find_by_field(self, filename: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Find records by field value (streaming scan)"""
+        if field == 'id':
+            record = self.find_by_id(filename, value)
+            return [record] if record is not None else []
+        with self._lock:
+            return [record for record in self.scan(filename) if record.get(field) == value]
+
+    def create(self, filename: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new record"""
+        with self.transaction():
+            staged = self._staged(filename)
+            if staged.replaced is not None:
+                staged.replaced.append(record)
+            elif record.get('id') is None:
+                staged.anon.append(record)
+            else:
+                staged.changes[record['id']] = record
+        return record
+
+    def update(self, filename: str, id_value: str, updates: Dict[str, Any]) -> bool:
+        """Update a record by ID - appends the new version"""
+        with self.transaction():
+            staged = self._staged(filename)
+            current = self.find_by_id(filename, id_value)
+            if current is None:
+                return False
+            new = {**current, **updates}
+            if staged.replaced is not None:
+                staged.replaced = [new if r is current else r for r in staged.replaced]
+            else:
+                staged.changes[id_value] = new
+        return True
+
+    def delete(self, filename: str, id_value: str) -> bool:
+        """Delete a record by ID - appends a tombstone"""
+        with self.transaction():
+            staged = self._staged(filename)
+            if self.find_by_id(filename, id_value) is None:
+                return False
+            if staged.replaced is not None:
+                staged.replaced = [r for r in staged.replaced if r.get('id') != id_value]
+            else:
+                staged.changes[id_value] = None
+        return True
+
+    def close(self):
+        """Save the offset indexes and unmap the files"""
+        with self._lock:
+            for filename, state in self._states.items():
+                if state.unsaved and state.ino is not None:
+                    self._save_sidecar(filename, state)
+                state.close_map()
+        super().close()
@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+from pathlib import Path
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.exceptions import StorageError
+
+# Platform-specific imports
+if os.name != 'nt':  # Unix/Linux
+    import fcntl
+
+SHARED = 'shared'
+EXCLUSIVE = 'exclusive'
+_PENDING = 'pending'
+
+
+class _HeldLock:
+    """One OS-level lock on a collection's lock file, shared by this process's threads"""
+
+    def __init__(self):
+        self.mode = _PENDING
+        self.handle = None
+        self.holders = 0
+
+
+class FileLockManager:
+    """
+    Multi-reader / single-writer locks on collections, across processes and threads
+
+    Every collection gets a sidecar <name>.lock file. Readers take a shared flock,
+    writers an exclusive one, and both block with exponential backoff up to
+    `timeout` seconds instead of failing on the first conflict. The data files
+    themselves are replaced by rename, so they can't carry the lock.
+
+    Inside one process a lock file is only flocked once: threads asking for a
+    mode that is already covered just join as extra holders (a held exclusive
+    lock covers readers too - serialising writer threads is the caller's job).
+    """
+
+    def __init__(self, lock_dir: Path, timeout: float = 10.0):
+        self.lock_dir = Path(lock_dir)
+        self.timeout = timeout
+        self._held: Dict[str, _HeldLock] = {}
+        self._cond = threading.Condition()
+        self._stats = {"acquired": 0, "contended": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    def _lock_path(self, name: str) -> Path:
+        return self.lock_dir / f"{name}.lock"
+
+    def stats(self) -> Dict[str, Any]:
+        """Lock acquisition counters and total/max time spent waiting"""
+        with self._cond:
+            return dict(self._stats)
+
+    def _record_wait(self, waited: float):
+        with self._cond:
+            self._stats["acquired"] += 1
+            self._stats["wait_seconds"] += waited
+            if waited > 0.001:
+                self._stats["contended"] += 1
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+
+    def _os_lock(self, handle, mode: str, name: str, deadline: float):
+        """Take the flock, retrying with backoff until the deadline"""
+        delay = 0.001
+        while True:
+            try:
+                if os.name == 'nt':  # Windows has no shared locks, fall back to exclusive
+                    import msvcrt
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    flag = fcntl.LOCK_SH if mode == SHARED else fcntl.LOCK_EX
+                    fcntl.flock(handle.fileno(), flag | fcntl.LOCK_NB)
+                return
+            except OSError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise StorageError(f"Timed out after {self.timeout}s waiting for {mode} lock on {name}")
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.05)
+
+    def acquire(self, name: str, mode: str):
+        """Block until this process holds `name` in (at least) `mode`"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        with self._cond:
+            while True:
+                held = self._held.get(name)
+                if held is None:
+                    held = self._held[name] = _HeldLock()  # we take the OS lock below
+                    break
+                if held.mode == EXCLUSIVE or (held.mode == SHARED and mode == SHARED):
+                    held.holders += 1
+                    self._stats["acquired"] += 1
+                    return
+                # pending, or shared while we need exclusive: wait for it to go away
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise StorageError(f"Timed out after {self.timeout}s waiting for {mode} lock on {name}")
+                self._cond.wait(remaining)
+
+        try:
+            lock_path = self._lock_path(name)
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(lock_path, 'a+')
+            try:
+                self._os_lock(handle, mode, name, deadline)
+            except BaseException:
+                handle.close()
+                raise
+        except BaseException as e:
+            with self._cond:
+                del self._held[name]
+                self._cond.notify_all()
+            if isinstance(e, (StorageError, KeyboardInterrupt)):
+                raise
+            raise StorageError(f"Failed to lock {name}: {str(e)}")
+
+        with self._cond:
+            held.handle = handle
+            held.mode = mode
+            held.holders = 1
+            self._cond.notify_all()
+        self._record_wait(time.monotonic() - start)
+
+    def release(self, name: str):
+        with self._cond:
+            held = self._held[name]
+            held.holders -= 1
+            if held.holders > 0:
+                return
+            del self._held[name]
+            try:
+                if os.name == 'nt':
+                    import msvcrt
+                    held.handle.seek(0)
+                    msvcrt.locking(held.handle.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(held.handle.fileno(), fcntl.LOCK_UN)
+            finally:
+                held.handle.close()
+                self._cond.notify_all()
+
+    @contextmanager
+    def shared(self, name: str):
+        self.acquire(name, SHARED)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    @contextmanager
+    def exclusive(self, name: str):
+        self.acquire(name, EXCLUSIVE)
+        try:
+            yield
+        finally:
+            self.release(name)
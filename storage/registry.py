@@ -0,0 +1,88 @@
+import atexit
+import os
+import threading
+from typing import Dict, Tuple, Callable
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.base import StorageBackend
+from utils.exceptions import StorageError
+
+
+def _json_engine(db_path: str, **options) -> StorageBackend:
+    from storage.json_storage import JsonStorage
+    # a shared engine is long lived, so keeping the warm copy is the point
+    options.setdefault('cache', True)
+    return JsonStorage(db_path, **options)
+
+
+def _journal_engine(db_path: str, **options) -> StorageBackend:
+    from storage.journal_storage import JournalStorage
+    return JournalStorage(db_path, **options)
+
+
+def _jsonl_engine(db_path: str, **options) -> StorageBackend:
+    from storage.jsonl_storage import JsonLinesStorage
+    return JsonLinesStorage(db_path, **options)
+
+
+def _sqlite_engine(db_path: str, **options) -> StorageBackend:
+    from storage.sqlite_storage import SqliteStorage
+    return SqliteStorage(db_path, **options)
+
+
+BACKENDS: Dict[str, Callable[..., StorageBackend]] = {
+    'json': _json_engine,
+    'journal': _journal_engine,
+    'jsonl': _jsonl_engine,
+    'sqlite': _sqlite_engine,
+}
+
+# (pid, absolute db path) -> (backend name, engine). The pid keeps a forked
+# worker from inheriting its parent's engine (and e.g. its sqlite connection).
+_engines: Dict[Tuple[int, str], Tuple[str, StorageBackend]] = {}
+_lock = threading.Lock()
+
+
+def _key(db_path: str) -> Tuple[int, str]:
+    return (os.getpid(), os.path.abspath(db_path))
+
+
+def get_storage(db_path: str = "db", backend: str = "json", **options) -> StorageBackend:
+    """
+    Get the process-wide engine for a db folder, creating it on first use
+    UserImpl, TeamImpl and ProjectBoardImpl all use this by default, so they
+    share one cache/index/connection instead of each building their own.
+    `options` only apply when the engine is created.
+    """
+    if backend not in BACKENDS:
+        raise StorageError(f"Unknown storage backend '{backend}'. Must be one of: {', '.join(BACKENDS)}")
+    key = _key(db_path)
+    with _lock:
+        entry = _engines.get(key)
+        if entry is not None and not entry[1].closed:
+            if entry[0] != backend:
+                raise StorageError(f"{db_path} is already open with the '{entry[0]}' backend")
+            return entry[1]
+        engine = BACKENDS[backend](db_path, **options)
+        _engines[key] = (backend, engine)
+        return engine
+
+
+def close_storage(db_path: str = "db"):
+    """Close and forget the engine for a db folder (no-op if none is open)"""
+    with _lock:
+        entry = _engines.pop(_key(db_path), None)
+    if entry is not None:
+        entry[1].close()
+
+
+def close_all():
+    """Close every engine this process opened"""
+    with _lock:
+        entries = [entry for key, entry in _engines.items() if key[0] == os.getpid()]
+        _engines.clear()
+    for _, engine in entries:
+        engine.close()
+
+
+atexit.register(close_all)
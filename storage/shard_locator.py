@@ -0,0 +1,144 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Any, Iterable, Tuple
+from pathlib import Path
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.locking import FileLockManager
+from utils.exceptions import StorageError
+
+
+class ShardLocator:
+    """
+    Record id -> shard value map of a sharded collection, so lookups by id
+    don't have to open every shard
+
+    On disk it's an append-only <collection>/_locator.jsonl:
+
+        {"op": "set", "id", "shard": value}
+        {"op": "del", "id"}
+
+    A commit appends one line per record it created, moved or deleted, so a
+    write to one board costs a few bytes here instead of a rewrite of every
+    task's entry. Appends are single O_APPEND writes under a shared lock - the
+    lines for one id are only ever written by whoever holds that record's
+    shard exclusively, so boards don't queue up behind each other. Rewrites
+    (compaction, full replacements) take the lock exclusively. Readers tail the
+    file from where they left off, like the search index does.
+
+    The map is a hint: callers check the record really is in the shard it
+    names and fall back to scanning the shards, so a line lost to a crash
+    between the shard write and the append only costs a slower lookup.
+    """
+
+    DELETED = object()  # shard value that marks a removed record in append()
+
+    def __init__(self, folder: Path, locks: FileLockManager, lock_name: str):
+        self.folder = Path(folder)
+        self.path = self.folder / "_locator.jsonl"
+        self._locks = locks
+        self._lock_name = lock_name
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.shards: Dict[str, Any] = {}
+        self._offset = 0
+        self._ino = None
+        self._lines = 0
+
+    # ---- reading ----
+
+    def _refresh(self):
+        """Catch up with the file - reloads it if it was rewritten, otherwise reads the new tail"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._ino is not None:
+                self._reset()
+            return
+        if st.st_ino != self._ino or st.st_size < self._offset:
+            self._reset()
+            self._ino = st.st_ino
+        if st.st_size == self._offset:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError as e:
+            raise StorageError(f"Failed to read shard locator: {str(e)}")
+        end = data.rfind(b'\n') + 1  # leave a half-written last line for next time
+        for line in data[:end].splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                if entry['op'] == 'del':
+                    self.shards.pop(entry['id'], None)
+                else:
+                    shard = entry['shard']
+                    self.shards[sys.intern(entry['id'])] = sys.intern(shard) if type(shard) is str else shard
+                self._lines += 1
+        self._offset += end
+
+    def get(self, id_value: str, default: Any = None) -> Any:
+        """Shard value last recorded for an id (`default` when there is none)"""
+        with self._lock:
+            self._refresh()
+            return self.shards.get(id_value, default)
+
+    # ---- writing ----
+
+    @staticmethod
+    def _lines_for(changes: Iterable[Tuple[str, Any]]) -> bytes:
+        """(id, shard value) pairs as log lines"""
+        lines = []
+        for id_value, shard in changes:
+            entry = {"op": "del", "id": id_value} if shard is ShardLocator.DELETED else \
+                {"op": "set", "id": id_value, "shard": shard}
+            lines.append(json.dumps(entry, separators=(',', ':')) + '\n')
+        return ''.join(lines).encode('utf-8')
+
+    def append(self, changes: Dict[str, Any]):
+        """Record {id: shard value} changes, with ShardLocator.DELETED for removed records"""
+        if not changes:
+            return
+        payload = self._lines_for(changes.items())
+        with self._lock:
+            with self._locks.shared(self._lock_name):
+                try:
+                    self.folder.mkdir(parents=True, exist_ok=True)
+                    fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    try:
+                        os.write(fd, payload)
+                    finally:
+                        os.close(fd)
+                except OSError as e:
+                    raise StorageError(f"Failed to write shard locator: {str(e)}")
+                self._refresh()
+            if self._lines > max(1000, 2 * len(self.shards)):
+                with self._locks.exclusive(self._lock_name):
+                    self._refresh()  # pick up whatever was appended meanwhile
+                    self._rewrite(self.shards)
+
+    def rewrite(self, shards: Dict[str, Any]):
+        """Replace the whole map, e.g. after a full write of the collection"""
+        with self._lock, self._locks.exclusive(self._lock_name):
+            self._rewrite(shards)
+
+    def _rewrite(self, shards: Dict[str, Any]):
+        """Write the file with one line per id (caller holds the file lock exclusively)"""
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(mode='wb', dir=self.folder, delete=False,
+                                             suffix='.tmp') as tmp_file:
+                tmp_file.write(self._lines_for(shards.items()))
+                tmp_path = tmp_file.name
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            if 'tmp_path' in locals() and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise StorageError(f"Failed to write shard locator: {str(e)}")
+        self._reset()
+        self._refresh()
@@ -0,0 +1,296 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator, Iterable
+from pathlib import Path
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.base import StorageBackend
+from storage.interning import intern_record, intern_records, reference_fields
+from utils.exceptions import StorageError
+
+# Column layout for the collections we know about. Anything else ends up in the
+# generic `documents` table as a JSON blob.
+TABLES = {
+    'users': ['id', 'name', 'display_name', 'creation_time'],
+    'teams': ['id', 'name', 'description', 'admin', 'creation_time'],
+    'team_members': ['team_id', 'user_id'],
+    'boards': ['id', 'name', 'description', 'team_id', 'status', 'creation_time', 'end_time'],
+    'tasks': ['id', 'title', 'description', 'user_id', 'board_id', 'status', 'creation_time'],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, display_name TEXT, creation_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_name ON users(name);
+CREATE INDEX IF NOT EXISTS idx_users_created ON users(creation_time);
+
+CREATE TABLE IF NOT EXISTS teams (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT, admin TEXT, creation_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_teams_name ON teams(name);
+CREATE INDEX IF NOT EXISTS idx_teams_created ON teams(creation_time);
+
+CREATE TABLE IF NOT EXISTS team_members (
+    team_id TEXT NOT NULL, user_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_team_members_team_user ON team_members(team_id, user_id);
+CREATE INDEX IF NOT EXISTS idx_team_members_user ON team_members(user_id);
+
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT, team_id TEXT,
+    status TEXT, creation_time TEXT, end_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_boards_team ON boards(team_id);
+CREATE INDEX IF NOT EXISTS idx_boards_created ON boards(creation_time);
+CREATE INDEX IF NOT EXISTS idx_boards_ended ON boards(end_time);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, user_id TEXT,
+    board_id TEXT, status TEXT, creation_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_board_status ON tasks(board_id, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(creation_time);
+
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL, id TEXT, body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_collection_id ON documents(collection, id);
+"""
+
+SCAN_BATCH = 500  # rows per query when streaming a table
+
+
+class SqliteStorage(StorageBackend):
+    """
+    SQLite storage engine (stdlib sqlite3)
+    Same interface as JsonStorage, but lookups on indexed columns are index seeks
+    instead of full scans. Runs in WAL mode so readers don't block the writer.
+    """
+
+    def __init__(self, db_path: str = "db", filename: str = "planner.sqlite3"):
+        self.db_path = Path(db_path)
+        self.db_path.mkdir(exist_ok=True)
+        self.file_path = self.db_path / filename
+        # one connection shared by all threads, guarded by our own lock
+        self._lock = threading.RLock()
+        self._in_transaction = False
+        try:
+            self._conn = sqlite3.connect(str(self.file_path), check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to open {self.file_path}: {str(e)}")
+
+    def _columns(self, filename: str, record: Dict[str, Any]) -> List[str]:
+        """Validate a record against the table layout"""
+        columns = TABLES[filename]
+        unknown = [key for key in record if key not in columns]
+        if unknown:
+            raise StorageError(f"Unknown fields for {filename}: {', '.join(unknown)}")
+        return columns
+
+    def _fetch(self, filename: str, sql: str, params=(), one: bool = False):
+        """Run a query and fetch its rows while holding the connection lock"""
+        try:
+            with self._lock:
+                cursor = self._conn.execute(sql, params)
+                return cursor.fetchone() if one else cursor.fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(f"Storage operation on {filename} failed: {str(e)}")
+
+    def _modify(self, filename: str, statements):
+        """Run (sql, params) pairs in one transaction, returns the last cursor"""
+        try:
+            with self._lock:
+                if self._in_transaction:
+                    # part of an outer transaction() - it commits for us
+                    return self._run(statements)
+                with self._conn:
+                    return self._run(statements)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to write {filename}: {str(e)}")
+
+    def _run(self, statements) -> Optional[sqlite3.Cursor]:
+        cursor = None
+        for sql, params in statements:
+            cursor = self._conn.execute(sql, params)
+        return cursor
+
+    @contextmanager
+    def transaction(self):
+        """Run the block in one SQLite transaction (rolled back if it raises)"""
+        with self._lock:
+            if self._in_transaction:
+                yield
+                return
+            self._in_transaction = True
+            try:
+                with self._conn:
+                    yield
+            except sqlite3.Error as e:
+                raise StorageError(f"Transaction failed: {str(e)}")
+            finally:
+                self._in_transaction = False
+
+    def hold(self, *filenames: str, shard: Any = None):
+        """
+        Take SQLite's write lock now (BEGIN IMMEDIATE) - in WAL mode a deferred
+        transaction that read first would otherwise fail with SQLITE_BUSY when
+        it tries to write after another connection did
+        """
+        with self._lock:
+            if self._in_transaction and not self._conn.in_transaction:
+                try:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                except sqlite3.Error as e:
+                    raise StorageError(f"Failed to lock {', '.join(filenames)}: {str(e)}")
+
+    @staticmethod
+    def _doc(row) -> Dict[str, Any]:
+        return json.loads(row['body'])
+
+    def _insert_statement(self, filename: str, record: Dict[str, Any]):
+        if filename not in TABLES:
+            return ("INSERT INTO documents (collection, id, body) VALUES (?, ?, ?)",
+                    (filename, record.get('id'), json.dumps(record)))
+        columns = self._columns(filename, record)
+        placeholders = ', '.join('?' for _ in columns)
+        return (f"INSERT INTO {filename} ({', '.join(columns)}) VALUES ({placeholders})",
+                tuple(record.get(column) for column in columns))
+
+    def read(self, filename: str) -> List[Dict[str, Any]]:
+        """Read all records of a collection in insertion order"""
+        if filename not in TABLES:
+            rows = self._fetch(filename, "SELECT body FROM documents WHERE collection = ? ORDER BY rowid",
+                               (filename,))
+            return intern_records(filename, [self._doc(row) for row in rows])
+        rows = self._fetch(filename, f"SELECT * FROM {filename} ORDER BY rowid")
+        return intern_records(filename, [dict(row) for row in rows])
+
+    def scan(self, filename: str, after_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream a collection in rowid order, fetching `SCAN_BATCH` rows at a time"""
+        if filename not in TABLES:
+            yield from super().scan(filename, after_id)
+            return
+        position = 0
+        if after_id is not None:
+            row = self._fetch(filename, f"SELECT rowid FROM {filename} WHERE id = ?", (after_id,), one=True)
+            if row is None:
+                return
+            position = row[0]
+        fields = reference_fields(filename)
+        while True:
+            rows = self._fetch(filename, f"SELECT rowid AS _pos, * FROM {filename} WHERE rowid > ? "
+                                         f"ORDER BY rowid LIMIT ?", (position, SCAN_BATCH))
+            for row in rows:
+                record = dict(row)
+                position = record.pop('_pos')
+                yield intern_record(record, fields)
+            if len(rows) < SCAN_BATCH:
+                return
+
+    def write(self, filename: str, data: List[Dict[str, Any]]):
+        """Replace a whole collection in one transaction"""
+        if filename in TABLES:
+            statements = [(f"DELETE FROM {filename}", ())]
+        else:
+            statements = [("DELETE FROM documents WHERE collection = ?", (filename,))]
+        statements.extend(self._insert_statement(filename, record) for record in data)
+        self._modify(filename, statements)
+
+    def find_by_id(self, filename: str, id_value: str) -> Optional[Dict[str, Any]]:
+        """Find a record by ID (primary key lookup)"""
+        if filename not in TABLES:
+            row = self._fetch(filename, "SELECT body FROM documents WHERE collection = ? AND id = ?",
+                              (filename, id_value), one=True)
+            return intern_record(self._doc(row), reference_fields(filename)) if row else None
+        row = self._fetch(filename, f"SELECT * FROM {filename} WHERE id = ?", (id_value,), one=True)
+        return intern_record(dict(row), reference_fields(filename)) if row else None
+
+    def find_by_ids(self, filename: str, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Look up several records by ID with `WHERE id IN (...)` queries"""
+        ids = list(ids)
+        if filename not in TABLES:
+            return super().find_by_ids(filename, ids)
+        found = {}
+        for start in range(0, len(ids), SCAN_BATCH):  # stay under sqlite's variable limit
+            batch = ids[start:start + SCAN_BATCH]
+            placeholders = ', '.join('?' for _ in batch)
+            for row in self._fetch(filename, f"SELECT * FROM {filename} WHERE id IN ({placeholders})",
+                                   tuple(batch)):
+                found[row['id']] = dict(row)
+        return intern_records(filename, [found[id_value] for id_value in ids if id_value in found])
+
+    def find_by_field(self, filename: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Find records by field value - an index seek for the indexed columns"""
+        if filename not in TABLES:
+            return [record for record in self.read(filename) if record.get(field) == value]
+        if field not in TABLES[filename]:
+            raise StorageError(f"Unknown field for {filename}: {field}")
+        operator = "IS" if value is None else "="
+        rows = self._fetch(filename, f"SELECT * FROM {filename} WHERE {field} {operator} ? ORDER BY rowid",
+                           (value,))
+        return intern_records(filename, [dict(row) for row in rows])
+
+    def find_range(self, filename: str, field: str, low: Any = None,
+                   high: Any = None) -> List[Dict[str, Any]]:
+        """Records with low <= field < high in field order - a range seek on the time indexes"""
+        if filename not in TABLES:
+            return super().find_range(filename, field, low, high)
+        if field not in TABLES[filename]:
+            raise StorageError(f"Unknown field for {filename}: {field}")
+        conditions, params = [f"{field} IS NOT NULL"], []
+        if low is not None:
+            conditions.append(f"{field} >= ?")
+            params.append(low)
+        if high is not None:
+            conditions.append(f"{field} < ?")
+            params.append(high)
+        rows = self._fetch(filename, f"SELECT * FROM {filename} WHERE {' AND '.join(conditions)} "
+                                     f"ORDER BY {field}, rowid", tuple(params))
+        return intern_records(filename, [dict(row) for row in rows])
+
+    def create(self, filename: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new record"""
+        self._modify(filename, [self._insert_statement(filename, record)])
+        return record
+
+    def update(self, filename: str, id_value: str, updates: Dict[str, Any]) -> bool:
+        """Update a record by ID"""
+        if filename not in TABLES:
+            record = self.find_by_id(filename, id_value)
+            if record is None:
+                return False
+            record.update(updates)
+            self._modify(filename, [("UPDATE documents SET body = ? WHERE collection = ? AND id = ?",
+                                     (json.dumps(record), filename, id_value))])
+            return True
+        if not updates:
+            return self.find_by_id(filename, id_value) is not None
+        self._columns(filename, updates)
+        assignments = ', '.join(f"{key} = ?" for key in updates)
+        cursor = self._modify(filename, [(f"UPDATE {filename} SET {assignments} WHERE id = ?",
+                                          tuple(updates.values()) + (id_value,))])
+        return cursor.rowcount > 0
+
+    def delete(self, filename: str, id_value: str) -> bool:
+        """Delete a record by ID"""
+        if filename not in TABLES:
+            cursor = self._modify(filename, [("DELETE FROM documents WHERE collection = ? AND id = ?",
+                                              (filename, id_value))])
+        else:
+            cursor = self._modify(filename, [(f"DELETE FROM {filename} WHERE id = ?", (id_value,))])
+        return cursor.rowcount > 0
+
+    def close(self):
+        """Close the underlying connection"""
+        with self._lock:
+            if not self.closed:
+                self._conn.close()
+        super().close()
@@ -0,0 +1,259 @@
+import bisect
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Set
+from pathlib import Path
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.locking import FileLockManager
+from utils.exceptions import StorageError
+
+INDEX_FILE = "task_search.jsonl"
+LOCK_NAME = "task_search"
+TITLE_WEIGHT = 2  # a word in the title counts like two in the description
+PREFIX_WEIGHT = 0.5  # a prefix hit scores half of an exact one
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def task_terms(task: Dict[str, Any]) -> Dict[str, int]:
+    """Weighted term frequencies of a task's title and description"""
+    terms: Dict[str, int] = {}
+    for token in tokenize(task.get('title', '')):
+        terms[token] = terms.get(token, 0) + TITLE_WEIGHT
+    for token in tokenize(task.get('description', '')):
+        terms[token] = terms.get(token, 0) + 1
+    return terms
+
+
+class TaskSearchIndex:
+    """
+    Inverted index over task titles and descriptions
+
+    In memory: token -> {task id: weighted tf}, a sorted token list for prefix
+    lookups (bisect), and per task the fields search can filter on (board,
+    assignee, status). On disk it's an append-only db/task_search.jsonl:
+
+        {"op": "add", "id", "b": board_id, "u": user_id, "s": status, "t": {token: tf}}
+        {"op": "status", "id", "s": status}
+
+    Writers append under an exclusive lock and then read the file from where
+    they left off, so appends from other processes are picked up the same way
+    as our own. The file is rewritten compacted once it has many stale lines.
+    """
+
+    def __init__(self, db_path: str = "db", lock_timeout: float = 10.0):
+        self.db_path = Path(db_path)
+        self.db_path.mkdir(exist_ok=True)
+        self.path = self.db_path / INDEX_FILE
+        self._lock = threading.RLock()
+        self._locks = FileLockManager(self.db_path, timeout=lock_timeout)
+        self._reset()
+
+    def _reset(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.docs: Dict[str, List] = {}  # task id -> [board_id, user_id, status, terms]
+        self._vocabulary: Optional[List[str]] = []  # sorted tokens, None when it needs a rebuild
+        self._offset = 0
+        self._ino = None
+        self._lines = 0
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    # ---- applying log entries ----
+
+    def _apply(self, entry: Dict[str, Any]):
+        task_id = entry['id']
+        if entry['op'] == 'status':
+            doc = self.docs.get(task_id)
+            if doc is not None:
+                doc[2] = entry['s']
+            return
+        self._drop(task_id)
+        terms = entry['t']
+        # same shared strings as the storage engines use for these ids (storage/interning.py)
+        self.docs[task_id] = [sys.intern(entry['b']), sys.intern(entry['u']), entry['s'], terms]
+        for token, tf in terms.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                self._vocabulary = None
+            postings[task_id] = tf
+
+    def _drop(self, task_id: str):
+        doc = self.docs.pop(task_id, None)
+        if doc is None:
+            return
+        for token in doc[3]:
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(task_id, None)
+                if not postings:
+                    del self.postings[token]
+                    self._vocabulary = None
+
+    def _refresh(self):
+        """Catch up with the file - reloads it if it was rewritten, otherwise reads the new tail"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._ino is not None:
+                self._reset()
+            return
+        if st.st_ino != self._ino or st.st_size < self._offset:
+            self._reset()
+            self._ino = st.st_ino
+        if st.st_size == self._offset:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError as e:
+            raise StorageError(f"Failed to read search index: {str(e)}")
+        end = data.rfind(b'\n') + 1  # leave a half-written last line for next time
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+                self._lines += 1
+        self._offset += end
+
+    def _append(self, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        payload = b''.join((json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+                           for entry in entries)
+        with self._locks.exclusive(LOCK_NAME):
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, payload)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                raise StorageError(f"Failed to write search index: {str(e)}")
+            self._refresh()
+            if self._lines > max(1000, 2 * len(self.docs)):
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the file with one add line per task (caller holds the file lock)"""
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', dir=self.db_path, delete=False,
+                                             suffix='.tmp', encoding='utf-8') as tmp_file:
+                for task_id, (board_id, user_id, status, terms) in self.docs.items():
+                    tmp_file.write(json.dumps({"op": "add", "id": task_id, "b": board_id, "u": user_id,
+                                               "s": status, "t": terms}, separators=(',', ':')) + '\n')
+                tmp_path = tmp_file.name
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            if 'tmp_path' in locals() and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise StorageError(f"Failed to compact search index: {str(e)}")
+        self._reset()
+        self._refresh()
+
+    # ---- updates ----
+
+    def add_tasks(self, tasks: Iterable[Dict[str, Any]]):
+        """Index new (or re-index changed) tasks"""
+        entries = [{"op": "add", "id": task['id'], "b": task['board_id'], "u": task['user_id'],
+                    "s": task['status'], "t": task_terms(task)} for task in tasks]
+        with self._lock:
+            self._append(entries)
+
+    def set_statuses(self, changes: Iterable[Tuple[str, str]]):
+        """Record (task id, new status) pairs"""
+        entries = [{"op": "status", "id": task_id, "s": status} for task_id, status in changes]
+        with self._lock:
+            self._append(entries)
+
+    def rebuild(self, tasks: Iterable[Dict[str, Any]]):
+        """Index all tasks from scratch, e.g. on first use with existing data"""
+        with self._lock, self._locks.exclusive(LOCK_NAME):
+            self._reset()
+            for task in tasks:
+                self._apply({"op": "add", "id": task['id'], "b": task['board_id'], "u": task['user_id'],
+                             "s": task['status'], "t": task_terms(task)})
+            self._compact()
+
+    # ---- queries ----
+
+    def _expand(self, term: str) -> List[str]:
+        """Indexed tokens starting with `term` (bisect over the sorted vocabulary)"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, term)
+        end = bisect.bisect_left(vocabulary, term + '\U0010ffff')
+        return vocabulary[start:end]
+
+    def _matches(self, task_id: str, board_ids: Optional[Set[str]], status: Optional[str],
+                 user_id: Optional[str]) -> bool:
+        board, assignee, task_status, _ = self.docs[task_id]
+        return ((board_ids is None or board in board_ids) and
+                (status is None or task_status == status) and
+                (user_id is None or assignee == user_id))
+
+    def search(self, query: str, board_ids: Optional[Set[str]] = None, status: Optional[str] = None,
+               user_id: Optional[str] = None, limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        (task id, score) pairs, best first. Every query word has to match a
+        word of the task exactly or as a prefix; scores are tf-idf with exact
+        matches counting double.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            self._refresh()
+            total = len(self.docs) or 1
+            expanded = [(term, self._expand(term)) for term in terms]
+            # rarest term first, so the candidate set is as small as possible from the start
+            expanded.sort(key=lambda item: sum(len(self.postings[token]) for token in item[1]))
+
+            scores: Dict[str, float] = {}
+            for position, (term, tokens) in enumerate(expanded):
+                term_scores: Dict[str, float] = {}
+                for token in tokens:
+                    postings = self.postings[token]
+                    weight = math.log(1 + total / len(postings)) * (1.0 if token == term else PREFIX_WEIGHT)
+                    for task_id, tf in postings.items():
+                        if position == 0:
+                            if task_id not in term_scores and not self._matches(task_id, board_ids, status, user_id):
+                                continue
+                        elif task_id not in scores:
+                            continue
+                        term_scores[task_id] = term_scores.get(task_id, 0.0) + tf * weight
+                if position == 0:
+                    scores = term_scores
+                else:
+                    scores = {task_id: scores[task_id] + score for task_id, score in term_scores.items()}
+                if not scores:
+                    return []
+            results = [(task_id, round(score, 6)) for task_id, score in scores.items()]
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit]
+
+
+_indexes: Dict[Tuple[int, str], TaskSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_task_index(db_path: str = "db") -> TaskSearchIndex:
+    """One index per db folder per process, like storage.registry.get_storage"""
+    key = (os.getpid(), os.path.abspath(db_path))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = TaskSearchIndex(db_path)
+        return index
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import threading
+import time
+from storage.json_storage import JsonStorage
+from implementations.user_impl import UserImpl
+from implementations import async_api
+from implementations.async_api import AsyncDispatcher, AsyncUserApi
+
+
+class _Recorder:
+    """A blocking call that counts its invocations and the most running at once"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request=None):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return f"result {request}"
+
+
+def test_identical_reads_share_one_call():
+    """Concurrent reads with the same request are answered by a single call"""
+    dispatcher, fn = AsyncDispatcher(max_workers=4), _Recorder()
+
+    async def main():
+        return await asyncio.gather(*[dispatcher.read(fn, "a") for _ in range(5)], dispatcher.read(fn, "b"))
+    results = asyncio.run(main())
+    dispatcher.close()
+    assert results == ["result a"] * 5 + ["result b"]
+    assert fn.calls == 2 and dispatcher.coalesced == 4
+
+
+def test_write_starts_a_new_generation():
+    """A read issued after a write doesn't join a read that started before it"""
+    dispatcher, fn, write = AsyncDispatcher(max_workers=4), _Recorder(), _Recorder(delay=0)
+
+    async def main():
+        before = asyncio.ensure_future(dispatcher.read(fn, "a"))
+        await asyncio.sleep(0)  # let it get in flight
+        await dispatcher.write(write, "w")
+        after = await dispatcher.read(fn, "a")
+        return await before, after
+    assert asyncio.run(main()) == ("result a", "result a")
+    dispatcher.close()
+    assert fn.calls == 2 and dispatcher.coalesced == 0
+
+
+def test_max_pending_bounds_running_calls():
+    """No more than max_pending calls run at once, however many are awaited"""
+    dispatcher, fn = AsyncDispatcher(max_workers=8, max_pending=2), _Recorder(delay=0.02)
+
+    async def main():
+        return await asyncio.gather(*[dispatcher.write(fn, i) for i in range(8)])
+    assert asyncio.run(main()) == [f"result {i}" for i in range(8)]
+    dispatcher.close()
+    assert fn.calls == 8 and fn.max_running == 2
+
+
+def test_stream_matches_the_sync_output(tmp_path, monkeypatch):
+    """stream_users yields the same JSON as list_users, fetched a few chunks per hop"""
+    monkeypatch.setattr(async_api, 'STREAM_CHUNKS', 3)
+    impl = UserImpl(JsonStorage(str(tmp_path)))
+    for i in range(10):
+        impl.create_user(json.dumps({"name": f"user{i}", "display_name": f"User {i}"}))
+    users = AsyncUserApi(impl)
+
+    async def main():
+        return [chunk async for chunk in users.stream_users()], await users.list_users()
+    chunks, listed = asyncio.run(main())
+    users.dispatcher.close()
+    assert ''.join(chunks) == listed
+    assert json.loads(listed) == json.loads(impl.list_users())
@@ -0,0 +1,136 @@
+import json
+import pytest
+from storage.json_storage import JsonStorage
+from implementations.user_impl import UserImpl
+from implementations.team_impl import TeamImpl
+from utils.exceptions import ValidationError
+
+
+def _count_writes(storage):
+    """Record every collection JsonStorage writes to disk"""
+    written = []
+    persist = storage._persist
+
+    def counting(filename, collection, *args, **kwargs):
+        written.append(filename)
+        return persist(filename, collection, *args, **kwargs)
+    storage._persist = counting
+    return written
+
+
+def test_create_users_reports_per_item(tmp_path):
+    """Duplicates within the batch or with existing users, and bad types, fail only their item"""
+    storage = JsonStorage(str(tmp_path))
+    users = UserImpl(storage)
+    users.create_user(json.dumps({"name": "alice", "display_name": "Alice"}))
+    written = _count_writes(storage)
+
+    results = json.loads(users.create_users(json.dumps([
+        {"name": "bob", "display_name": "Bob"},
+        {"name": "bob", "display_name": "Bob again"},  # clashes within the batch
+        {"name": "alice", "display_name": "Alice"},  # clashes with an existing user
+        {"name": ["not", "a", "string"], "display_name": "List"},
+        {"name": "carol", "display_name": 7},
+        {"name": "carol"},
+        "not an object",
+        {"name": "carol", "display_name": "Carol"},
+    ])))
+    assert 'id' in results[0] and 'id' in results[7]
+    assert ["already exists" in r.get('error', '') for r in results[1:3]] == [True, True]
+    assert results[3] == {"error": "name must be a string"}
+    assert results[4] == {"error": "display_name must be a string"}
+    assert all('error' in r for r in results[5:7])
+    assert written == ['users']  # both new users in one commit
+    assert sorted(user['name'] for user in json.loads(users.list_users())) == ["alice", "bob", "carol"]
+
+
+def test_unique_clash_from_storage_fails_one_item(tmp_path):
+    """A name clash only the storage's unique index catches is that item's error, not the batch's"""
+    storage = JsonStorage(str(tmp_path))
+    users = UserImpl(storage)
+    users.create_user(json.dumps({"name": "alice", "display_name": "Alice"}))
+    storage.scan = lambda *args: iter(())  # the up-front name check misses alice
+
+    results = json.loads(users.create_users(json.dumps([
+        {"name": "alice", "display_name": "Alice again"},
+        {"name": "bob", "display_name": "Bob"},
+    ])))
+    assert "already exists" in results[0]['error'] and 'id' in results[1]
+    assert sorted(user['name'] for user in storage.read('users')) == ["alice", "bob"]
+
+
+def test_create_teams_reports_per_item(tmp_path):
+    """Same for teams, whose admin memberships are written in the same commit"""
+    storage = JsonStorage(str(tmp_path))
+    admin = json.loads(UserImpl(storage).create_user(json.dumps({"name": "alice", "display_name": "Alice"})))['id']
+    teams = TeamImpl(storage)
+    teams.create_team(json.dumps({"name": "core", "description": "", "admin": admin}))
+    written = _count_writes(storage)
+
+    results = json.loads(teams.create_teams(json.dumps([
+        {"name": "web", "description": "", "admin": admin},
+        {"name": "web", "description": "", "admin": admin},  # clashes within the batch
+        {"name": "core", "description": "", "admin": admin},  # clashes with an existing team
+        {"name": "ops", "description": {"a": 1}, "admin": admin},
+        {"name": "ops", "description": "", "admin": [admin]},
+        {"name": "ops", "description": "", "admin": "missing"},
+        {"name": "ops", "description": "", "admin": admin},
+    ])))
+    assert 'id' in results[0] and 'id' in results[6]
+    assert ["already exists" in r.get('error', '') for r in results[1:3]] == [True, True]
+    assert results[3] == {"error": "description must be a string"}
+    assert results[4] == {"error": "admin must be a string"}
+    assert "not found" in results[5]['error']
+    assert sorted(written) == ['team_members', 'teams']
+    assert len(storage.read('team_members')) == 3
+
+
+def test_add_tasks_reports_per_item(tmp_path, board_setup):
+    """Bad tasks (wrong types included) fail on their own, the rest land in one commit"""
+    storage = JsonStorage(str(tmp_path))
+    (_, _, boards), ids = board_setup(storage)
+    board_id, user_id = ids['board'], ids['user']
+    boards.add_task(json.dumps({"title": "old", "description": "", "user_id": user_id, "board_id": board_id}))
+    written = _count_writes(storage)
+
+    results = json.loads(boards.add_tasks(json.dumps({"board_id": board_id, "tasks": [
+        {"title": "one", "description": "", "user_id": user_id},
+        {"title": "one", "description": "", "user_id": user_id},  # clashes within the batch
+        {"title": "old", "description": "", "user_id": user_id},  # clashes with the board
+        {"title": ["one"], "description": "", "user_id": user_id},
+        {"title": "two", "description": "", "user_id": [user_id]},
+        {"title": "two", "description": "", "user_id": "missing"},
+        {"title": "two", "description": "", "user_id": user_id},
+    ]})))
+    assert 'id' in results[0] and 'id' in results[6]
+    assert ["already exists" in r.get('error', '') for r in results[1:3]] == [True, True]
+    assert results[3] == {"error": "title must be a string"}
+    assert results[4] == {"error": "user_id must be a string"}
+    assert "not found" in results[5]['error']
+    assert sorted(written) == [f'board_stats/{board_id}', 'tasks']  # only this board's counters
+    with pytest.raises(ValidationError):
+        boards.add_tasks(json.dumps({"board_id": [board_id], "tasks": []}))
+
+
+def test_update_task_statuses_reports_per_item(tmp_path, board_setup):
+    """Status updates fail per item on bad ids or statuses, and commit once"""
+    storage = JsonStorage(str(tmp_path))
+    (_, _, boards), ids = board_setup(storage)
+    board_id, user_id = ids['board'], ids['user']
+    task_id = json.loads(boards.add_task(json.dumps(
+        {"title": "one", "description": "", "user_id": user_id, "board_id": board_id})))['id']
+    written = _count_writes(storage)
+
+    results = json.loads(boards.update_task_statuses(json.dumps([
+        {"id": task_id, "status": "IN_PROGRESS"},
+        {"id": [task_id], "status": "COMPLETE"},
+        {"id": task_id, "status": ["COMPLETE"]},
+        {"id": task_id, "status": "DONE"},
+        {"id": "missing", "status": "COMPLETE"},
+    ])))
+    assert results[0] == {"status": "success"}
+    assert results[1] == {"error": "id must be a string"}
+    assert results[2] == {"error": "status must be a string"}
+    assert all('error' in r for r in results[3:])
+    assert sorted(written) == [f'board_stats/{board_id}', 'tasks']  # only this board's counters
+    assert json.loads(boards.get_board_summary(json.dumps({"id": board_id})))['in_progress'] == 1
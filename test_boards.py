@@ -0,0 +1,124 @@
+import json
+import multiprocessing
+import threading
+import pytest
+from storage.json_storage import JsonStorage
+from implementations.project_board_impl import ProjectBoardImpl
+from utils.exceptions import ConstraintError, StorageError
+
+
+def _add(boards, board_id, user_id, title):
+    return json.loads(boards.add_task(json.dumps(
+        {"title": title, "description": "", "user_id": user_id, "board_id": board_id})))['id']
+
+
+def _summary(boards, board_id):
+    summary = json.loads(boards.get_board_summary(json.dumps({"id": board_id})))
+    return {key: summary[key] for key in ('open', 'in_progress', 'complete', 'total')}
+
+
+def test_counters_follow_task_writes(tmp_path, board_setup):
+    """add_task, add_tasks and both status updates keep board_stats in step with the tasks"""
+    (_, _, boards), ids = board_setup(JsonStorage(str(tmp_path)))
+    board_id, user_id = ids['board'], ids['user']
+    first = _add(boards, board_id, user_id, "first")
+    added = json.loads(boards.add_tasks(json.dumps({"board_id": board_id, "tasks": [
+        {"title": "second", "description": "", "user_id": user_id},
+        {"title": "first", "description": "", "user_id": user_id},  # duplicate, not counted
+        {"title": "third", "description": "", "user_id": user_id},
+    ]})))
+    assert _summary(boards, board_id) == {"open": 3, "in_progress": 0, "complete": 0, "total": 3}
+
+    boards.update_task_status(json.dumps({"id": first, "status": "IN_PROGRESS"}))
+    boards.update_task_status(json.dumps({"id": first, "status": "IN_PROGRESS"}))  # no change
+    json.loads(boards.update_task_statuses(json.dumps([
+        {"id": added[0]['id'], "status": "COMPLETE"},
+        {"id": added[2]['id'], "status": "COMPLETE"},
+        {"id": added[2]['id'], "status": "IN_PROGRESS"},  # same task twice in one batch
+        {"id": "missing", "status": "COMPLETE"},
+    ])))
+    assert _summary(boards, board_id) == {"open": 0, "in_progress": 2, "complete": 1, "total": 3}
+
+
+def test_counters_backfilled_for_old_boards(tmp_path, board_setup):
+    """A board without a board_stats record gets one built from its tasks"""
+    storage = JsonStorage(str(tmp_path))
+    (_, _, boards), ids = board_setup(storage)
+    board_id, user_id = ids['board'], ids['user']
+    task_id = _add(boards, board_id, user_id, "one")
+    _add(boards, board_id, user_id, "two")
+    boards.update_task_status(json.dumps({"id": task_id, "status": "COMPLETE"}))
+    storage.delete('board_stats', board_id)  # as if the board predated the counters
+
+    assert _summary(boards, board_id) == {"open": 1, "in_progress": 0, "complete": 1, "total": 2}
+    _add(boards, board_id, user_id, "three")
+    assert _summary(boards, board_id)['total'] == 3
+
+
+def test_close_board_checks_the_counters(tmp_path, board_setup):
+    """close_board refuses while the counters show unfinished tasks, and reads nothing else"""
+    storage = JsonStorage(str(tmp_path))
+    (_, _, boards), ids = board_setup(storage)
+    board_id, user_id = ids['board'], ids['user']
+    task_id = _add(boards, board_id, user_id, "only")
+    with pytest.raises(ConstraintError):
+        boards.close_board(json.dumps({"id": board_id}))
+
+    boards.update_task_status(json.dumps({"id": task_id, "status": "COMPLETE"}))
+    storage.update('board_stats', board_id, {"complete": 0})  # counters say otherwise
+    with pytest.raises(ConstraintError):
+        boards.close_board(json.dumps({"id": board_id}))
+
+    storage.update('board_stats', board_id, {"complete": 1})
+    assert json.loads(boards.close_board(json.dumps({"id": board_id}))) == {"status": "success"}
+
+
+def test_counters_lock_one_board(tmp_path, board_setup):
+    """A transaction holding one board's counters doesn't block task writes to another board"""
+    sharded = {'tasks': 'board_id'}
+    (_, _, boards), ids = board_setup(JsonStorage(str(tmp_path), shards=sharded))
+    board_id, user_id = ids['board'], ids['user']
+    other_id = json.loads(boards.create_board(json.dumps(
+        {"name": "other", "description": "", "team_id": ids['team']})))['id']
+    held, done = threading.Event(), threading.Event()
+
+    def hold_board():
+        storage = JsonStorage(str(tmp_path), shards=sharded)
+        with storage.transaction():
+            ProjectBoardImpl(storage)._hold_counters(board_id)
+            held.set()
+            done.wait(10)
+    holder = threading.Thread(target=hold_board)
+    holder.start()
+    try:
+        held.wait(10)
+        other = ProjectBoardImpl(JsonStorage(str(tmp_path), shards=sharded, lock_timeout=0.3))
+        _add(other, other_id, user_id, "elsewhere")
+        with pytest.raises(StorageError):
+            _add(other, board_id, user_id, "blocked")
+    finally:
+        done.set()
+        holder.join()
+    assert _summary(boards, other_id)['total'] == 1 and _summary(boards, board_id)['total'] == 0
+
+
+def _add_many(db_path, board_id, user_id, prefix):
+    boards = ProjectBoardImpl(JsonStorage(db_path))
+    for i in range(15):
+        task_id = _add(boards, board_id, user_id, f"{prefix}-{i}")
+        if i % 3 == 0:
+            boards.update_task_status(json.dumps({"id": task_id, "status": "COMPLETE"}))
+
+
+def test_counters_survive_concurrent_processes(tmp_path, board_setup):
+    """Processes adding and completing tasks on one board don't lose counter updates"""
+    (_, _, boards), ids = board_setup(JsonStorage(str(tmp_path)))
+    board_id, user_id = ids['board'], ids['user']
+    workers = [multiprocessing.Process(target=_add_many, args=(str(tmp_path), board_id, user_id, name))
+               for name in ("a", "b", "c")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert _summary(boards, board_id) == {"open": 30, "in_progress": 0, "complete": 15, "total": 45}
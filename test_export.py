@@ -0,0 +1,117 @@
+import json
+import os
+import pytest
+from storage.json_storage import JsonStorage
+from implementations.board_export import fingerprint, RENDER_VERSION
+from utils.exceptions import ValidationError, NotFoundError
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch, board_setup):
+    """A board with two tasks, exports going to tmp_path/out - gives (apis, ids)"""
+    monkeypatch.chdir(tmp_path)
+    (users, teams, boards), ids = board_setup(JsonStorage(str(tmp_path / 'db')))
+    ids['tasks'] = [json.loads(boards.add_task(json.dumps(
+        {"title": title, "description": "", "user_id": ids['user'], "board_id": ids['board']})))['id']
+        for title in ("one", "two")]
+    return (users, teams, boards), ids
+
+
+def _export(boards, team_id):
+    return json.loads(boards.export_team_boards(json.dumps({"id": team_id, "executor": "thread"})))
+
+
+def test_fingerprint_matches_the_canonical_json():
+    """The incremental hash equals sha1 of the canonical JSON of all the inputs"""
+    import hashlib
+    board = {"id": "b1", "name": "Sprint", "status": "OPEN"}
+    tasks = [{"id": "t1", "title": "é", "status": "OPEN"}, {"status": "COMPLETE", "id": "t2", "title": "x"}]
+    payload = json.dumps([RENDER_VERSION, 'csv', board, "Core", tasks, {"u1": "Alice"}],
+                         sort_keys=True, separators=(',', ':'))
+    assert fingerprint(board, "Core", tasks, {"u1": "Alice"}, 'csv') == hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    assert fingerprint(board, "Core", [], {}) != fingerprint(board, "Core", tasks[:1], {})
+
+
+def test_unchanged_board_is_not_rewritten(tmp_path, setup):
+    """A second export of an unchanged board reports cached and leaves the file alone"""
+    (_, _, boards), ids = setup
+    first = _export(boards, ids['team'])['files'][0]
+    path = tmp_path / 'out' / first['out_file']
+    stat = os.stat(path)
+
+    second = _export(boards, ids['team'])
+    assert second['cached'] == 1 and second['files'][0]['cached'] is True
+    assert second['files'][0]['fingerprint'] == first['fingerprint']
+    assert os.stat(path).st_ino == stat.st_ino and os.stat(path).st_mtime_ns == stat.st_mtime_ns
+
+
+def test_changes_re_render(tmp_path, setup):
+    """A task, the team name, an assignee's display name or a deleted file all cause a re-render"""
+    (users, teams, boards), ids = setup
+    fingerprints = [_export(boards, ids['team'])['files'][0]['fingerprint']]
+
+    changes = [
+        lambda: boards.update_task_status(json.dumps({"id": ids['tasks'][0], "status": "COMPLETE"})),
+        lambda: teams.update_team(json.dumps({"id": ids['team'], "team": {"name": "platform"}})),
+        lambda: users.update_user(json.dumps({"id": ids['user'], "user": {"display_name": "Alice B"}})),
+    ]
+    for change in changes:
+        change()
+        result = _export(boards, ids['team'])['files'][0]
+        assert result['cached'] is False
+        fingerprints.append(result['fingerprint'])
+    assert len(set(fingerprints)) == 4
+    assert "Alice B" in (tmp_path / 'out' / result['out_file']).read_text()
+
+    os.remove(tmp_path / 'out' / result['out_file'])
+    again = _export(boards, ids['team'])['files'][0]
+    assert again['cached'] is False and again['fingerprint'] == fingerprints[-1]
+    assert (tmp_path / 'out' / again['out_file']).exists()
+
+
+def _more_boards(boards, ids, count):
+    """Extra boards with a task each, so the pools have several jobs"""
+    for i in range(count):
+        board_id = json.loads(boards.create_board(json.dumps(
+            {"name": f"extra {i}", "description": "", "team_id": ids['team']})))['id']
+        boards.add_task(json.dumps({"title": "task", "description": "", "user_id": ids['user'],
+                                    "board_id": board_id}))
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_bulk_export_manifest(tmp_path, setup, executor):
+    """Both executors write every board and return the documented manifest"""
+    (_, _, boards), ids = setup
+    _more_boards(boards, ids, 3)
+    manifest = json.loads(boards.export_team_boards(json.dumps(
+        {"id": ids['team'], "executor": executor, "workers": 2, "format": "csv"})))
+
+    assert set(manifest) == {"files", "format", "executor", "workers", "cached", "load_seconds", "total_seconds"}
+    assert (manifest['format'], manifest['executor'], manifest['workers'], manifest['cached']) == \
+        ("csv", executor, 2, 0)
+    assert 0 <= manifest['load_seconds'] <= manifest['total_seconds']
+    assert len(manifest['files']) == 4
+    for entry in manifest['files']:
+        assert set(entry) == {"board_id", "format", "out_file", "fingerprint", "cached", "seconds"}
+        assert entry['out_file'].endswith('.csv') and (tmp_path / 'out' / entry['out_file']).exists()
+        assert entry['seconds'] >= 0
+    saved = json.loads((tmp_path / 'out' / '.export_manifest.json').read_text())
+    assert sorted(saved) == sorted(f"{entry['board_id']}/csv" for entry in manifest['files'])
+
+    everything = json.loads(boards.export_all_boards(json.dumps({"executor": executor, "format": "csv"})))
+    assert everything['cached'] == 4
+
+
+def test_bulk_export_validation(tmp_path, setup):
+    """Bad formats, executors and worker counts are rejected before anything is exported"""
+    (_, _, boards), ids = setup
+    for options in ({"format": "pdf"}, {"executor": "fork"}, {"workers": 0}, {"workers": -1},
+                    {"workers": "2"}, {"workers": True}, {"workers": None}):
+        with pytest.raises(ValidationError):
+            boards.export_team_boards(json.dumps({"id": ids['team'], **options}))
+        with pytest.raises(ValidationError):
+            boards.export_all_boards(json.dumps(options))
+    with pytest.raises(NotFoundError):
+        boards.export_team_boards(json.dumps({"id": "missing"}))
+    assert not list((tmp_path / 'out').glob('board_*'))
+    assert json.loads(boards.export_team_boards(json.dumps({"id": ids['team']})))['workers'] >= 1
@@ -0,0 +1,112 @@
+import json
+import pytest
+from storage.json_storage import JsonStorage
+from storage.jsonl_storage import JsonLinesStorage
+from storage.sqlite_storage import SqliteStorage
+from implementations.user_impl import UserImpl
+from implementations.team_impl import TeamImpl
+from implementations.project_board_impl import ProjectBoardImpl
+from utils.exceptions import ValidationError
+
+ENGINES = {
+    'json': lambda path: JsonStorage(str(path)),
+    'json_cached': lambda path: JsonStorage(str(path), cache=True),  # as the registry builds it
+    'jsonl': lambda path: JsonLinesStorage(str(path)),
+    'sqlite': lambda path: SqliteStorage(str(path)),
+}
+
+
+def _pages(list_call, limit):
+    """Follow next_cursor to the end, returns every page's items"""
+    pages, request = [], {"limit": limit}
+    while True:
+        page = json.loads(list_call(json.dumps(request)))
+        pages.append(page['items'])
+        if page['next_cursor'] is None:
+            return pages
+        request = {"limit": limit, "cursor": page['next_cursor']}
+
+
+def _users(storage, count):
+    users = UserImpl(storage)
+    return users, [json.loads(users.create_user(json.dumps(
+        {"name": f"user{i}", "display_name": f"User {i}"})))['id'] for i in range(count)]
+
+
+@pytest.fixture(params=sorted(ENGINES))
+def storage(request, tmp_path):
+    return ENGINES[request.param](tmp_path)
+
+
+def test_list_users_pages_and_stream(storage):
+    """Pages cover every user once, in order, and match the unpaged list and the stream"""
+    users, _ = _users(storage, 5)
+    everyone = json.loads(users.list_users())
+    pages = _pages(users.list_users, 2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [user for page in pages for user in page] == everyone
+    assert json.loads(''.join(users.stream_users())) == everyone
+
+    with pytest.raises(ValidationError):
+        users.list_users(json.dumps({"limit": 0}))
+    with pytest.raises(ValidationError):
+        users.list_users(json.dumps({"limit": 2, "cursor": "not a cursor!"}))
+
+
+def test_list_users_cursor_survives_updates(storage):
+    """Updating users between pages (the cursor's own one included) doesn't move the cursor"""
+    users, ids = _users(storage, 5)
+    first = json.loads(users.list_users(json.dumps({"limit": 2})))
+    for user_id in ids[:2]:
+        users.update_user(json.dumps({"id": user_id, "user": {"display_name": "Renamed"}}))
+    second = json.loads(users.list_users(json.dumps({"limit": 2, "cursor": first['next_cursor']})))
+    assert [user['name'] for user in second['items']] == ["user2", "user3"]
+    third = json.loads(users.list_users(json.dumps({"limit": 2, "cursor": second['next_cursor']})))
+    assert [user['name'] for user in third['items']] == ["user4"] and third['next_cursor'] is None
+
+
+def test_list_teams_pages_and_stream(storage):
+    """list_teams pages the same way as list_users"""
+    _, user_ids = _users(storage, 1)
+    teams = TeamImpl(storage)
+    for i in range(3):
+        teams.create_team(json.dumps({"name": f"team{i}", "description": "", "admin": user_ids[0]}))
+    everyone = json.loads(teams.list_teams())
+    assert [team for page in _pages(teams.list_teams, 2) for team in page] == everyone
+    assert json.loads(''.join(teams.stream_teams())) == everyone
+
+
+def test_list_boards_resumes_after_a_closed_board(storage):
+    """Closing the board a cursor points at doesn't lose the boards after it"""
+    _, user_ids = _users(storage, 1)
+    team_id = json.loads(TeamImpl(storage).create_team(json.dumps(
+        {"name": "core", "description": "", "admin": user_ids[0]})))['id']
+    boards = ProjectBoardImpl(storage)
+    board_ids = [json.loads(boards.create_board(json.dumps(
+        {"name": f"b{i}", "description": "", "team_id": team_id})))['id'] for i in range(5)]
+
+    first = json.loads(boards.list_boards(json.dumps({"id": team_id, "limit": 2})))
+    assert [board['name'] for board in first['items']] == ["b0", "b1"]
+    boards.close_board(json.dumps({"id": board_ids[1]}))
+    second = json.loads(boards.list_boards(json.dumps(
+        {"id": team_id, "limit": 2, "cursor": first['next_cursor']})))
+    assert [board['name'] for board in second['items']] == ["b2", "b3"]
+
+    open_boards = json.loads(boards.list_boards(json.dumps({"id": team_id})))
+    assert [board['name'] for board in open_boards] == ["b0", "b2", "b3", "b4"]
+    assert json.loads(''.join(boards.stream_boards(json.dumps({"id": team_id})))) == open_boards
+    assert [board for page in _pages(lambda request: boards.list_boards(
+        json.dumps({"id": team_id, **json.loads(request)})), 3) for board in page] == open_boards
+
+
+def test_json_scan_seeks_without_copying(tmp_path):
+    """JsonStorage.scan resumes after an id, sharded or not, and misses give nothing"""
+    for storage in (JsonStorage(str(tmp_path / 'flat')),
+                    JsonStorage(str(tmp_path / 'sharded'), shards={'tasks': 'board_id'})):
+        storage.write('tasks', [{"id": f"t{i}", "board_id": f"b{i % 2}"} for i in range(6)])
+        order = [task['id'] for task in storage.read('tasks')]
+        assert [task['id'] for task in storage.scan('tasks')] == order
+        assert [task['id'] for task in storage.scan('tasks', order[2])] == order[3:]
+        assert list(storage.scan('tasks', 'missing')) == []
+        storage.delete('tasks', order[0])
+        assert [task['id'] for task in storage.scan('tasks', order[1])] == order[2:]
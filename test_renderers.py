@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import pytest
+from implementations.board_export import write_board
+from implementations.board_renderers import RENDERERS
+
+BOARD = {"id": "b1234567-aaaa", "name": "Sprint 12", "team_id": "t1", "status": "CLOSED",
+         "description": "A description long enough to wrap over more than one line of the box "
+                        "drawn around the text export, with_underscores and *stars*",
+         "creation_time": "2024-01-31T12:00:00.123456", "end_time": "2024-02-14T09:30:00.000001"}
+USER_NAMES = {"u1": "Alice", "u2": "A display name longer than fourteen"}
+TASKS = [
+    {"id": "t1", "title": "Open task", "description": "first", "status": "OPEN",
+     "user_id": "u1", "board_id": BOARD['id'], "creation_time": "2024-01-31T12:01:00"},
+    {"id": "t2", "title": "Blocked, an unknown status", "description": "", "status": "BLOCKED",
+     "user_id": "u2", "board_id": BOARD['id'], "creation_time": "2024-01-31T12:02:00"},
+    {"id": "t3", "title": "A title that is well over the forty characters the box allows",
+     "description": "has, commas and \"quotes\"\nand a newline", "status": "IN_PROGRESS",
+     "user_id": "gone", "board_id": BOARD['id'], "creation_time": "2024-01-31T12:03:00"},
+    {"id": "t4", "title": "Done_task", "description": "", "status": "COMPLETE",
+     "user_id": "u1", "board_id": BOARD['id'], "creation_time": "2024-01-31T12:04:00"},
+]
+
+
+def _legacy_text(board, team_name, tasks, user_map):
+    """The text export as export_board built it before the renderers existed"""
+    open_tasks, in_progress_tasks, complete_tasks = [], [], []
+    for task in tasks:
+        task_info = {'title': task['title'], 'user': user_map.get(task['user_id'], 'Unassigned')}
+        if task['status'] == 'OPEN':
+            open_tasks.append(task_info)
+        elif task['status'] == 'IN_PROGRESS':
+            in_progress_tasks.append(task_info)
+        else:
+            complete_tasks.append(task_info)
+    output = ["╔" + "═" * 60 + "╗", f"║{' BOARD: ' + board['name']:^60}║",
+              f"║{' Team: ' + team_name:^60}║", f"║{' Status: ' + board['status']:^60}║",
+              "╠" + "═" * 60 + "╣", f"║{' Description:':60}║"]
+    desc_line = ""
+    for word in board['description'].split():
+        if len(desc_line) + len(word) + 1 <= 58:
+            desc_line += word + " "
+        else:
+            output.append(f"║ {desc_line:<58} ║")
+            desc_line = word + " "
+    if desc_line:
+        output.append(f"║ {desc_line:<58} ║")
+    output.append("╠" + "═" * 60 + "╣")
+    if open_tasks:
+        output.append(f"║ {'OPEN (' + str(len(open_tasks)) + ')':58} ║")
+        for task in open_tasks:
+            output.append(f"║  • {task['title'][:40]:<40} ({task['user'][:14]:<14}) ║")
+        output.append("║" + " " * 60 + "║")
+    if in_progress_tasks:
+        output.append(f"║ {'IN PROGRESS (' + str(len(in_progress_tasks)) + ')':58} ║")
+        for task in in_progress_tasks:
+            output.append(f"║  ◐ {task['title'][:40]:<40} ({task['user'][:14]:<14}) ║")
+        output.append("║" + " " * 60 + "║")
+    if complete_tasks:
+        output.append(f"║ {'COMPLETE (' + str(len(complete_tasks)) + ')':58} ║")
+        for task in complete_tasks:
+            output.append(f"║  ✓ {task['title'][:40]:<40} ({task['user'][:14]:<14}) ║")
+    output.append("╠" + "═" * 60 + "╣")
+    output.append(f"║ Created: {board['creation_time'][:19]:58} ║")
+    if board.get('end_time'):
+        output.append(f"║ Closed: {board['end_time'][:19]:58} ║")
+    output.append("╚" + "═" * 60 + "╝")
+    return '\n'.join(output)
+
+
+def _render(tmp_path, fmt, board=BOARD, tasks=TASKS):
+    filename = write_board(str(tmp_path), board, "Core", tasks, USER_NAMES, fmt)
+    assert filename.endswith('.' + RENDERERS[fmt].extension)
+    return (tmp_path / filename).read_bytes()
+
+
+@pytest.mark.parametrize("tasks", [TASKS, TASKS[:1], TASKS[2:3], TASKS[3:], []])
+def test_text_matches_the_legacy_export(tmp_path, tasks):
+    """The text renderer writes exactly the bytes the original export_board did"""
+    board = {key: value for key, value in BOARD.items() if key != 'end_time' or tasks}
+    expected = _legacy_text(board, "Core", tasks, USER_NAMES).encode('utf-8')
+    assert _render(tmp_path, 'text', board, tasks) == expected
+
+
+def test_json_export_has_every_task(tmp_path):
+    """JSON output parses back to the board, the team and every task with its assignee"""
+    data = json.loads(_render(tmp_path, 'json'))
+    assert data['board'] == BOARD and data['team'] == "Core"
+    assert [task['id'] for task in data['tasks']] == ["t1", "t2", "t3", "t4"]
+    assert [task['user'] for task in data['tasks']] == ["Alice", USER_NAMES['u2'], "Unassigned", "Alice"]
+    assert data['tasks'][1]['status'] == "BLOCKED"  # kept as stored
+
+
+def test_csv_export_has_every_task(tmp_path):
+    """CSV output has the header plus one row per task, quoting commas and newlines"""
+    rows = list(csv.DictReader(io.StringIO(_render(tmp_path, 'csv').decode('utf-8'), newline='')))
+    assert [row['task_id'] for row in rows] == ["t1", "t2", "t3", "t4"]
+    assert rows[2]['description'] == TASKS[2]['description']
+    assert rows[2]['user'] == "Unassigned" and rows[0]['team'] == "Core"
+    assert all(row['board_id'] == BOARD['id'] for row in rows)
+
+
+def test_markdown_export_groups_by_status(tmp_path):
+    """Markdown lists every task under its status; unknown statuses count as complete"""
+    text = _render(tmp_path, 'markdown').decode('utf-8')
+    sections = {}
+    for block in text.split("\n## ")[1:]:
+        heading, _, body = block.partition("\n\n")
+        sections[heading] = [line for line in body.splitlines() if line.startswith("- [")]
+    assert list(sections) == ["Open (1)", "In Progress (1)", "Complete (2)"]
+    assert sections["Open (1)"] == ["- [ ] Open task (Alice)"]
+    assert sections["Complete (2)"] == [f"- [x] Blocked, an unknown status ({USER_NAMES['u2']})",
+                                        "- [x] Done\\_task (Alice)"]
+    assert text.startswith("# Sprint 12\n") and "\\*stars\\*" in text and "- **Closed:** 2024-02-14T09:30:00" in text
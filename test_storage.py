@@ -0,0 +1,466 @@
+import json
+import os
+from storage.json_storage import JsonStorage
+
+
+def test_cache_serves_repeat_reads(tmp_path):
+    """Cached reads should not re-parse an unchanged file"""
+    storage = JsonStorage(str(tmp_path), cache=True)
+    storage.create('users', {"id": "u1", "name": "john_doe"})
+
+    # write-through: the create above already populated the cache
+    assert storage.find_by_id('users', 'u1')['name'] == "john_doe"
+    assert 'users' in storage._cache
+
+
+def test_cache_sees_other_writers(tmp_path):
+    """Another process replacing the file must invalidate our copy"""
+    storage = JsonStorage(str(tmp_path), cache=True)
+    storage.create('users', {"id": "u1", "name": "john_doe"})
+
+    # simulate a different process doing its own atomic rewrite
+    other = JsonStorage(str(tmp_path))
+    other.update('users', 'u1', {"name": "jane_smith"})
+
+    assert storage.find_by_id('users', 'u1')['name'] == "jane_smith"
+
+
+def test_cached_records_survive_caller_mutation(tmp_path):
+    """Mutating a returned list must not leak into the cache"""
+    storage = JsonStorage(str(tmp_path), cache=True)
+    storage.create('users', {"id": "u1", "name": "john_doe"})
+
+    data = storage.read('users')
+    data.append({"id": "u2", "name": "ghost"})
+
+    assert len(storage.read('users')) == 1
+    with open(os.path.join(str(tmp_path), 'users.json')) as f:
+        assert len(json.load(f)) == 1
+
+
+def test_journal_replays_after_reopen(tmp_path):
+    """State must be rebuilt from snapshot + journal on a fresh engine"""
+    from storage.journal_storage import JournalStorage
+    storage = JournalStorage(str(tmp_path), compact_every=3)
+    for i in range(5):
+        storage.create('tasks', {"id": f"t{i}", "status": "OPEN"})
+    storage.update('tasks', 't1', {"status": "COMPLETE"})
+    storage.delete('tasks', 't4')
+    storage.create('team_members', {"team_id": "a", "user_id": "b"})
+
+    reopened = JournalStorage(str(tmp_path))
+    assert [t['id'] for t in reopened.read('tasks')] == ['t0', 't1', 't2', 't3']
+    assert reopened.find_by_id('tasks', 't1')['status'] == "COMPLETE"
+    assert reopened.find_by_field('team_members', 'team_id', 'a') == [{"team_id": "a", "user_id": "b"}]
+
+    # writes from the first engine are visible to the second without reopening
+    storage.create('tasks', {"id": "t9", "status": "OPEN"})
+    assert reopened.find_by_id('tasks', 't9') is not None
+
+
+def test_sqlite_backend_roundtrip(tmp_path):
+    """SqliteStorage must behave like the JSON engine for the app's collections"""
+    from storage.sqlite_storage import SqliteStorage
+    storage = SqliteStorage(str(tmp_path))
+    storage.create('tasks', {"id": "t1", "title": "a", "description": "", "user_id": "u1",
+                             "board_id": "b1", "status": "OPEN", "creation_time": "2024-01-01"})
+    storage.create('team_members', {"team_id": "team1", "user_id": "u1"})
+
+    assert storage.update('tasks', 't1', {"status": "COMPLETE"})
+    assert storage.find_by_field('tasks', 'board_id', 'b1')[0]['status'] == "COMPLETE"
+    assert storage.find_by_field('team_members', 'user_id', 'u1') == [{"team_id": "team1", "user_id": "u1"}]
+    assert storage.delete('tasks', 't1')
+    assert storage.find_by_id('tasks', 't1') is None
+    storage.close()
+
+
+def test_indexes_track_mutations(tmp_path):
+    """Secondary indexes must follow create/update/delete and enforce uniqueness"""
+    from utils.exceptions import UniqueConstraintError
+    storage = JsonStorage(str(tmp_path), cache=True)
+    storage.create('tasks', {"id": "t1", "board_id": "b1"})
+    storage.create('tasks', {"id": "t2", "board_id": "b1"})
+    storage.update('tasks', 't2', {"board_id": "b2"})
+    storage.delete('tasks', 't1')
+
+    assert storage.find_by_field('tasks', 'board_id', 'b1') == []
+    assert [t['id'] for t in storage.find_by_field('tasks', 'board_id', 'b2')] == ['t2']
+
+    storage.create('users', {"id": "u1", "name": "john_doe"})
+    try:
+        storage.create('users', {"id": "u2", "name": "john_doe"})
+        assert False, "duplicate name was accepted"
+    except UniqueConstraintError:
+        pass
+    assert len(storage.read('users')) == 1
+
+
+def test_index_order_survives_updates(tmp_path):
+    """Updated records keep their insertion-order place in the indexes, cached or not"""
+    cached, fresh = JsonStorage(str(tmp_path), cache=True), JsonStorage(str(tmp_path))
+    for i in range(4):
+        cached.create('boards', {"id": f"b{i}", "team_id": "t1" if i != 2 else "t2",
+                                 "creation_time": "2024-01-01", "status": "OPEN"})
+    assert [b['id'] for b in cached.find_by_field('boards', 'team_id', 't1')] == ['b0', 'b1', 'b3']
+    cached.update('boards', 'b0', {"status": "CLOSED"})
+    cached.update('boards', 'b2', {"team_id": "t1"})
+    cached.update('boards', 'b1', {"creation_time": "2024-01-02"})
+    cached.update('boards', 'b1', {"creation_time": "2024-01-01"})
+
+    for storage in (cached, fresh):
+        assert [b['id'] for b in storage.find_by_field('boards', 'team_id', 't1')] == ['b0', 'b1', 'b2', 'b3']
+        assert [b['id'] for b in storage.find_range('boards', 'creation_time')] == ['b0', 'b1', 'b2', 'b3']
+
+
+def test_transaction_commits_once_and_rolls_back(tmp_path):
+    """All engines: a failing block writes nothing, a good one writes everything"""
+    from storage.journal_storage import JournalStorage
+    from storage.sqlite_storage import SqliteStorage
+    engines = [JsonStorage(str(tmp_path / 'json')), JsonStorage(str(tmp_path / 'cached'), cache=True),
+               JournalStorage(str(tmp_path / 'journal')), SqliteStorage(str(tmp_path / 'sqlite'))]
+    for storage in engines:
+        try:
+            with storage.transaction():
+                storage.create('teams', {"id": "t1", "name": "a", "description": "",
+                                         "admin": "u1", "creation_time": ""})
+                storage.create('team_members', {"team_id": "t1", "user_id": "u1"})
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert storage.read('teams') == [] and storage.read('team_members') == []
+
+        with storage.transaction():
+            storage.create('teams', {"id": "t1", "name": "a", "description": "",
+                                     "admin": "u1", "creation_time": ""})
+            storage.create('team_members', {"team_id": "t1", "user_id": "u1"})
+            # reads inside the block see the staged changes
+            assert storage.find_by_id('teams', 't1') is not None
+        assert len(storage.find_by_field('team_members', 'team_id', 't1')) == 1
+
+
+def test_update_and_delete_check_under_the_lock(tmp_path):
+    """A record deleted by another writer after we read it is reported missing, not resurrected"""
+    for shards in (None, {'tasks': 'board_id'}):
+        path = tmp_path / ('sharded' if shards else 'flat')
+        storage, other = JsonStorage(str(path), shards=shards), JsonStorage(str(path), shards=shards)
+        storage.create('tasks', {"id": "t1", "board_id": "b1", "status": "OPEN"})
+        storage.create('tasks', {"id": "t2", "board_id": "b1", "status": "OPEN"})
+        with storage.transaction():
+            assert storage.find_by_id('tasks', 't1') and storage.find_by_id('tasks', 't2')
+            other.delete('tasks', 't1')
+            other.delete('tasks', 't2')
+            assert storage.delete('tasks', 't2') is False
+            assert storage.update('tasks', 't1', {"status": "COMPLETE"}) is False
+        assert other.read('tasks') == []
+
+
+def test_sharded_tasks(tmp_path):
+    """Sharded mode keeps one file per board and still finds records by id"""
+    flat = JsonStorage(str(tmp_path))
+    flat.create('tasks', {"id": "t0", "board_id": "b0", "status": "OPEN"})
+
+    storage = JsonStorage(str(tmp_path), cache=True, shards={'tasks': 'board_id'})
+    storage.create('tasks', {"id": "t1", "board_id": "b1", "status": "OPEN"})
+    storage.create('tasks', {"id": "t2", "board_id": "b2", "status": "OPEN"})
+    storage.update('tasks', 't1', {"status": "COMPLETE"})
+
+    assert sorted(p.name for p in (tmp_path / 'tasks').glob('*.json')) == \
+        ['b0.json', 'b1.json', 'b2.json']
+    assert storage.find_by_id('tasks', 't0')['board_id'] == "b0"  # migrated from tasks.json
+    assert storage.find_by_id('tasks', 't1')['status'] == "COMPLETE"
+    assert [t['id'] for t in storage.find_by_field('tasks', 'board_id', 'b2')] == ['t2']
+    assert storage.delete('tasks', 't2')
+    assert storage.find_by_id('tasks', 't2') is None
+    assert len(storage.read('tasks')) == 2
+
+
+def test_failed_shard_migration_runs_again(tmp_path):
+    """A flat file whose split failed is split again on the next use, not skipped"""
+    from utils.exceptions import StorageError
+    JsonStorage(str(tmp_path)).create('tasks', {"id": "t0", "board_id": "b0"})
+    storage = JsonStorage(str(tmp_path), shards={'tasks': 'board_id'})
+    persist = storage._persist
+
+    def failing(*args, **kwargs):
+        raise StorageError("disk full")
+    storage._persist = failing
+    try:
+        storage.find_by_id('tasks', 't0')
+        assert False, "the failed split was not reported"
+    except StorageError:
+        pass
+    storage._persist = persist
+    assert storage.find_by_id('tasks', 't0')['board_id'] == "b0"
+    assert not (tmp_path / 'tasks.json').exists()
+
+
+def test_shard_locator_is_appended_to(tmp_path):
+    """A sharded create appends to the id -> shard log instead of rewriting it"""
+    storage = JsonStorage(str(tmp_path), shards={'tasks': 'board_id'})
+    storage.write('tasks', [{"id": f"t{i}", "board_id": f"b{i % 3}"} for i in range(30)])
+    locator = tmp_path / 'tasks' / '_locator.jsonl'
+    inode, size = locator.stat().st_ino, locator.stat().st_size
+
+    storage.create('tasks', {"id": "new", "board_id": "b1"})
+    storage.update('tasks', 't0', {"board_id": "b2"})  # moves shards
+    storage.delete('tasks', 't1')
+    assert locator.stat().st_ino == inode and locator.stat().st_size > size
+    assert len(locator.read_text().splitlines()) == 33
+
+    other = JsonStorage(str(tmp_path), shards={'tasks': 'board_id'})  # e.g. another process
+    assert other.find_by_id('tasks', 'new')['board_id'] == "b1"
+    assert other.find_by_id('tasks', 't0')['board_id'] == "b2"
+    assert other.find_by_id('tasks', 't1') is None
+    # a stale hint only costs a scan of the shards
+    storage.delete('tasks', 'new')
+    storage.create('tasks', {"id": "new", "board_id": "b0"})
+    locator.write_text('{"op":"set","id":"new","shard":"b1"}\n')
+    assert JsonStorage(str(tmp_path), shards={'tasks': 'board_id'}).find_by_id('tasks', 'new')['board_id'] == "b0"
+
+
+def _create_many(db_path, prefix):
+    storage = JsonStorage(db_path, cache=True)
+    for i in range(40):
+        storage.create('tasks', {"id": f"{prefix}{i}", "board_id": "b1"})
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    """Two processes doing read-modify-write on one collection must serialize"""
+    import multiprocessing
+    workers = [multiprocessing.Process(target=_create_many, args=(str(tmp_path), prefix))
+               for prefix in ("a", "b")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    assert len(JsonStorage(str(tmp_path)).read('tasks')) == 80
+
+
+def test_registry_shares_one_engine(tmp_path):
+    """Same db path -> same engine until it is closed"""
+    from storage.registry import get_storage, close_storage
+    first = get_storage(str(tmp_path))
+    assert get_storage(str(tmp_path / '..' / tmp_path.name)) is first
+    close_storage(str(tmp_path))
+    assert first.closed
+    assert get_storage(str(tmp_path)) is not first
+    close_storage(str(tmp_path))
+
+
+def test_group_commit_coalesces_writes(tmp_path):
+    """Concurrent commits share flushes and every acknowledged write is on disk"""
+    import threading
+    storage = JsonStorage(str(tmp_path), cache=True, durability='group-commit',
+                          group_commit_window=0.02)
+    threads = [threading.Thread(target=storage.create, args=('users', {"id": f"u{i}", "name": f"n{i}"}))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert storage._group_writer.batches < 20
+    assert len(JsonStorage(str(tmp_path)).read('users')) == 20
+    storage.close()
+
+    durable = JsonStorage(str(tmp_path), durability='fsync-per-commit')
+    durable.update('users', 'u1', {"name": "renamed"})
+    assert JsonStorage(str(tmp_path)).find_by_id('users', 'u1')['name'] == "renamed"
+
+
+def test_jsonl_offsets_and_streaming(tmp_path):
+    """JSON Lines engine: point lookups via the offset index, scans skip dead lines"""
+    from storage.jsonl_storage import JsonLinesStorage
+    storage = JsonLinesStorage(str(tmp_path), index_save_every=2)
+    for i in range(5):
+        storage.create('users', {"id": f"u{i}", "name": f"user{i}"})
+    storage.update('users', 'u1', {"name": "renamed"})
+    storage.delete('users', 'u3')
+    storage.create('team_members', {"team_id": "t1", "user_id": "u1"})
+    storage.close()
+
+    reopened = JsonLinesStorage(str(tmp_path))
+    assert reopened.find_by_id('users', 'u1')['name'] == "renamed"
+    assert reopened.find_by_id('users', 'u3') is None
+    assert sorted(u['id'] for u in reopened.scan('users')) == ['u0', 'u1', 'u2', 'u4']
+    assert reopened.find_by_field('team_members', 'user_id', 'u1') == [{"team_id": "t1", "user_id": "u1"}]
+
+    # appends from another engine are indexed from the tail of the file
+    storage = JsonLinesStorage(str(tmp_path))
+    storage.create('users', {"id": "u9", "name": "late"})
+    assert reopened.find_by_id('users', 'u9')['name'] == "late"
+
+
+def test_jsonl_scan_survives_writes(tmp_path):
+    """A suspended scan keeps its own mapping when writes grow or compact the file"""
+    from storage.jsonl_storage import JsonLinesStorage
+    storage = JsonLinesStorage(str(tmp_path))
+    for i in range(4):
+        storage.create('users', {"id": f"u{i}", "name": f"user{i}"})
+
+    scan = storage.scan('users')
+    assert next(scan)['id'] == "u0"
+    storage.create('users', {"id": "u4", "name": "user4"})
+    storage.update('users', 'u2', {"name": "renamed"})
+    assert [u['id'] for u in scan] == ['u1', 'u2', 'u3']  # as of the start of the scan
+
+    scan = storage.scan('users')
+    next(scan)
+    storage.write('users', [{"id": "u9", "name": "only"}])  # new file, new inode
+    assert [u['id'] for u in scan] == ['u1', 'u2', 'u3', 'u4']
+    assert [u['id'] for u in storage.scan('users')] == ['u9']
+
+
+def test_scan_resumes_after_id(tmp_path):
+    """scan(after_id=...) continues right after that record on every engine"""
+    from storage.journal_storage import JournalStorage
+    from storage.jsonl_storage import JsonLinesStorage
+    from storage.sqlite_storage import SqliteStorage
+    engines = [JsonStorage(str(tmp_path / 'json')), JournalStorage(str(tmp_path / 'journal')),
+               JsonLinesStorage(str(tmp_path / 'jsonl')), SqliteStorage(str(tmp_path / 'sqlite'))]
+    for storage in engines:
+        with storage.transaction():
+            for i in range(1200):
+                storage.create('users', {"id": f"u{i}", "name": f"user{i}", "display_name": "x",
+                                         "creation_time": "2024-01-01T00:00:00"})
+        assert [u['id'] for u in storage.scan('users', 'u1097')] == ['u1098', 'u1099'] + [f"u{i}" for i in range(1100, 1200)]
+        assert list(storage.scan('users', 'missing')) == []
+        assert len(list(storage.scan('users'))) == 1200
+        storage.close()
+
+
+def test_find_by_ids_keeps_request_order(tmp_path):
+    from storage.journal_storage import JournalStorage
+    from storage.jsonl_storage import JsonLinesStorage
+    from storage.sqlite_storage import SqliteStorage
+    engines = [JsonStorage(str(tmp_path / 'json'), cache=True), JournalStorage(str(tmp_path / 'journal')),
+               JsonLinesStorage(str(tmp_path / 'jsonl')), SqliteStorage(str(tmp_path / 'sqlite'))]
+    for storage in engines:
+        for i in range(3):
+            storage.create('teams', {"id": f"t{i}", "name": f"team{i}", "description": "d",
+                                     "admin": "u0", "creation_time": "2024-01-01T00:00:00"})
+        found = storage.find_by_ids('teams', ['t2', 'missing', 't0'])
+        assert [team['id'] for team in found] == ['t2', 't0']
+        assert storage.find_by_ids('teams', []) == []
+        storage.close()
+
+
+def test_task_search_index(tmp_path):
+    """Prefix matching, ranking, filters, and picking up another writer's appends"""
+    from storage.text_index import TaskSearchIndex
+    index = TaskSearchIndex(str(tmp_path))
+    index.rebuild([
+        {"id": "t1", "title": "Deploy API", "description": "roll out the api", "board_id": "b1", "user_id": "u1", "status": "OPEN"},
+        {"id": "t2", "title": "Fix login", "description": "deployment blocked by login bug", "board_id": "b2", "user_id": "u2", "status": "OPEN"},
+    ])
+    assert [task_id for task_id, _ in index.search("deploy")] == ["t1", "t2"]  # exact title hit ranks first
+    assert [task_id for task_id, _ in index.search("deplo log")] == ["t2"]  # every word must match
+    assert index.search("deploy", board_ids={"b2"})[0][0] == "t2"
+
+    other = TaskSearchIndex(str(tmp_path))
+    other.add_tasks([{"id": "t3", "title": "Deploy docs", "description": "", "board_id": "b1", "user_id": "u1", "status": "OPEN"}])
+    other.set_statuses([("t1", "COMPLETE")])
+    assert [task_id for task_id, _ in index.search("deploy", status="OPEN", user_id="u1")] == ["t3"]
+
+
+def test_task_table_counts_and_filters():
+    """Column store agrees with plain dict counting and takes every time format the APIs do"""
+    from models.task_table import TaskTable, epoch_micros
+    from utils.exceptions import ValidationError
+    tasks = [
+        {"id": "t1", "title": "a", "description": "", "board_id": "b1", "user_id": "u1", "status": "OPEN", "creation_time": "2024-01-01T10:00:00.000001"},
+        {"id": "t2", "title": "b", "description": "", "board_id": "b1", "user_id": "u2", "status": "COMPLETE", "creation_time": "2024-01-02T10:00:00"},
+        {"id": "t3", "title": "c", "description": "", "board_id": "b2", "user_id": "u1", "status": "OPEN", "creation_time": "2024-01-03T10:00:00.5"},
+    ]
+    table = TaskTable.from_records(tasks)
+    assert table.status_counts_by_board() == {"b1": {"OPEN": 1, "IN_PROGRESS": 0, "COMPLETE": 1},
+                                              "b2": {"OPEN": 1, "IN_PROGRESS": 0, "COMPLETE": 0}}
+    assert table.counts_by_assignee() == {"u1": 2, "u2": 1}
+    assert table.counts_by_assignee(status="OPEN", board_id="b1") == {"u1": 1}
+    assert table.filter(user_id="u1", created_from="2024-01-01T10:00:00.000002") == ["t3"]
+    assert table.filter(created_to="2024-01-02T10:00:00") == ["t1"]
+    assert table.filter(board_id="nope") == [] and table.count(status="OPEN") == 2
+
+    table.set_status("t1", "IN_PROGRESS")
+    assert table.row("t1")["status"] == "IN_PROGRESS"
+    assert epoch_micros("2024-01-02") == epoch_micros("2024-01-02T00:00:00") == 1704153600000000
+    assert table.filter(created_from="2024-01-02", created_to="2024-01-03") == ["t2"]
+    try:
+        table.filter(created_from="yesterday")
+        assert False, "a bad time bound was accepted"
+    except ValidationError:
+        pass
+
+
+def test_reference_ids_are_interned(tmp_path):
+    """Every engine hands out one shared string per referenced id"""
+    from storage.journal_storage import JournalStorage
+    from storage.jsonl_storage import JsonLinesStorage
+    from storage.sqlite_storage import SqliteStorage
+    user_id = "".join(["user-", "1"])  # built at runtime so it isn't already interned
+    for name, engine in [("json", JsonStorage), ("journal", JournalStorage),
+                         ("jsonl", JsonLinesStorage), ("sqlite", SqliteStorage)]:
+        db_path = str(tmp_path / name)
+        with engine(db_path) as storage:
+            for i in range(2):
+                storage.create("tasks", {"id": f"t{i}", "title": "x", "description": "", "user_id": user_id,
+                                         "board_id": "b1", "status": "OPEN", "creation_time": ""})
+        with engine(db_path) as storage:
+            first, second = storage.read("tasks")
+            assert first["user_id"] == user_id and first["user_id"] is second["user_id"], name
+            assert storage.find_by_id("tasks", "t1")["board_id"] is first["board_id"], name
+
+
+def test_uuid7_ids_sort_by_creation():
+    """uuid7 ids are valid UUIDs, strictly increasing, and selectable per process"""
+    import time
+    import uuid
+    from models.task import Task
+    from utils import ids
+    before = ids.uuid7_floor(time.time() - 1)
+    generated = [ids.uuid7() for _ in range(5000)]
+    assert generated == sorted(generated) and len(set(generated)) == len(generated)
+    assert all(uuid.UUID(value).version == 7 for value in generated[:10])
+    assert before < generated[0]
+
+    previous = ids.get_id_scheme()
+    ids.set_id_scheme("uuid7")
+    try:
+        assert uuid.UUID(Task().id).version == 7
+    finally:
+        ids.set_id_scheme(previous)
+
+
+def test_find_range_uses_sorted_time_index(tmp_path):
+    """Range queries agree across engines and follow updates and deletes"""
+    from storage.journal_storage import JournalStorage
+    from storage.jsonl_storage import JsonLinesStorage
+    from storage.sqlite_storage import SqliteStorage
+    for name, engine in [("json", JsonStorage), ("journal", JournalStorage),
+                         ("jsonl", JsonLinesStorage), ("sqlite", SqliteStorage)]:
+        with engine(str(tmp_path / name)) as storage:
+            for i in (3, 1, 2, 5):
+                storage.create("boards", {"id": f"b{i}", "name": f"b{i}", "description": "", "team_id": "t",
+                                          "status": "OPEN", "creation_time": f"2024-01-0{i}T00:00:00",
+                                          "end_time": None})
+            assert [b["id"] for b in storage.find_range("boards", "creation_time", "2024-01-02", "2024-01-05")] == ["b2", "b3"], name
+            storage.update("boards", "b1", {"status": "CLOSED", "end_time": "2024-02-01T00:00:00"})
+            storage.delete("boards", "b3")
+            assert [b["id"] for b in storage.find_range("boards", "creation_time", "2024-01-02")] == ["b2", "b5"], name
+            assert [b["id"] for b in storage.find_range("boards", "end_time", "2024-01-31")] == ["b1"], name
+
+
+def test_base_classes_dir_resolution(tmp_path, monkeypatch):
+    """PLANNER_BASE_DIR wins, importable modules need no path entry, results are cached"""
+    from utils import base_classes
+    base_classes.find_base_classes_dir.cache_clear()
+    try:
+        monkeypatch.setenv(base_classes.ENV_VAR, str(tmp_path))
+        assert base_classes.find_base_classes_dir("nonexistent_base") == str(tmp_path)
+        monkeypatch.delenv(base_classes.ENV_VAR)
+        assert base_classes.find_base_classes_dir("nonexistent_base") == str(tmp_path)  # cached
+        assert base_classes.find_base_classes_dir("json") is None
+    finally:
+        base_classes.find_base_classes_dir.cache_clear()
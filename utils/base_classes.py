@@ -0,0 +1,62 @@
+"""
+Locating the abstract API base classes (user_base.py, team_base.py,
+project_board_base.py), which are shipped outside this package
+
+Resolution order, worked out once per process and shared by all three
+implementations:
+
+1. PLANNER_BASE_DIR, if set - used as is, nothing is searched
+2. nothing to do if the modules are importable already
+3. the package folder and up to two folders above it, each checked itself and
+   one level into its subfolders. No recursive walks, so the cost doesn't
+   depend on what else is on the disk; a deeper layout needs PLANNER_BASE_DIR
+"""
+import importlib.util
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+ENV_VAR = 'PLANNER_BASE_DIR'
+SEARCH_LEVELS = 3  # the package folder and two above it, like the old search
+
+
+@lru_cache(maxsize=None)
+def _candidate_dirs() -> List[str]:
+    """Folders that may hold the base classes, nearest first"""
+    candidates = []
+    current = Path(__file__).resolve().parent.parent
+    for _ in range(SEARCH_LEVELS):
+        candidates.append(str(current))
+        try:
+            with os.scandir(current) as entries:
+                candidates.extend(sorted(entry.path for entry in entries
+                                         if entry.is_dir() and not entry.name.startswith('.')))
+        except OSError:
+            pass
+        if current.parent == current:
+            break
+        current = current.parent
+    return candidates
+
+
+@lru_cache(maxsize=None)
+def find_base_classes_dir(module: str = 'user_base') -> Optional[str]:
+    """Folder to add to sys.path so `module` imports, None if it already does (or can't be found)"""
+    configured = os.environ.get(ENV_VAR)
+    if configured:
+        return configured
+    if importlib.util.find_spec(module) is not None:
+        return None
+    for candidate in _candidate_dirs():
+        if os.path.isfile(os.path.join(candidate, module + '.py')):
+            return candidate
+    return None
+
+
+def ensure_base_classes(module: str):
+    """Put the folder holding `module` on sys.path (once)"""
+    base_dir = find_base_classes_dir(module)
+    if base_dir and base_dir not in sys.path:
+        sys.path.append(base_dir)
@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, Callable, Optional, Tuple
+from .exceptions import ValidationError
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(last_id: str) -> str:
+    """Opaque cursor pointing just past the record with this id"""
+    return base64.urlsafe_b64encode(last_id.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        # validate=True so stray characters are rejected instead of silently dropped
+        raw = base64.b64decode(cursor.encode('ascii'), altchars=b'-_', validate=True)
+        last_id = raw.decode('utf-8')
+    except (binascii.Error, UnicodeError, AttributeError):
+        raise ValidationError("Invalid cursor")
+    if not last_id:
+        raise ValidationError("Invalid cursor")
+    return last_id
+
+
+def page_params(data: Dict[str, Any]) -> Tuple[int, Optional[str]]:
+    """Validate the optional limit/cursor of a list request, returns (limit, after_id)"""
+    limit = data.get('limit', DEFAULT_PAGE_SIZE)
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValidationError(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+    cursor = data.get('cursor')
+    return limit, decode_cursor(cursor) if cursor is not None else None
+
+
+def paginate(records: Iterator[Dict[str, Any]], limit: int,
+             project: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Take one page off a record iterator (already positioned after the cursor)
+    Only limit + 1 records are pulled, the extra one just tells us there's more
+    """
+    page = list(islice(records, limit + 1))
+    next_cursor = encode_cursor(page[limit - 1]['id']) if len(page) > limit else None
+    return {"items": [project(record) for record in page[:limit]], "next_cursor": next_cursor}
+
+
+def stream_json_array(items: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield a JSON array piece by piece - joining the pieces gives the json.dumps output"""
+    yield "["
+    first = True
+    for item in items:
+        if not first:
+            yield ", "
+        first = False
+        yield json.dumps(item)
+    yield "]"
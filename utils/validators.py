@@ -1,5 +1,5 @@
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from .exceptions import ValidationError
 
 def validate_json_string(json_str: str) -> Dict[str, Any]:
@@ -9,6 +9,13 @@ def validate_json_string(json_str: str) -> Dict[str, Any]:
     except json.JSONDecodeError as e:
         raise ValidationError(f"Invalid JSON format: {str(e)}")
 
+def validate_json_array(json_str: str) -> List[Dict[str, Any]]:
+    """Parse a JSON array of objects - used by the batch endpoints"""
+    data = validate_json_string(json_str)
+    if not isinstance(data, list):
+        raise ValidationError("Request must be a JSON array")
+    return data
+
 def validate_string_length(value: str, field_name: str, max_length: int):
     """Validate string length constraint - requirements were very specific about these limits"""
     if len(value) > max_length:
@@ -20,10 +27,30 @@ def validate_required_fields(data: Dict[str, Any], required_fields: list):
     if missing_fields:
         raise ValidationError(f"Missing required fields: {', '.join(missing_fields)}")
 
+def validate_string_fields(data: Dict[str, Any], fields: list):
+    """Validate that the given (present) fields hold strings - batch items come straight from JSON"""
+    for field in fields:
+        if not isinstance(data.get(field), str):
+            raise ValidationError(f"{field} must be a string")
+
 def validate_id_format(id_value: str):
     """Validate ID format (UUID)"""
     import uuid
     try:
         uuid.UUID(id_value)
     except ValueError:
-        raise ValidationError(f"Invalid ID format: {id_value}")
\ No newline at end of file
+        raise ValidationError(f"Invalid ID format: {id_value}")
+
+def validate_timestamp(value: Any, field_name: str) -> str:
+    """
+    Parse a UTC time bound like the stored creation/end times (YYYY-MM-DD, optionally
+    with THH:MM:SS[.ffffff]) and return it in the same isoformat, so it compares as a string
+    """
+    from datetime import datetime
+    if isinstance(value, str):
+        for fmt in ('%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'):
+            try:
+                return datetime.strptime(value, fmt).isoformat()
+            except ValueError:
+                continue
+    raise ValidationError(f"{field_name} must be a timestamp like 2024-01-31 or 2024-01-31T12:00:00")